@@ -0,0 +1,8 @@
+"""
+Benchmarks measuring throughput, latency and memory of the sources and
+operators, as well as the duration of the subscription phases.
+
+Run all benchmarks with:
+
+    python -m benchmarks --output results.json
+"""
@@ -0,0 +1,267 @@
+"""
+Benchmark cases.
+
+Each case is a function that takes the number of items and returns a
+Flowable. The items of the Flowable are counted by the benchmark runner.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import reactivex
+from donotation import do
+
+import continuationmonad
+
+import rxbp
+from rxbp.flowable.flowable import Flowable
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    group: str
+    build: Callable[[int], Flowable]
+
+
+CASES: list[Case] = []
+
+
+def case(group: str, name: str | None = None):
+    def decorator(func: Callable[[int], Flowable]):
+        CASES.append(Case(
+            name=name or func.__name__,
+            group=group,
+            build=func,
+        ))
+        return func
+
+    return decorator
+
+
+def _source(size: int):
+    return rxbp.from_iterable(range(size))
+
+
+# Sources
+#########
+
+@case('source')
+def count(size: int):
+    return rxbp.count().take(size)
+
+
+@case('source')
+def create(size: int):
+    @do()
+    def send_item(observer, index: int):
+        if index == size - 1:
+            return observer.on_next_and_complete(index)
+
+        else:
+            yield observer.on_next(index)
+            yield from continuationmonad.schedule_trampoline()
+            return send_item(observer, index + 1)
+
+    return rxbp.create(lambda observer, _: send_item(observer, 0))
+
+
+@case('source')
+def from_iterable(size: int):
+    return _source(size)
+
+
+@case('source')
+def from_iterable_batched(size: int):
+    return rxbp.from_iterable(range(size), batch_size=1000)
+
+
+@case('source')
+def from_rx(size: int):
+    return rxbp.from_rx(reactivex.range(size))
+
+
+@case('source')
+def from_value(size: int):
+    return rxbp.from_iterable(range(size)).flat_map(rxbp.from_value)
+
+
+@case('source')
+def interval(size: int):
+    return rxbp.interval(0).take(min(size, 1000))
+
+
+@case('source')
+def repeat(size: int):
+    return rxbp.repeat(1).take(size)
+
+
+@case('source')
+def schedule_on(size: int):
+    return rxbp.from_iterable(range(min(size, 1000))).concat_map(
+        lambda v: rxbp.schedule_on().map(lambda _: v)
+    )
+
+
+# Operators
+###########
+
+@case('operator')
+def accumulate(size: int):
+    return _source(size).accumulate(lambda acc, v: acc + v, 0)
+
+
+@case('operator')
+def batch(size: int):
+    return _source(size).batch(100)
+
+
+@case('operator')
+def buffer(size: int):
+    return _source(size).buffer()
+
+
+@case('operator')
+def concat_map(size: int):
+    return _source(size).concat_map(rxbp.from_value)
+
+
+@case('operator')
+def default_if_empty(size: int):
+    return _source(size).default_if_empty(0)
+
+
+@case('operator', 'filter')
+def filter_(size: int):
+    return _source(size).filter(lambda v: v % 2 == 0)
+
+
+@case('operator')
+def first(size: int):
+    return _source(size).first()
+
+
+@case('operator')
+def flat_map(size: int):
+    return _source(size).flat_map(rxbp.from_value)
+
+
+@case('operator')
+def last(size: int):
+    return _source(size).last()
+
+
+@case('operator', 'map')
+def map_(size: int):
+    return _source(size).map(lambda v: v + 1)
+
+
+@case('operator')
+def map_chain(size: int):
+    flowable = _source(size)
+
+    for _ in range(8):
+        flowable = flowable.map(lambda v: v + 1)
+
+    return flowable
+
+
+@case('operator')
+def reduce(size: int):
+    return _source(size).reduce(lambda acc, v: acc + v)
+
+
+@case('operator')
+def repeat_first(size: int):
+    return _source(size).repeat_first().take(size)
+
+
+@case('operator')
+def skip(size: int):
+    return _source(size).skip(size // 2)
+
+
+@case('operator')
+def skip_while(size: int):
+    return _source(size).skip_while(lambda v: v < size // 2)
+
+
+@case('operator')
+def take(size: int):
+    return rxbp.count().take(size)
+
+
+@case('operator')
+def take_while(size: int):
+    return rxbp.count().take_while(lambda v: v < size)
+
+
+@case('operator')
+def tap(size: int):
+    return _source(size).tap(on_next=lambda _: None)
+
+
+@case('operator')
+def to_list(size: int):
+    return _source(size).to_list()
+
+
+@case('operator')
+def zip_with_index(size: int):
+    return _source(size).zip_with_index()
+
+
+# Combining operators
+#####################
+
+FAN_IN = 100
+ZIP_WIDTH = 20
+FLAT_MAP_DEPTH = 20
+SHARE_SUBSCRIBERS = 10
+
+
+@case('combining')
+def merge(size: int):
+    return rxbp.merge(tuple(
+        _source(size // FAN_IN) for _ in range(FAN_IN)
+    ))
+
+
+@case('combining', 'zip')
+def zip_(size: int):
+    return rxbp.zip(tuple(
+        _source(size // ZIP_WIDTH) for _ in range(ZIP_WIDTH)
+    ))
+
+
+@case('combining')
+def flat_map_nested(size: int):
+    flowable = _source(size // FLAT_MAP_DEPTH)
+
+    for _ in range(FLAT_MAP_DEPTH):
+        flowable = flowable.flat_map(rxbp.from_value)
+
+    return flowable
+
+
+@case('combining')
+def flat_map_subscribe(size: int):
+    # each item subscribes an inner flowable with stateful operators,
+    # the cost per item is dominated by the cost per subscription
+    return _source(size).flat_map(
+        lambda v: rxbp.from_value(v)
+        .skip(0)
+        .take(1)
+        .default_if_empty(v)
+        .zip_with_index()
+        .to_list()
+    )
+
+
+@case('combining')
+def share(size: int):
+    shared = _source(size // SHARE_SUBSCRIBERS).share()
+
+    return rxbp.merge(tuple(
+        shared.map(lambda v: v) for _ in range(SHARE_SUBSCRIBERS)
+    ))
@@ -0,0 +1,93 @@
+"""
+Measures throughput, inter-arrival latency and peak memory of a Flowable.
+"""
+
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+import rxbp
+from rxbp.flowable.flowable import Flowable
+
+
+def with_delayed_consumer(flowable: Flowable, delay: float) -> Flowable:
+    """
+    Acknowledges each item only after sleeping `delay` seconds.
+    """
+
+    return flowable.concat_map(
+        lambda item: rxbp.sleep(delay).map(lambda _: item)
+    )
+
+
+def measure_throughput(build: Callable[[], Flowable], repeat: int):
+    """
+    Returns the number of items received by the sink and the best of
+    `repeat` wall-clock durations in seconds.
+    """
+
+    durations = []
+
+    for _ in range(repeat):
+        flowable = build()
+
+        gc.collect()
+        start = time.perf_counter()
+        result = rxbp.run(flowable)
+        durations.append(time.perf_counter() - start)
+
+    n_items = len(result)
+    duration = min(durations)
+
+    return {
+        'items': n_items,
+        'seconds': duration,
+        'items_per_second': n_items / duration if duration else None,
+    }
+
+
+def measure_latency(build: Callable[[], Flowable]):
+    """
+    Returns percentiles of the time between two consecutive items
+    received by the sink in microseconds.
+    """
+
+    timestamps = rxbp.run(build().map(lambda _: time.perf_counter()))
+
+    gaps = [
+        1e6 * (t2 - t1)
+        for t1, t2 in zip(timestamps[:-1], timestamps[1:])
+    ]
+
+    if len(gaps) < 2:
+        return None
+
+    percentiles = statistics.quantiles(gaps, n=100)
+
+    return {
+        'p50_us': percentiles[49],
+        'p99_us': percentiles[98],
+        'max_us': max(gaps),
+    }
+
+
+def measure_memory(build: Callable[[], Flowable]):
+    """
+    Returns the peak memory allocated while running the Flowable in bytes.
+    """
+
+    flowable = build()
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        rxbp.run(flowable)
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return {'peak_bytes': peak}
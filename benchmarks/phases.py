@@ -0,0 +1,161 @@
+"""
+Measures the phases of `subscribe_and_connect` separately:
+
+- discover: find shared nodes in the Flowable tree
+- assign_weights: assign weights to the nodes
+- subscribe: call `unsafe_subscribe` on the tree
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import continuationmonad
+from continuationmonad.typing import MainScheduler
+
+import rxbp
+from rxbp.flowable.flowable import Flowable
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscription import Subscription
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.state import State
+
+
+@dataclass
+class CountingObserver(Observer):
+    scheduler: MainScheduler
+    n_items: int
+
+    def on_next(self, item):
+        self.n_items += 1
+        return continuationmonad.from_(None)
+
+    def on_next_and_complete(self, item):
+        self.n_items += 1
+        return continuationmonad.from_(self.scheduler.stop(1))
+
+    def on_completed(self):
+        return continuationmonad.from_(self.scheduler.stop(1))
+
+    def on_error(self, exception: Exception):
+        return continuationmonad.from_(self.scheduler.stop(1))
+
+
+@dataclass
+class PhaseSubscription(Subscription):
+    source: Flowable
+    observer: CountingObserver
+    result: SubscriptionResult | None
+
+    def discover(self, state: State):
+        return self.source.discover(state)
+
+    def assign_weights(self, state: State, weight: int):
+        return self.source.assign_weights(state, weight)
+
+    def apply(self, state: State):
+        state, self.result = self.source.unsafe_subscribe(
+            state,
+            args=rxbp.init_subscribe_args(
+                observer=self.observer,
+                weight=1,
+                scheduler=self.observer.scheduler,
+            ),
+        )
+        return state
+
+
+def measure_phases(build: Callable[[], Flowable]):
+    """
+    Returns the duration of each subscription phase in seconds.
+    """
+
+    scheduler = continuationmonad.init_main_scheduler()
+    flowable = build()
+    durations = {}
+
+    subscription = PhaseSubscription(
+        source=flowable,
+        observer=CountingObserver(scheduler=scheduler, n_items=0),
+        result=None,
+    )
+
+    def schedule_task():
+        state = rxbp.init_state()
+
+        def trampoline_task(state=state):
+            start = time.perf_counter()
+            state = subscription.discover(state)
+            durations['discover'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            state = subscription.assign_weights(state, 1)
+            for connectable in state.discovered_connectables:
+                state = state.connections[connectable].assign_weights(state, 1)
+            durations['assign_weights'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            state = subscription.apply(state)
+            while state.discovered_subscriptions:
+                discovered_subscriptions = state.discovered_subscriptions
+                state = state.copy(discovered_subscriptions={})
+
+                for discovered in discovered_subscriptions:
+                    state = discovered.apply(state)
+            durations['subscribe'] = time.perf_counter() - start
+
+            assert subscription.result is not None
+            return subscription.result.certificate
+
+        return state.subscription_trampoline.start_loop(
+            trampoline_task, weight=1, cancellation=None,
+        )
+
+    scheduler.run(schedule_task, weight=1, cancellation=None)
+
+    return durations | {'items': subscription.observer.n_items}
+
+
+def _source():
+    return rxbp.from_iterable(range(10))
+
+
+def map_chain(width: int):
+    flowable = _source()
+
+    for _ in range(width):
+        flowable = flowable.map(lambda v: v)
+
+    return flowable
+
+
+def merge(width: int):
+    return rxbp.merge(tuple(_source() for _ in range(width)))
+
+
+def zip_(width: int):
+    return rxbp.zip(tuple(_source() for _ in range(width)))
+
+
+def share(width: int):
+    shared = _source().share()
+    return rxbp.merge(tuple(shared.map(lambda v: v) for _ in range(width)))
+
+
+def flat_map_nested(width: int):
+    flowable = _source()
+
+    for _ in range(width):
+        flowable = flowable.flat_map(rxbp.from_value)
+
+    return flowable
+
+
+# name, function building the Flowable, width of the tree
+PHASE_CASES = (
+    ('map_chain', map_chain, 500),
+    ('merge', merge, 500),
+    ('zip', zip_, 100),
+    ('share', share, 100),
+    ('flat_map_nested', flat_map_nested, 100),
+)
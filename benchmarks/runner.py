@@ -0,0 +1,179 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import traceback
+
+from benchmarks.cases import CASES
+from benchmarks.measure import (
+    measure_latency,
+    measure_memory,
+    measure_throughput,
+    with_delayed_consumer,
+)
+from benchmarks.phases import PHASE_CASES, measure_phases
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks the sources and operators of rxbp.',
+    )
+    parser.add_argument(
+        '--filter', default=None,
+        help='only run benchmarks whose name contains the given string',
+    )
+    parser.add_argument(
+        '--size', type=int, default=100_000,
+        help='number of items sent by the source (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='number of runs, the fastest one is reported (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--delay', type=float, default=1e-4,
+        help='seconds the delayed consumer sleeps per item (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--delayed-size', type=int, default=500,
+        help='number of items sent to the delayed consumer (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--no-memory', action='store_true',
+        help='skip the peak memory measurements',
+    )
+    parser.add_argument(
+        '--output', default=None,
+        help='write the results as JSON to the given file',
+    )
+    return parser.parse_args(argv)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _try(func):
+    try:
+        return func()
+
+    except Exception:
+        return {'error': traceback.format_exc(limit=3)}
+
+
+def run_cases(args):
+    for case in CASES:
+        name = f'{case.group}/{case.name}'
+
+        if args.filter and args.filter not in name:
+            continue
+
+        def build(case=case):
+            return case.build(args.size)
+
+        def build_delayed(case=case):
+            return with_delayed_consumer(case.build(args.delayed_size), args.delay)
+
+        result = {
+            'name': name,
+            'size': args.size,
+            'sync': {
+                'throughput': _try(lambda: measure_throughput(build, args.repeat)),
+                'latency': _try(lambda: measure_latency(build)),
+            },
+            'delayed': {
+                'size': args.delayed_size,
+                'delay': args.delay,
+                'throughput': _try(lambda: measure_throughput(build_delayed, 1)),
+                'latency': _try(lambda: measure_latency(build_delayed)),
+            },
+        }
+
+        if not args.no_memory:
+            result['sync']['memory'] = _try(lambda: measure_memory(build))
+
+        _print_case(result)
+        yield result
+
+
+def run_phase_cases(args):
+    for case_name, func, width in PHASE_CASES:
+        name = f'phases/{case_name}'
+
+        if args.filter and args.filter not in name:
+            continue
+
+        result = {
+            'name': name,
+            'width': width,
+            'phases': _try(lambda: measure_phases(lambda: func(width))),
+        }
+
+        _print_phases(result)
+        yield result
+
+
+def _print_case(result):
+    throughput = result['sync']['throughput']
+
+    if 'error' in throughput:
+        print(f'{result["name"]:40} error')
+        return
+
+    latency = result['sync']['latency'] or {}
+    p99 = latency.get('p99_us')
+    memory = result['sync'].get('memory') or {}
+    peak = memory.get('peak_bytes')
+
+    print(
+        f'{result["name"]:40}'
+        f' {throughput["items_per_second"] or 0:>14,.0f} items/s'
+        + (f' {p99:>10.1f} us p99' if p99 is not None else '')
+        + (f' {peak / 2**20:>10.2f} MiB' if peak is not None else '')
+    )
+
+
+def _print_phases(result):
+    phases = result['phases']
+
+    if 'error' in phases:
+        print(f'{result["name"]:40} error')
+        return
+
+    print(
+        f'{result["name"]:40}'
+        f' discover {1e3 * phases["discover"]:8.3f} ms'
+        f' assign_weights {1e3 * phases["assign_weights"]:8.3f} ms'
+        f' subscribe {1e3 * phases["subscribe"]:8.3f} ms'
+    )
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = {
+        'meta': {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'size': args.size,
+            'repeat': args.repeat,
+        },
+        'cases': list(run_cases(args)),
+        'phases': list(run_phase_cases(args)),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
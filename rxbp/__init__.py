@@ -12,6 +12,7 @@ from rxbp.flowable.from_ import (
     empty as _empty,
     error as _error,
     from_iterable as _from_iterable,
+    from_process_channel as _from_process_channel,
     from_value as _from_value,
     from_rx as _from_rx,
     interval as _interval,
@@ -23,13 +24,42 @@ from rxbp.flowable.from_ import (
     zip as _zip,
 )
 from rxbp.flowable.to import (
+    drain as _drain,
+    to_async_iterator as _to_async_iterator,
+    to_iterator as _to_iterator,
+    to_process_channel as _to_process_channel,
     to_rx as _to_rx,
     run as _run,
+    run_async as _run_async,
+)
+from rxbp.flowabletree.operations.buffer.gauge import (
+    init_buffer_gauge as _init_buffer_gauge,
+)
+from rxbp.flowabletree.operations.share.laggauge import (
+    init_share_lag_gauge as _init_share_lag_gauge,
+)
+from rxbp.flowabletree.processchannel import (
+    init_process_channel as _init_process_channel,
+)
+from rxbp.utils.framesummary import (
+    set_call_site_capture as _set_call_site_capture,
+)
+from rxbp.schedulers.asyncioscheduler import (
+    init_asyncio_scheduler as _init_asyncio_scheduler,
+)
+from rxbp.schedulers.threadpoolscheduler import (
+    init_thread_pool_scheduler as _init_thread_pool_scheduler,
 )
 
 init_state = _init_state
 init_subscribe_args = _init_subscribe_args
 init_subscription_result = _init_subscription_result
+init_asyncio_scheduler = _init_asyncio_scheduler
+init_thread_pool_scheduler = _init_thread_pool_scheduler
+init_buffer_gauge = _init_buffer_gauge
+init_share_lag_gauge = _init_share_lag_gauge
+init_process_channel = _init_process_channel
+set_call_site_capture = _set_call_site_capture
 
 
 # Create a Flowables
@@ -41,6 +71,7 @@ empty = _empty
 error = _error
 from_iterable = _from_iterable
 from_ = _from_iterable
+from_process_channel = _from_process_channel
 from_value = _from_value
 return_ = _from_value
 from_rx = _from_rx
@@ -61,5 +92,10 @@ zip = _zip
 
 # Output functions
 
+drain = _drain
 run = _run
+run_async = _run_async
+to_async_iterator = _to_async_iterator
+to_iterator = _to_iterator
+to_process_channel = _to_process_channel
 to_rx = _to_rx
@@ -3,3 +3,11 @@ from continuationmonad.abc import ContinuationMonadOperatorException
 
 class RxBpException(ContinuationMonadOperatorException):
     pass
+
+
+class BufferOverflowException(Exception):
+    pass
+
+
+class ShareLagException(Exception):
+    pass
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from concurrent.futures import Executor
 from typing import Callable, override
 
+from continuationmonad.typing import Scheduler
+
 from rxbp.flowabletree.operations.flatmap.flowable import init_flat_map_node
 from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
 from rxbp.flowabletree.from_ import (
-    count as _count,
     repeat_value as _repeat_value,
 )
 from rxbp.flowabletree.operations.reduce import init_reduce_flowable
@@ -17,16 +19,29 @@ from rxbp.flowabletree.operations.reduce import init_reduce_flowable
 # from rxbp.flowabletree.operations.repeatfirst import init_repeat_first_flowable
 from rxbp.flowabletree.operations.tolist import init_to_list_flowable
 from rxbp.flowabletree.operations.accumulate import init_accumulate_flowable
+from rxbp.flowabletree.operations.cache import init_cache_flowable
 from rxbp.flowabletree.operations.defaultifempty import init_default_if_empty_flowable
 from rxbp.flowabletree.operations.tap import init_tap_flowable
 from rxbp.flowabletree.operations.filter import init_filter_flowable
 from rxbp.flowabletree.operations.map import init_map_flowable
+from rxbp.flowabletree.operations.mapinprocess import init_map_in_process_flowable
+from rxbp.flowabletree.operations.observeon import init_observe_on_flowable
+from rxbp.flowabletree.operations.parallelmap import init_parallel_map_flowable
+from rxbp.flowabletree.operations.skip import init_skip_flowable
 from rxbp.flowabletree.operations.skipwhile import init_skip_while_flowable
+from rxbp.flowabletree.operations.subscribeon import init_subscribe_on_flowable
+from rxbp.flowabletree.operations.take import init_take_flowable
 from rxbp.flowabletree.operations.takewhile import init_take_while_flowable
 from rxbp.flowabletree.operations.zip.flowable import init_zip_flowable_node
+from rxbp.flowabletree.operations.zipwithindex import init_zip_with_index_flowable
 from rxbp.flowabletree.operations.buffer.flowable import init_buffer
+from rxbp.flowabletree.operations.buffer.gauge import BufferGauge
+from rxbp.flowabletree.operations.buffer.states import OverflowStrategy
+from rxbp.utils.spillbuffer import Serializer
 from rxbp.flowabletree.operations.concatmap.flowable import init_concat_map
 from rxbp.flowabletree.operations.share.flowable import init_share_flowable_node
+from rxbp.flowabletree.operations.share.laggauge import ShareLagGauge
+from rxbp.flowabletree.operations.share.states import LagPolicy
 from rxbp.utils.framesummary import get_frame_summary
 
 
@@ -37,16 +52,47 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
     def batch(self, size: int):
         return self.copy(child=init_to_list_flowable(child=self.child, size=size))
 
-    def buffer(self):
+    def buffer(
+        self,
+        size: int | None = None,
+        overflow: OverflowStrategy | None = None,
+        on_drop: Callable[[U], None] | None = None,
+        spill_to: str | None = None,
+        memory_limit: int | None = None,
+        serializer: Serializer | None = None,
+        gauge: BufferGauge | None = None,
+    ):
         return self.copy(
             child=init_buffer(
                 child=self.child,
+                buffer_size=size,
+                overflow=overflow,
+                on_drop=on_drop,
+                spill_to=spill_to,
+                memory_limit=memory_limit,
+                serializer=serializer,
+                gauge=gauge,
             )
         )
 
     @abstractmethod
     def copy(self, /, **changes) -> Flowable: ...
     
+    def cache(
+        self,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        return self.copy(
+            child=init_cache_flowable(
+                child=self.child,
+                max_items=max_items,
+                max_bytes=max_bytes,
+                ttl=ttl,
+            )
+        )
+
     def concat_map(self, func: Callable[[U], FlowableNode]):
         return self.copy(
             child=init_concat_map(
@@ -74,12 +120,19 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
     def first(self):
         return self.take(count=1)
 
-    def flat_map(self, func: Callable[[U], FlowableNode]):
+    def flat_map(
+        self,
+        func: Callable[[U], FlowableNode],
+        max_concurrency: int | None = None,
+        prefetch: int | None = None,
+    ):
         return self.copy(
             child=init_flat_map_node(
                 child=self.child,
                 func=func,
                 stack=get_frame_summary(),
+                max_concurrency=max_concurrency,
+                prefetch=prefetch,
             )
         )
     
@@ -98,6 +151,50 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
             )
         )
 
+    def map_in_process[V](
+        self,
+        func: Callable[[U], V],
+        workers: int,
+        chunk_size: int | None = None,
+        executor: Executor | None = None,
+    ):
+        return self.copy(
+            child=init_map_in_process_flowable(
+                child=self.child,
+                func=func,
+                workers=workers,
+                chunk_size=chunk_size,
+                executor=executor,
+                stack=get_frame_summary(),
+            )
+        )
+
+    def observe_on(self, scheduler: Scheduler):
+        return self.copy(
+            child=init_observe_on_flowable(
+                child=self.child,
+                scheduler=scheduler,
+            )
+        )
+
+    def parallel_map[V](
+        self,
+        func: Callable[[U], V],
+        workers: int,
+        ordered: bool | None = None,
+        executor: Executor | None = None,
+    ):
+        return self.copy(
+            child=init_parallel_map_flowable(
+                child=self.child,
+                func=func,
+                workers=workers,
+                ordered=ordered,
+                executor=executor,
+                stack=get_frame_summary(),
+            )
+        )
+
     def reduce(self, func):
         return self.copy(child=init_reduce_flowable(self.child, func))
 
@@ -115,32 +212,42 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
     def seq(self):
         ...
 
-    def share(self):
+    def share(
+        self,
+        max_lag: int | None = None,
+        on_lag: LagPolicy | None = None,
+        gauge: ShareLagGauge | None = None,
+    ):
         return self.copy(
             child=init_share_flowable_node(
                 child=self.child,
+                max_lag=max_lag,
+                on_lag=on_lag,
+                gauge=gauge,
             )
         )
 
     def skip(self, count: int):
-        return (
-            self.copy(child=init_zip_flowable_node((self, _count())))
-            .skip_while(lambda v: v[1] < count)
-            .map(lambda v: v[0])
-        )
+        return self.copy(child=init_skip_flowable(child=self.child, count=count))
 
     def skip_while(self, predicate):
         return self.copy(
             child=init_skip_while_flowable(child=self.child, predicate=predicate)
         )
 
+    def subscribe_on(self, scheduler: Scheduler):
+        return self.copy(
+            child=init_subscribe_on_flowable(
+                child=self.child,
+                scheduler=scheduler,
+            )
+        )
+
     def take(self, count: int | None = None):
         if count is None:
             return self
 
-        return (
-            self.zip_with_index().take_while(lambda v: v[1] < count).map(lambda v: v[0])
-        )
+        return self.copy(child=init_take_flowable(child=self.child, count=count))
 
     def take_while(self, predicate):
         return self.copy(
@@ -164,7 +271,7 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
         return self.copy(child=init_to_list_flowable(child=self.child))
 
     def zip_with_index(self):
-        return self.copy(child=init_zip_flowable_node((self, _count())))
+        return self.copy(child=init_zip_with_index_flowable(child=self.child))
 
     def zip(self, others: tuple[Flowable, ...]):
         return self.copy(
@@ -180,11 +287,19 @@ class Flowable[U](SingleChildFlowableNode[U, U]):
 
 class SeqFlowable[U](Flowable[U]):
     @override
-    def flat_map(self, func: Callable[[U], FlowableNode]):
+    def flat_map(
+        self,
+        func: Callable[[U], FlowableNode],
+        max_concurrency: int | None = None,
+        prefetch: int | None = None,
+    ):
+        # the inner flowables are subscribed one after the other, hence,
+        # any `max_concurrency` is already satisfied
         return self.copy(
             child=init_concat_map(
                 child=self.child,
                 func=func,
+                prefetch=prefetch,
             )
         )
     
@@ -1,31 +1,80 @@
+from concurrent.futures import Executor
 from typing import Callable, Generator, override
 
+from continuationmonad.typing import Scheduler
+
 from rxbp.state import State
 from rxbp.flowabletree.sources.connectable import ConnectableFlowableNode
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.flowabletree.operations.buffer.gauge import BufferGauge
+from rxbp.flowabletree.operations.buffer.states import OverflowStrategy
+from rxbp.flowabletree.operations.share.laggauge import ShareLagGauge
+from rxbp.flowabletree.operations.share.states import LagPolicy
+from rxbp.utils.spillbuffer import Serializer
 
 class Flowable[U](SingleChildFlowableNode[U, U]):
     # used for the donotation.do notation
     def __iter__(self) -> Generator[None, None, U]: ...
     def accumulate[V](self, func: Callable[[V, U], V], init: V) -> Flowable[V]: ...
     def batch(self, size: int) -> Flowable[list[U]]: ...
-    def buffer(self) -> Flowable[U]: ...
+    def buffer(
+        self,
+        size: int | None = None,
+        overflow: OverflowStrategy | None = None,
+        on_drop: Callable[[U], None] | None = None,
+        spill_to: str | None = None,
+        memory_limit: int | None = None,
+        serializer: Serializer | None = None,
+        gauge: BufferGauge | None = None,
+    ) -> Flowable[U]: ...
+    def cache(
+        self,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ) -> Flowable[U]: ...
     def copy[V](self, /, child: FlowableNode[V]) -> Flowable[V]: ...
     def default_if_empty[V](self, value: V) -> Flowable[U | V]: ...
     def filter(self, predicate: Callable[[U], bool]) -> Flowable[U]: ...
     def first(self) -> Flowable[U]: ...
-    def flat_map[V](self, func: Callable[[U], Flowable[V]]) -> Flowable[V]: ...
+    def flat_map[V](
+        self,
+        func: Callable[[U], Flowable[V]],
+        max_concurrency: int | None = None,
+        prefetch: int | None = None,
+    ) -> Flowable[V]: ...
     def last(self) -> Flowable[U]: ...
     def map[V](self, func: Callable[[U], V]) -> Flowable[V]: ...
+    def map_in_process[V](
+        self,
+        func: Callable[[U], V],
+        workers: int,
+        chunk_size: int | None = None,
+        executor: Executor | None = None,
+    ) -> Flowable[V]: ...
+    def observe_on(self, scheduler: Scheduler) -> Flowable[U]: ...
+    def parallel_map[V](
+        self,
+        func: Callable[[U], V],
+        workers: int,
+        ordered: bool | None = None,
+        executor: Executor | None = None,
+    ) -> Flowable[V]: ...
     def repeat(self, count: int | None) -> Flowable[U]: ...
     def reduce(self, func: Callable[[U, U], U]) -> Flowable[U]: ...
     def repeat_first(self) -> Flowable[U]: ...
     def seq(self) -> SeqFlowable[U]: ...
-    def share(self) -> Flowable[U]: ...
+    def share(
+        self,
+        max_lag: int | None = None,
+        on_lag: LagPolicy | None = None,
+        gauge: ShareLagGauge | None = None,
+    ) -> Flowable[U]: ...
     def skip(self, count: int) -> Flowable[U]: ...
     def skip_while(self, predicate: Callable[[U], bool]) -> Flowable[U]: ...
+    def subscribe_on(self, scheduler: Scheduler) -> Flowable[U]: ...
     def take(self, count: int) -> Flowable[U]: ...
     def take_while(self, predicate: Callable[[U], bool]) -> Flowable[U]: ...
     def tap(
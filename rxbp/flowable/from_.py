@@ -15,7 +15,12 @@ from rxbp.flowabletree.nodes import FlowableNode
 from rxbp.flowabletree.operations.buffer.flowable import init_buffer
 from rxbp.flowabletree.sources.connectable import init_connectable
 from rxbp.flowabletree.operations.merge.flowable import init_merge_flowable_node
+from rxbp.flowabletree.operations.merge.pendingqueue import MergeFairness
 from rxbp.flowabletree.operations.zip.flowable import init_zip_flowable_node
+from rxbp.flowabletree.processchannel import (
+    ProcessChannel,
+    from_process_channel as _from_process_channel,
+)
 from rxbp.flowabletree.from_ import (
     count as _count,
     empty as _empty,
@@ -34,8 +39,8 @@ def connectable(id, init):
     return init_connectable_flowable(child=init_connectable(id, init))
 
 
-def count():
-    return init_flowable(_count())
+def count(stack_budget: int | None = None):
+    return init_flowable(_count(stack_budget=stack_budget))
 
 
 def create(
@@ -54,8 +59,24 @@ def error(exception: Exception):
     return init_flowable(_error(exception))
 
 
-def from_iterable[U](iterable: Iterable[U]):
-    return init_flowable(_from_iterable(iterable))
+def from_iterable[U](
+    iterable: Iterable[U],
+    batch_size: int | None = None,
+    stack_budget: int | None = None,
+):
+    return init_flowable(
+        _from_iterable(iterable, batch_size=batch_size, stack_budget=stack_budget)
+    )
+
+
+def from_process_channel[U](
+    channel: ProcessChannel,
+    copy: bool | None = None,
+    stack_budget: int | None = None,
+):
+    return init_flowable(
+        _from_process_channel(channel, copy=copy, stack_budget=stack_budget)
+    )
 
 
 def from_value(value):
@@ -74,9 +95,15 @@ def interval(seconds: float, scheduler: Scheduler | None = None):
     return init_flowable(_interval(seconds, scheduler))
 
 
-def merge(observables: tuple[FlowableNode, ...]):
+def merge(
+    observables: tuple[FlowableNode, ...],
+    fairness: MergeFairness | None = None,
+):
     return init_flowable(
-        child=init_merge_flowable_node(children=observables),
+        child=init_merge_flowable_node(
+            children=observables,
+            fairness=fairness,
+        ),
     )
 
 
@@ -11,9 +11,11 @@ import reactivex
 
 from rxbp.flowable.flowable import Flowable, ConnectableFlowable
 from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.operations.merge.pendingqueue import MergeFairness
+from rxbp.flowabletree.processchannel import ProcessChannel
 
 def connectable[U](id, init: U) -> ConnectableFlowable[U]: ...
-def count() -> Flowable[int]: ...
+def count(stack_budget: int | None = None) -> Flowable[int]: ...
 
 class create[U]:
     def __new__(
@@ -25,13 +27,25 @@ class create[U]:
 
 def empty() -> Flowable[None]: ...
 def error() -> Flowable[None]: ...
-def from_iterable[U](iterable: Iterable[U]) -> Flowable[U]: ...
+def from_iterable[U](
+    iterable: Iterable[U],
+    batch_size: int | None = None,
+    stack_budget: int | None = None,
+) -> Flowable[U]: ...
+def from_process_channel(
+    channel: ProcessChannel,
+    copy: bool | None = None,
+    stack_budget: int | None = None,
+) -> Flowable: ...
 def from_value[U](value: U) -> Flowable[U]: ...
 def from_rx[U](source: reactivex.Observable[U]) -> Flowable[U]: ...
 def interval(
     seconds: float, scheduler: Scheduler | None = None
 ) -> Flowable[datetime.datetime]: ...
-def merge[U](observables: tuple[Flowable[U], ...]) -> Flowable[tuple[U, ...]]: ...
+def merge[U](
+    observables: tuple[Flowable[U], ...],
+    fairness: MergeFairness | None = None,
+) -> Flowable[tuple[U, ...]]: ...
 def repeat[U](value: U) -> Flowable[U]: ...
 def schedule_on(scheduler: Scheduler | None = None) -> Flowable[Scheduler]: ...
 def schedule_relative(
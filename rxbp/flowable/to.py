@@ -1,29 +1,117 @@
+from typing import Callable
+
 from continuationmonad.typing import (
     MainScheduler,
+    Scheduler,
 )
 
 from rxbp.flowabletree.to import (
+    drain as _drain,
     run as _run,
+    run_async as _run_async,
     to_rx as _to_rx,
 )
+from rxbp.flowabletree.iterator import (
+    to_iterator as _to_iterator,
+    to_async_iterator as _to_async_iterator,
+)
+from rxbp.flowabletree.processchannel import (
+    ProcessChannel,
+    to_process_channel as _to_process_channel,
+)
+from rxbp.schedulers.asyncioscheduler import AsyncIOScheduler
 from rxbp.flowable.flowable import ConnectableFlowable, Flowable
 
 
-def run[U](
-    source: Flowable[U],
-    scheduler: MainScheduler | None = None,
-    connections: dict[ConnectableFlowable, Flowable] | None = None,
+def _to_connections(
+    connections: dict[ConnectableFlowable, Flowable] | None,
 ):
     match connections:
         case None:
-            _connections = connections
+            return connections
         case _:
-            _connections = {c.child: s.child for c, s in connections.items()}
+            return {c.child: s.child for c, s in connections.items()}
 
+
+def run[U](
+    source: Flowable[U],
+    scheduler: MainScheduler | None = None,
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+    sink: Callable[[U], None] | None = None,
+    keep_last: int | None = None,
+):
     return _run(
         source=source.child,
-        scheduler=scheduler, 
-        connections=_connections,
+        scheduler=scheduler,
+        connections=_to_connections(connections),
+        sink=sink,
+        keep_last=keep_last,
+    )
+
+
+def drain[U](
+    source: Flowable[U],
+    scheduler: MainScheduler | None = None,
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+    sink: Callable[[U], None] | None = None,
+):
+    return _drain(
+        source=source.child,
+        scheduler=scheduler,
+        connections=_to_connections(connections),
+        sink=sink,
+    )
+
+
+async def run_async[U](
+    source: Flowable[U],
+    scheduler: AsyncIOScheduler | None = None,
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+    sink: Callable[[U], None] | None = None,
+    keep_last: int | None = None,
+):
+    return await _run_async(
+        source=source.child,
+        scheduler=scheduler,
+        connections=_to_connections(connections),
+        sink=sink,
+        keep_last=keep_last,
+    )
+
+
+def to_iterator[U](
+    source: Flowable[U],
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+):
+    return _to_iterator(
+        source=source.child,
+        connections=_to_connections(connections),
+    )
+
+
+def to_async_iterator[U](
+    source: Flowable[U],
+    scheduler: Scheduler | None = None,
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+):
+    return _to_async_iterator(
+        source=source.child,
+        scheduler=scheduler,
+        connections=_to_connections(connections),
+    )
+
+
+def to_process_channel[U](
+    source: Flowable[U],
+    channel: ProcessChannel | None = None,
+    capacity: int | None = None,
+    connections: dict[ConnectableFlowable, Flowable] | None = None,
+):
+    return _to_process_channel(
+        source=source.child,
+        channel=channel,
+        capacity=capacity,
+        connections=_to_connections(connections),
     )
 
 
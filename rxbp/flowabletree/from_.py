@@ -1,27 +1,66 @@
 import datetime
-from typing import Iterable
+import itertools
+from typing import Callable, Iterable, Iterator
 
 from donotation import do
 
 import continuationmonad
-from continuationmonad.typing import Scheduler
+from continuationmonad.typing import (
+    ContinuationCertificate,
+    ContinuationMonad,
+    Scheduler,
+)
 
 from rxbp.flowabletree.observer import Observer
 from rxbp.flowabletree.sources.create import init_create
 
 
 
-def count():
-    @do()
-    def count_and_send_item(observer: Observer, count: int):
-        yield observer.on_next(count)
+# number of items a source sends with synchronous acknowledgments before
+# it reschedules itself on the trampoline to unwind the stack
+DEFAULT_STACK_BUDGET = 32
 
-        yield from continuationmonad.schedule_trampoline()
 
-        return count_and_send_item(observer, count + 1)
+def _continue_with(
+    ack: ContinuationMonad[None],
+    budget: int,
+    stack_budget: int,
+    func: Callable[[int], ContinuationMonad[ContinuationCertificate]],
+):
+    """
+    Calls `func` with the remaining budget once the item is acknowledged.
+
+    A synchronous acknowledgment continues the loop on the current stack.
+    A deferred acknowledgment continues the loop whenever the downstream
+    resumes it. Once the budget is used up, the loop continues on the
+    trampoline with a fresh budget.
+    """
+
+    if 1 < budget:
+        return ack.flat_map(lambda _: func(budget - 1))
+
+    else:
+        return (
+            ack
+            .flat_map(lambda _: continuationmonad.schedule_trampoline())
+            .flat_map(lambda _: func(stack_budget))
+        )
+
+
+def count(stack_budget: int | None = None):
+    if stack_budget is None:
+        stack_budget = DEFAULT_STACK_BUDGET
+
+    def send_item(observer: Observer, count: int, budget: int):
+        return _continue_with(
+            ack=observer.on_next(count),
+            budget=budget,
+            stack_budget=stack_budget,
+            func=lambda budget: send_item(observer, count + 1, budget),
+        )
 
     return init_create(
-        func=lambda observer, _: count_and_send_item(observer, 0),
+        func=lambda observer, _: send_item(observer, 0, stack_budget),
     )
 
 
@@ -37,33 +76,73 @@ def error(exception: Exception):
     )
 
 
-def from_iterable[U](iterable: Iterable[U]):
-    @do()
-    def schedule_and_send_next(current_item: U, observer: Observer, iterator):
+def from_iterable[U](
+    iterable: Iterable[U],
+    batch_size: int | None = None,
+    stack_budget: int | None = None,
+):
+    if stack_budget is None:
+        stack_budget = DEFAULT_STACK_BUDGET
+
+    if batch_size is not None:
+        return _from_iterable_batched(iterable, batch_size, stack_budget)
+
+    def send_item(current_item: U, observer: Observer, iterator: Iterator[U], budget: int):
+        try:
+            next_item = next(iterator)
+
+        except StopIteration:
+            return observer.on_next_and_complete(current_item)
+
+        return _continue_with(
+            ack=observer.on_next(current_item),
+            budget=budget,
+            stack_budget=stack_budget,
+            func=lambda budget: send_item(next_item, observer, iterator, budget),
+        )
+
+    def start_procedure(observer: Observer, _):
+        iterator = iter(iterable)
+
         try:
-            next_item, has_item = next(iterator), True
+            next_item = next(iterator)
 
         except StopIteration:
-            next_item, has_item = None, False
+            return observer.on_completed()
+
+        return send_item(next_item, observer, iterator, stack_budget)
+
+    return init_create(func=start_procedure)
 
-        if has_item:
-            _ = yield from observer.on_next(current_item)
 
-            yield from continuationmonad.schedule_trampoline()
+def _from_iterable_batched[U](iterable: Iterable[U], batch_size: int, stack_budget: int):
+    def send_batch(current_batch: list[U], observer: Observer, iterator: Iterator[U], budget: int):
+        next_batch = list(itertools.islice(iterator, batch_size))
 
-            return schedule_and_send_next(next_item, observer, iterator)
+        if next_batch:
+            return _continue_with(
+                ack=observer.on_next_batch(current_batch),
+                budget=budget,
+                stack_budget=stack_budget,
+                func=lambda budget: send_batch(next_batch, observer, iterator, budget),
+            )
+
+        elif len(current_batch) == 1:
+            return observer.on_next_and_complete(current_batch[0])
 
         else:
-            return observer.on_next_and_complete(current_item)
+            return observer.on_next_batch(current_batch[:-1]).flat_map(
+                lambda _: observer.on_next_and_complete(current_batch[-1])
+            )
 
     def start_procedure(observer: Observer, _):
         iterator = iter(iterable)
+        batch = list(itertools.islice(iterator, batch_size))
 
-        try:
-            next_item = next(iterator)
-            return schedule_and_send_next(next_item, observer, iterator)
+        if batch:
+            return send_batch(batch, observer, iterator, stack_budget)
 
-        except StopIteration:
+        else:
             return observer.on_completed()
 
     return init_create(func=start_procedure)
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition, Thread
+from typing import Callable
+
+import continuationmonad
+from continuationmonad.typing import (
+    ContinuationCertificate,
+    DeferredHandler,
+    Scheduler,
+)
+
+from rxbp.cancellable import Cancellable
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.nodes import FlowableNode
+from rxbp.flowabletree.sources.connectable import ConnectableFlowableNode
+from rxbp.flowabletree.subscribeandconnect import init_sink_task
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.schedulers.asyncioscheduler import init_asyncio_scheduler
+
+
+@dataclass
+class IteratorObserver[U](Observer[U]):
+    """
+    Holds at most one item or batch received from upstream.
+
+    The acknowledgment of an item is deferred until the consumer has
+    taken all pending items and requests the next one.
+    """
+
+    scheduler: Scheduler
+    condition: Condition
+
+    # notifies the consumer, called while holding the condition
+    on_signal: Callable[[], None]
+
+    # returns the certificate that ends the subscription
+    on_terminated: Callable[[], ContinuationCertificate]
+
+    items: deque[U]
+    handler: DeferredHandler | None
+    is_terminated: bool
+    is_closed: bool
+    exception: Exception | None
+
+    # cancels upstream once the consumer closes the iterator
+    cancellable: Cancellable | None
+
+    def _on_next(self, items: list[U]):
+        def on_next_subscription(_, handler: DeferredHandler):
+            with self.condition:
+                is_closed = self.is_closed
+
+                if not is_closed:
+                    self.items.extend(items)
+                    self.handler = handler
+                    self.on_signal()
+
+            # upstream is not resumed until requested, or never if closed,
+            # in which case `close` ends the subscription
+            return self.scheduler._create_certificate(
+                weight=handler.weight, stack=tuple()
+            )
+
+        return continuationmonad.defer(on_next_subscription)
+
+    def _on_terminated(self, items: list[U], exception: Exception | None):
+        with self.condition:
+            is_closed = self.is_closed
+
+            if not is_closed:
+                self.items.extend(items)
+                self.exception = exception
+                self.is_terminated = True
+                self.on_signal()
+
+        if is_closed:
+            # the subscription is ended by `close`
+            return continuationmonad.from_(
+                self.scheduler._create_certificate(weight=1, stack=tuple())
+            )
+
+        return continuationmonad.from_(self.on_terminated())
+
+    def on_next(self, item: U):
+        return self._on_next([item])
+
+    def on_next_batch(self, items: list[U]):
+        return self._on_next(items)
+
+    def on_next_and_complete(self, item: U):
+        return self._on_terminated([item], None)
+
+    def on_completed(self):
+        return self._on_terminated([], None)
+
+    def on_error(self, exception: Exception):
+        return self._on_terminated([], exception)
+
+    def request(self):
+        """
+        Acknowledges the pending items, must be called while holding
+        the condition.
+        """
+
+        handler, self.handler = self.handler, None
+
+        if handler is None:
+            return
+
+        def task():
+            trampoline = continuationmonad.init_trampoline()
+
+            def trampoline_task():
+                return handler.resume(trampoline, handler.weight, None)
+
+            return trampoline.start_loop(
+                trampoline_task, weight=handler.weight, cancellation=None
+            )
+
+        self.scheduler.schedule(task, weight=handler.weight)
+
+    def _cancel(self, cancellable: Cancellable):
+        cancellable.cancel(
+            certificate=self.scheduler._create_certificate(
+                weight=1, stack=tuple()
+            )
+        )
+
+    def on_subscribed(self, result: SubscriptionResult):
+        with self.condition:
+            is_closed = self.is_closed
+
+            if not is_closed:
+                self.cancellable = result.cancellable
+
+        if is_closed:
+            # closed before upstream was subscribed
+            self._cancel(result.cancellable)
+
+    def close(self):
+        with self.condition:
+            if self.is_terminated or self.is_closed:
+                return
+
+            self.is_closed = True
+
+            # drop the deferred acknowledgment
+            self.handler = None
+
+            # wakes up a consumer waiting in another thread
+            self.on_signal()
+
+        def task():
+            with self.condition:
+                cancellable, self.cancellable = self.cancellable, None
+
+            if cancellable is not None:
+                self._cancel(cancellable)
+
+            return self.on_terminated()
+
+        self.scheduler.schedule(task, weight=1)
+
+
+def _init_iterator_observer[U](
+    scheduler: Scheduler,
+    condition: Condition,
+    on_signal: Callable[[], None],
+    on_terminated: Callable[[], ContinuationCertificate],
+):
+    return IteratorObserver[U](
+        scheduler=scheduler,
+        condition=condition,
+        on_signal=on_signal,
+        on_terminated=on_terminated,
+        items=deque(),
+        handler=None,
+        is_terminated=False,
+        is_closed=False,
+        exception=None,
+        cancellable=None,
+    )
+
+
+class FlowableIterator[U]:
+    """
+    Runs the flowable on a background thread and blocks in `__next__`
+    until the next item is received.
+    """
+
+    def __init__(
+        self,
+        source: FlowableNode[U],
+        connections: dict[ConnectableFlowableNode, FlowableNode] | None,
+    ):
+        self._source = source
+        self._connections = connections
+        self._observer: IteratorObserver[U] | None = None
+
+    def _start(self):
+        scheduler = continuationmonad.init_main_scheduler()
+        condition = Condition()
+
+        observer = _init_iterator_observer(
+            scheduler=scheduler,
+            condition=condition,
+            on_signal=condition.notify_all,
+            on_terminated=lambda: scheduler.stop(1),
+        )
+
+        schedule_task = init_sink_task(
+            source=self._source,
+            observer=observer,
+            scheduler=scheduler,
+            connections=self._connections,
+            on_subscribed=observer.on_subscribed,
+        )
+
+        def run():
+            try:
+                scheduler.run(schedule_task, weight=1, cancellation=None)
+
+            except Exception as exception:
+                with condition:
+                    observer.exception = exception
+                    observer.is_terminated = True
+                    condition.notify_all()
+
+        Thread(target=run, daemon=True).start()
+
+        return observer
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> U:
+        if self._observer is None:
+            self._observer = self._start()
+
+        observer = self._observer
+
+        with observer.condition:
+            while True:
+                if observer.items:
+                    return observer.items.popleft()
+
+                if observer.is_terminated or observer.is_closed:
+                    if observer.exception:
+                        exception, observer.exception = observer.exception, None
+                        raise exception
+
+                    raise StopIteration
+
+                observer.request()
+                observer.condition.wait()
+
+    def close(self):
+        """
+        Cancels the flowable without waiting for the remaining items.
+        """
+
+        if self._observer is not None:
+            self._observer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __del__(self):
+        # the background thread is stopped if the iterator is abandoned
+        self.close()
+
+
+class FlowableAsyncIterator[U]:
+    """
+    Runs the flowable on the running asyncio event loop and awaits the
+    next item in `__anext__`.
+    """
+
+    def __init__(
+        self,
+        source: FlowableNode[U],
+        scheduler: Scheduler | None,
+        connections: dict[ConnectableFlowableNode, FlowableNode] | None,
+    ):
+        self._source = source
+        self._scheduler = scheduler
+        self._connections = connections
+        self._observer: IteratorObserver[U] | None = None
+        self._waiter: asyncio.Future | None = None
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+
+        if self._scheduler is None:
+            scheduler = init_asyncio_scheduler(loop=loop)
+        else:
+            scheduler = self._scheduler
+
+        def wake():
+            if self._waiter is not None and not self._waiter.done():
+                self._waiter.set_result(None)
+
+        observer = _init_iterator_observer(
+            scheduler=scheduler,
+            condition=Condition(),
+            # the items might be received on another thread
+            on_signal=lambda: loop.call_soon_threadsafe(wake),
+            on_terminated=lambda: scheduler._create_certificate(
+                weight=1, stack=tuple()
+            ),
+        )
+
+        schedule_task = init_sink_task(
+            source=self._source,
+            observer=observer,
+            scheduler=scheduler,
+            connections=self._connections,
+            on_subscribed=observer.on_subscribed,
+        )
+
+        scheduler.schedule(schedule_task, weight=1)
+
+        return observer
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> U:
+        if self._observer is None:
+            self._observer = self._start()
+
+        observer = self._observer
+
+        while True:
+            with observer.condition:
+                if observer.items:
+                    return observer.items.popleft()
+
+                if observer.is_terminated or observer.is_closed:
+                    if observer.exception:
+                        exception, observer.exception = observer.exception, None
+                        raise exception
+
+                    raise StopAsyncIteration
+
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiter = waiter
+                observer.request()
+
+            await waiter
+
+    async def aclose(self):
+        """
+        Cancels the flowable without waiting for the remaining items.
+        """
+
+        if self._observer is not None:
+            self._observer.close()
+
+
+def to_iterator[U](
+    source: FlowableNode[U],
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+):
+    return FlowableIterator[U](
+        source=source,
+        connections=connections,
+    )
+
+
+def to_async_iterator[U](
+    source: FlowableNode[U],
+    scheduler: Scheduler | None = None,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+):
+    return FlowableAsyncIterator[U](
+        source=source,
+        scheduler=scheduler,
+        connections=connections,
+    )
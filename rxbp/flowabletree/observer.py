@@ -1,14 +1,50 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
+from donotation import do
+
+import continuationmonad
 from continuationmonad.typing import ContinuationCertificate, ContinuationMonad
 
 
+@do()
+def _send_items_one_by_one[U](observer: "Observer[U]", iterator: Iterator[U]):
+    try:
+        item, has_item = next(iterator), True
+
+    except StopIteration:
+        item, has_item = None, False
+
+    if has_item:
+        _ = yield from observer.on_next(item)
+
+        yield from continuationmonad.schedule_trampoline()
+
+        return _send_items_one_by_one(observer, iterator)
+
+    else:
+        return continuationmonad.from_(None)
+
+
 class Observer[U](ABC):
     @abstractmethod
     def on_next(
         self, item: U,
     ) -> ContinuationMonad[None]: ...
 
+    def on_next_batch(
+        self, items: list[U],
+    ) -> ContinuationMonad[None]:
+        """
+        Sends a batch of items that is acknowledged as a whole.
+
+        Observers that can process a batch at once override this method.
+        The default implementation unrolls the batch and sends each item
+        through `on_next`.
+        """
+
+        return _send_items_one_by_one(self, iter(items))
+
     @abstractmethod
     def on_next_and_complete(
         self, item: U
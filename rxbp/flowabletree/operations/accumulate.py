@@ -12,6 +12,27 @@ from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
 
 
+@dataclass(slots=True)
+class AccumulateObserver[U, V](Observer[U]):
+    observer: Observer[V]
+    func: Callable[[V, U], V]
+    acc: V
+
+    def on_next(self, item: U):
+        self.acc = self.func(self.acc, item)
+        return self.observer.on_next(self.acc)
+
+    def on_next_and_complete(self, item: U):
+        self.acc = self.func(self.acc, item)
+        return self.observer.on_next_and_complete(self.acc)
+
+    def on_completed(self):
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
 @dataclassabc(frozen=True)
 class AccumulateFlowable[U, V](SingleChildFlowableNode[U, U]):
     child: FlowableNode[U]
@@ -23,30 +44,14 @@ class AccumulateFlowable[U, V](SingleChildFlowableNode[U, U]):
         state: State,
         args: SubscribeArgs[V],
     ) -> tuple[State, SubscriptionResult]:
-        outer_self = self
-
-        @dataclass
-        class AccumulateObserver(Observer[U]):
-            acc: V
-
-            def on_next(self, item: U):
-                self.acc = outer_self.func(self.acc, item)
-                return args.observer.on_next(self.acc)
-
-            def on_next_and_complete(self, item: U):
-                self.acc = outer_self.func(self.acc, item)
-                return args.observer.on_next_and_complete(self.acc)
-
-            def on_completed(self):
-                return args.observer.on_completed()
-
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
-
         return self.child.unsafe_subscribe(
             state=state,
             args=args.copy(
-                observer=AccumulateObserver(acc=self.init),
+                observer=AccumulateObserver(
+                    observer=args.observer,
+                    func=self.func,
+                    acc=self.init,
+                ),
             ),
         )
 
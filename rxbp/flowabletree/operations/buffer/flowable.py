@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections import deque
 from threading import Lock
-from typing import override
+from typing import Callable, override
 
 from dataclassabc import dataclassabc
 
@@ -10,16 +11,28 @@ from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.flowabletree.operations.buffer.gauge import BufferGauge
 from rxbp.flowabletree.operations.buffer.observer import BufferObserver
-from rxbp.flowabletree.operations.buffer.states import LoopInactive
-from rxbp.flowabletree.operations.buffer.statetransitions import ToStateTransition
+from rxbp.flowabletree.operations.buffer.states import LoopInactive, OverflowStrategy
+from rxbp.flowabletree.operations.buffer.statetransitions import StateCell
+from rxbp.utils.ringbuffer import RingBuffer
+from rxbp.utils.spillbuffer import Serializer, SpillBuffer
 
 
 @dataclassabc(frozen=True)
 class BufferImpl[V](SingleChildFlowableNode[V, V]):
     child: FlowableNode[V]
     buffer_size: int | None
-    
+    overflow: OverflowStrategy
+    on_drop: Callable[[V], None] | None
+
+    # directory of the segment files, items are kept in memory if None
+    spill_to: str | None
+    memory_limit: int
+    serializer: Serializer | None
+
+    gauge: BufferGauge | None
+
     @override
     def unsafe_subscribe(
         self,
@@ -28,17 +41,38 @@ class BufferImpl[V](SingleChildFlowableNode[V, V]):
     ):
         loop_cancellation = init_cancellation_state()
 
+        if self.spill_to is not None:
+            buffer = SpillBuffer(
+                directory=self.spill_to,
+                memory_limit=self.memory_limit,
+                serializer=self.serializer,
+            )
+
+        elif self.buffer_size is None:
+            buffer = deque()
+
+        else:
+            # a blocked upstream stores one item beyond the buffer size
+            buffer = RingBuffer(capacity=self.buffer_size + 1)
+
         observer = BufferObserver(
-            transition=None,
+            transition=StateCell(state=LoopInactive()),
             upstream_cancellable=None,
             lock=Lock(),
             observer=args.observer,
             loop_cancellation=loop_cancellation,
             weight=args.weight,
-            buffer=[],
+            buffer=buffer,
             buffer_size=self.buffer_size,
+            overflow=self.overflow,
+            on_drop=self.on_drop,
+            loop_certificate=None,
+            n_dropped=0,
         )
 
+        if self.gauge is not None:
+            self.gauge._bind(observer)
+
         state, result = self.child.unsafe_subscribe(
             state=state, 
             args=args.copy(
@@ -47,7 +81,6 @@ class BufferImpl[V](SingleChildFlowableNode[V, V]):
         )
 
         observer.upstream_cancellable = result.cancellable
-        observer.transition = ToStateTransition(state=LoopInactive())
 
         return state, SubscriptionResult(
             certificate=result.certificate,
@@ -59,8 +92,26 @@ class BufferImpl[V](SingleChildFlowableNode[V, V]):
 def init_buffer[V](
     child: FlowableNode[V],
     buffer_size: int | None = None,
+    overflow: OverflowStrategy | None = None,
+    on_drop: Callable[[V], None] | None = None,
+    spill_to: str | None = None,
+    memory_limit: int | None = None,
+    serializer: Serializer | None = None,
+    gauge: BufferGauge | None = None,
 ):
+    if overflow is None:
+        overflow = 'drop_newest'
+
+    if memory_limit is None:
+        memory_limit = 1024
+
     return BufferImpl(
         child=child,
         buffer_size=buffer_size,
+        overflow=overflow,
+        on_drop=on_drop,
+        spill_to=spill_to,
+        memory_limit=memory_limit,
+        serializer=serializer,
+        gauge=gauge,
     )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from rxbp.flowabletree.operations.buffer.observer import BufferObserver
+
+
+class BufferGauge:
+    """
+    Reads the number of items stored and dropped by a buffer operator.
+    The gauge is bound to the most recent subscription.
+    """
+
+    __slots__ = ('_observer',)
+
+    def __init__(self):
+        self._observer: BufferObserver | None = None
+
+    def _bind(self, observer: BufferObserver):
+        self._observer = observer
+
+    @property
+    def n_buffered(self) -> int:
+        """Items stored and not yet sent downstream."""
+
+        if self._observer is None:
+            return 0
+
+        with self._observer.lock:
+            return len(self._observer.buffer)
+
+    @property
+    def n_dropped(self) -> int:
+        """Items dropped by the overflow strategy."""
+
+        if self._observer is None:
+            return 0
+
+        with self._observer.lock:
+            return self._observer.n_dropped
+
+
+def init_buffer_gauge():
+    return BufferGauge()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from threading import Lock
+from typing import Callable
 
 from donotation import do
 
@@ -14,12 +16,17 @@ from continuationmonad.typing import (
 from rxbp.cancellable import Cancellable, CancellationState
 from rxbp.flowabletree.observer import Observer
 from rxbp.flowabletree.operations.buffer.states import (
+    BufferState,
     CancelLoopState,
     CancelledState,
     CompleteState,
     ErrorState,
     LoopActive,
+    LoopActiveBlocked,
     LoopActivePopBuffer,
+    LoopActivePopBufferHead,
+    OverflowStrategy,
+    ResumeUpstream,
     SendErrorState,
     SendItemAndComplete,
     SendItemAndStartLoop,
@@ -33,7 +40,10 @@ from rxbp.flowabletree.operations.buffer.statetransitions import (
     OnCompletedTransition,
     RequestTransition,
     ShareStateTransition,
+    StateCell,
 )
+from rxbp.utils.ringbuffer import RingBuffer
+from rxbp.utils.spillbuffer import SpillBuffer
 
 
 @dataclass
@@ -43,33 +53,96 @@ class BufferObserver[V](Cancellable, Observer[V]):
     loop_cancellation: CancellationState
     weight: int
     buffer_size: int | None
+    overflow: OverflowStrategy
+    on_drop: Callable[[V], None] | None
 
-    transition: ShareStateTransition
+    transition: StateCell
     lock: Lock
 
-    buffer: list[V]
+    # items are added and removed while holding the lock
+    buffer: deque[V] | RingBuffer[V] | SpillBuffer[V]
+
+    # the certificate returned when the loop stops, it is handed over
+    # to upstream once it terminates or gets suspended
+    loop_certificate: ContinuationCertificate | None
+
+    n_dropped: int
+
+    def _on_next(self, transition: ShareStateTransition, item: V):
+        """
+        Applies the transition and updates the buffer accordingly.
+        """
+
+        dropped = []
+
+        with self.lock:
+            state = self.transition.apply(transition)
+
+            match state:
+                case LoopActivePopBuffer():
+                    dropped.append(item)
+
+                case LoopActivePopBufferHead(n_items=n_items):
+                    for _ in range(n_items):
+                        dropped.append(self.buffer.popleft())
+
+                    self.buffer.append(item)
+
+                case ErrorState():
+                    dropped.append(item)
+
+                case LoopActive():
+                    self.buffer.append(item)
+
+            self.n_dropped += len(dropped)
+
+        if self.on_drop is not None:
+            for item in dropped:
+                self.on_drop(item)
+
+        return state
+
+    def _hand_over_loop_certificate(self):
+        with self.lock:
+            certificate, self.loop_certificate = self.loop_certificate, None
+
+        return certificate
 
     @do()
     def run(self):
-        transition = RequestTransition(child=None)
+        transition = RequestTransition(child=None)  # type: ignore
 
         with self.lock:
-            transition.child = self.transition
-            self.transition = transition
+            state = self.transition.apply(transition)
 
-        state = transition.get_state()
+            match state:
+                case LoopActive() | SendItemAndComplete():
+                    item = self.buffer.popleft()
+
+                case StopLoop():
+                    certificate, self.loop_certificate = self.loop_certificate, None
 
         match state:
+            case ResumeUpstream(handler=handler):
+                certificate, *_ = yield from continuationmonad.from_(None).connect(
+                    (handler,)
+                )
+
+                # upstream took the loop certificate when it got blocked
+                with self.lock:
+                    self.loop_certificate = certificate
+
+                _ = yield from self.observer.on_next(item)
+                return self.run()
+
             case LoopActive():
-                item = self.buffer.pop(0)
                 _ = yield from self.observer.on_next(item)
                 return self.run()
 
             case SendItemAndComplete():
-                item = self.buffer.pop(0)
                 return self.observer.on_next_and_complete(item)
 
-            case StopLoop(certificate=certificate):
+            case StopLoop():
                 return continuationmonad.from_(certificate)
 
             case CompleteState():
@@ -84,30 +157,35 @@ class BufferObserver[V](Cancellable, Observer[V]):
     def on_next(self, value: V):
         # print(f"on_next({value})")
 
-        self.buffer.append(value)
-
         @do()
         def on_ack_subscription(_, handler: DeferredHandler):
             # print(f"on_next_subscription({value})")
 
-            certificate, *_ = yield from continuationmonad.from_(None).connect(
-                (handler,)
-            )
-
             transition = OnNextTransition(
                 child=None,  # type: ignore
-                certificate=certificate,
+                handler=handler,
                 buffer_size=self.buffer_size,
+                overflow=self.overflow,
             )
 
-            with self.lock:
-                transition.child = self.transition
-                self.transition = transition
+            state = self._on_next(transition, value)
+
+            match state:
+                case LoopActiveBlocked() | ErrorState():
+                    # upstream is not resumed
+                    return continuationmonad.from_(self._hand_over_loop_certificate())
+
+                case _:
+                    pass
 
-            state = transition.get_state()
+            certificate, *_ = yield from continuationmonad.from_(None).connect(
+                (handler,)
+            )
 
             match state:
                 case SendItemAndStartLoop():
+                    self.loop_certificate = certificate
+
                     trampoline = yield from continuationmonad.get_trampoline()
 
                     r_certificate = continuationmonad.fork(
@@ -118,12 +196,6 @@ class BufferObserver[V](Cancellable, Observer[V]):
                         weight=self.weight,
                     )
 
-                case LoopActivePopBuffer():
-                    # pop item that has just been added
-                    self.buffer.pop()
-                    
-                    r_certificate = certificate
-
                 case LoopActive():
                     r_certificate = certificate
 
@@ -134,29 +206,19 @@ class BufferObserver[V](Cancellable, Observer[V]):
 
         return continuationmonad.defer(on_ack_subscription)
 
-    @do()
     def on_next_and_complete(self, value: V):
         # print(f"on_next_and_complete({value})")
 
-        self.buffer.append(value)
-
         transition = OnNextAndCompleteTransition(
             child=None,  # type: ignore
             buffer_size=self.buffer_size,
+            overflow=self.overflow,
         )
 
-        with self.lock:
-            transition.child = self.transition
-            self.transition = transition
-
-        match state := transition.get_state():
-            case LoopActivePopBuffer(certificate=certificate):
-                self.buffer.pop(0)
-                return continuationmonad.from_(certificate)
-
-            case LoopActive(certificate=certificate):
+        match state := self._on_next(transition, value):
+            case LoopActive() | ErrorState():
                 # there are still items in the buffer
-                return continuationmonad.from_(certificate)
+                return continuationmonad.from_(self._hand_over_loop_certificate())
 
             case SendItemAndComplete():
                 return self.observer.on_next_and_complete(value)
@@ -164,21 +226,23 @@ class BufferObserver[V](Cancellable, Observer[V]):
             case _:
                 raise Exception(f"Unexpected state {state}")
 
+    def _transition(self, transition: ShareStateTransition) -> BufferState:
+        with self.lock:
+            state = self.transition.apply(transition)
+
+        return state
+
     def on_completed(self):
         transition = OnCompletedTransition(
             child=None,  # type: ignore
         )
 
-        with self.lock:
-            transition.child = self.transition
-            self.transition = transition
-
-        match state := transition.get_state():
+        match state := self._transition(transition):
             case CompleteState():
                 return self.observer.on_completed()
 
-            case LoopActive(certificate=certificate):
-                return continuationmonad.from_(certificate)
+            case LoopActive():
+                return continuationmonad.from_(self._hand_over_loop_certificate())
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -189,18 +253,14 @@ class BufferObserver[V](Cancellable, Observer[V]):
             exception=exception,
         )
 
-        with self.lock:
-            transition.child = self.transition
-            self.transition = transition
-
-        match state := transition.get_state():
+        match state := self._transition(transition):
             case SendErrorState(
                 exception=exception,
             ):
                 return self.observer.on_error(exception)
 
-            case ErrorState(certificate=certificate):
-                return continuationmonad.from_(certificate)
+            case ErrorState():
+                return continuationmonad.from_(self._hand_over_loop_certificate())
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -210,18 +270,22 @@ class BufferObserver[V](Cancellable, Observer[V]):
             child=None,  # type: ignore
         )
 
-        with self.lock:
-            transition.child = self.transition
-            self.transition = transition
+        match state := self._transition(transition):
+            case CancelLoopState():
+                loop_certificate = self._hand_over_loop_certificate()
 
-        self.upstream_cancellable.cancel(certificate=certificate)
+                if loop_certificate is None:
+                    # upstream is either terminated or suspended, in which
+                    # case it is not resumed and is only disposed
+                    self.upstream_cancellable.cancel(certificate=certificate)
+                    self.loop_cancellation.cancel(certificate=certificate)
 
-        match state := transition.get_state():
-            case CancelLoopState(certificate=certificate):
-                self.loop_cancellation.cancel(certificate=certificate)
+                else:
+                    self.upstream_cancellable.cancel(certificate=certificate)
+                    self.loop_cancellation.cancel(certificate=loop_certificate)
 
             case CancelledState():
-                pass
+                self.upstream_cancellable.cancel(certificate=certificate)
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
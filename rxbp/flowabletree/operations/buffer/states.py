@@ -1,8 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Literal
 
-from continuationmonad.typing import ContinuationCertificate
+from continuationmonad.typing import DeferredHandler
+
+
+type OverflowStrategy = Literal[
+    'drop_newest',
+    'drop_oldest',
+    'keep_latest',
+    'error',
+    'block',
+]
 
 
 @dataclass
@@ -17,15 +27,32 @@ class LoopActive(BufferState):
     num_items: int
     is_completed: bool
 
-    # since the loop is active, we get an additional certificate
-    certificate: ContinuationCertificate
-
 
 @dataclass
 class LoopActivePopBuffer(LoopActive):
+    """The received item is dropped"""
     pass
 
 
+@dataclass
+class LoopActivePopBufferHead(LoopActive):
+    """The oldest items are dropped"""
+
+    n_items: int
+
+
+@dataclass
+class LoopActiveBlocked(LoopActive):
+    """The buffer is full, upstream is resumed once an item is sent"""
+
+    handler: DeferredHandler
+
+
+@dataclass
+class ResumeUpstream(LoopActive):
+    handler: DeferredHandler
+
+
 @dataclass
 class SendItemAndStartLoop(LoopActive):
     pass
@@ -44,7 +71,7 @@ class SendItemAndComplete(LoopInactive):
 
 @dataclass
 class StopLoop(LoopInactive):
-    certificate: ContinuationCertificate
+    pass
 
 
 @dataclass
@@ -54,7 +81,6 @@ class CompleteState(BufferState):
 
 @dataclass
 class ErrorState(BufferState):
-    certificate: ContinuationCertificate
     exception: Exception
 
 
@@ -65,10 +91,9 @@ class SendErrorState(BufferState):
 
 @dataclass
 class CancelledState(BufferState):
-    # certificate: ContinuationCertificate
     pass
 
 
 @dataclass
 class CancelLoopState(BufferState):
-    certificate: ContinuationCertificate
+    pass
@@ -2,17 +2,22 @@ from abc import ABC, abstractmethod
 
 from dataclassabc import dataclassabc
 
-from continuationmonad.typing import ContinuationCertificate
+from continuationmonad.typing import DeferredHandler
 
+from rxbp.exceptions import BufferOverflowException
 from rxbp.flowabletree.operations.buffer.states import (
     CancelLoopState,
     LoopActive,
+    LoopActiveBlocked,
     BufferState,
     CancelledState,
     CompleteState,
     ErrorState,
     LoopActivePopBuffer,
+    LoopActivePopBufferHead,
     LoopInactive,
+    OverflowStrategy,
+    ResumeUpstream,
     SendErrorState,
     SendItemAndStartLoop,
     SendItemAndComplete,
@@ -25,50 +30,119 @@ class ShareStateTransition(ABC):
     def get_state(self) -> BufferState: ...
 
 
-@dataclassabc(frozen=True)
-class ToStateTransition(ShareStateTransition):
-    """Transitions to predefined state"""
+class StateCell(ShareStateTransition):
+    """Holds the current state, updated in place while holding the lock"""
 
-    state: BufferState
+    __slots__ = ('state',)
+
+    def __init__(self, state: BufferState):
+        self.state = state
 
     def get_state(self):
         return self.state
 
+    def apply(self, transition) -> BufferState:
+        """
+        Evaluates the transition on the current state, must be called
+        while holding the lock.
+        """
+
+        transition.child = self
+        self.state = transition.get_state()
+        return self.state
+
+
+def _to_overflow_state(
+    num_items: int,
+    buffer_size: int,
+    overflow: OverflowStrategy,
+    handler: DeferredHandler | None,
+):
+    """
+    Returns the state after an item is received by a full buffer.
+    A handler is given, if the item is not the last one.
+    """
+
+    match overflow:
+        case 'drop_newest':
+            return LoopActivePopBuffer(
+                num_items=num_items,
+                is_completed=handler is None,
+            )
+
+        case 'drop_oldest':
+            return LoopActivePopBufferHead(
+                num_items=num_items,
+                is_completed=handler is None,
+                n_items=1,
+            )
+
+        case 'keep_latest':
+            return LoopActivePopBufferHead(
+                num_items=1,
+                is_completed=handler is None,
+                n_items=num_items,
+            )
+
+        case 'error':
+            return ErrorState(
+                exception=BufferOverflowException(
+                    f"Buffer of size {buffer_size} overflowed."
+                ),
+            )
+
+        case 'block':
+            if handler is None:
+                # the last item is stored, as upstream is not resumed anyway
+                return LoopActive(
+                    num_items=num_items + 1,
+                    is_completed=True,
+                )
+
+            else:
+                return LoopActiveBlocked(
+                    num_items=num_items + 1,
+                    is_completed=False,
+                    handler=handler,
+                )
+
+        case _:
+            raise Exception(f"Unexpected overflow strategy {overflow}.")
+
 
 @dataclassabc(frozen=False)
 class OnNextTransition(ShareStateTransition):
     """Item received"""
 
     child: ShareStateTransition
-    certificate: ContinuationCertificate
+    handler: DeferredHandler
     buffer_size: int | None
+    overflow: OverflowStrategy
 
     def get_state(self):
         match child_state := self.child.get_state():
             case LoopActive(
                 num_items=num_items,
                 is_completed=is_completed,
-                certificate=certificate,
             ):
                 if self.buffer_size is not None and num_items == self.buffer_size:
-                    return LoopActivePopBuffer(
+                    return _to_overflow_state(
                         num_items=num_items,
-                        is_completed=is_completed,
-                        certificate=certificate,
+                        buffer_size=self.buffer_size,
+                        overflow=self.overflow,
+                        handler=self.handler,
                     )
 
                 else:
                     return LoopActive(
                         num_items=num_items + 1,
                         is_completed=is_completed,
-                        certificate=certificate,
                     )
 
             case LoopInactive():
                 return SendItemAndStartLoop(
                     num_items=1,
                     is_completed=False,
-                    certificate=self.certificate,
                 )
 
             case _:
@@ -83,25 +157,25 @@ class OnNextAndCompleteTransition(ShareStateTransition):
 
     child: ShareStateTransition
     buffer_size: int | None
+    overflow: OverflowStrategy
 
     def get_state(self):
         match child_state := self.child.get_state():
             case LoopActive(
                 num_items=num_items,
-                certificate=certificate,
             ):
                 if self.buffer_size is not None and num_items == self.buffer_size:
-                    return LoopActivePopBuffer(
+                    return _to_overflow_state(
                         num_items=num_items,
-                        is_completed=True,
-                        certificate=certificate,
+                        buffer_size=self.buffer_size,
+                        overflow=self.overflow,
+                        handler=None,
                     )
 
                 else:
                     return LoopActive(
                         num_items=num_items + 1,
                         is_completed=True,
-                        certificate=certificate,
                     )
 
             case LoopInactive():
@@ -119,16 +193,26 @@ class RequestTransition(ShareStateTransition):
 
     def get_state(self):
         match child_state := self.child.get_state():
+            case LoopActiveBlocked(
+                num_items=num_items,
+                is_completed=is_completed,
+                handler=handler,
+            ):
+                return ResumeUpstream(
+                    num_items=num_items - 1,
+                    is_completed=is_completed,
+                    handler=handler,
+                )
+
             case LoopActive(
                 num_items=num_items,
                 is_completed=is_completed,
-                certificate=certificate,
             ):
                 if num_items == 0 and is_completed:
                     return CompleteState()
 
                 if num_items == 0:
-                    return StopLoop(certificate=certificate)
+                    return StopLoop()
 
                 if num_items == 1 and is_completed:
                     return SendItemAndComplete()
@@ -137,7 +221,6 @@ class RequestTransition(ShareStateTransition):
                     return LoopActive(
                         num_items=num_items - 1,
                         is_completed=is_completed,
-                        certificate=certificate,
                     )
 
             case ErrorState(exception=exception):
@@ -159,12 +242,10 @@ class OnCompletedTransition(ShareStateTransition):
         match child_state := self.child.get_state():
             case LoopActive(
                 num_items=num_items,
-                certificate=certificate,
             ):
                 return LoopActive(
                     num_items=num_items,
                     is_completed=True,
-                    certificate=certificate,
                 )
 
             case LoopInactive():
@@ -181,10 +262,9 @@ class OnErrorTransition(ShareStateTransition):
 
     def get_state(self):
         match child_state := self.child.get_state():
-            case LoopActive(certificate=certificate):
+            case LoopActive():
                 return ErrorState(
                     exception=self.exception,
-                    certificate=certificate,
                 )
 
             case LoopInactive():
@@ -199,12 +279,11 @@ class OnErrorTransition(ShareStateTransition):
 @dataclassabc(frozen=False)
 class CancelTransition(ShareStateTransition):
     child: ShareStateTransition
-    id: int
 
     def get_state(self):
         match child_state := self.child.get_state():
-            case LoopActive(certificate=certificate):
-                return CancelLoopState(certificate=certificate)
+            case LoopActive() | ErrorState():
+                return CancelLoopState()
 
             case LoopInactive():
                 return CancelledState()
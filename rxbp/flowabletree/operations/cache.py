@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.from_ import from_iterable
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.utils.replaycache import ReplayCache
+
+
+@dataclass(slots=True)
+class CacheObserver[U](Observer[U]):
+    observer: Observer[U]
+    cache: ReplayCache[U]
+
+    # index of the next item received from upstream
+    index: int
+
+    def on_next(self, item: U):
+        self.cache.record(self.index, item)
+        self.index += 1
+        return self.observer.on_next(item)
+
+    def on_next_batch(self, items: list[U]):
+        for item in items:
+            self.cache.record(self.index, item)
+            self.index += 1
+
+        return self.observer.on_next_batch(items)
+
+    def on_next_and_complete(self, item: U):
+        self.cache.record(self.index, item)
+        self.cache.complete(self.index + 1)
+        return self.observer.on_next_and_complete(item)
+
+    def on_completed(self):
+        self.cache.complete(self.index)
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class CacheFlowable[U](SingleChildFlowableNode[U, U]):
+    child: FlowableNode[U]
+
+    # shared by all subscriptions of the flowable
+    cache: ReplayCache[U]
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        items = self.cache.get_items()
+
+        if items is not None:
+            # replay the completed sequence without subscribing upstream
+            return from_iterable(items).unsafe_subscribe(state, args)
+
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=CacheObserver(
+                    observer=args.observer,
+                    cache=self.cache,
+                    index=0,
+                ),
+            ),
+        )
+
+
+def init_cache_flowable[U](
+    child: FlowableNode[U],
+    max_items: int | None = None,
+    max_bytes: int | None = None,
+    ttl: float | None = None,
+):
+    return CacheFlowable[U](
+        child=child,
+        cache=ReplayCache(
+            max_items=max_items,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        ),
+    )
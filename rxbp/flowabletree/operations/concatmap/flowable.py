@@ -5,6 +5,7 @@ from typing import Callable
 
 from dataclassabc import dataclassabc
 
+from rxbp.flowabletree.operations.buffer.flowable import init_buffer
 from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
@@ -67,7 +68,30 @@ class ConcatMapFlowable[U, V](SingleChildFlowableNode[U, V]):
 def init_concat_map[U, V](
     child: FlowableNode[U],
     func: Callable[[U], FlowableNode[V]],
+    prefetch: int | None = None,
 ):
+    """
+    With `prefetch=n`, up to n outer items are requested while an inner
+    flowable is active, and the active inner flowable buffers up to n
+    items.
+    """
+
+    if prefetch is not None:
+        child = init_buffer(
+            child=child,
+            buffer_size=prefetch,
+            overflow='block',
+        )
+
+        inner_func = func
+
+        def func(item: U):
+            return init_buffer(
+                child=inner_func(item),
+                buffer_size=prefetch,
+                overflow='block',
+            )
+
     return ConcatMapFlowable(
         child=child,
         func=func,
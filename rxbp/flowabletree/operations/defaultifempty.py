@@ -10,6 +10,30 @@ from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
 
 
+@dataclass(slots=True)
+class DefaultIfEmptyObserver[U, V](Observer[U]):
+    observer: Observer[U | V]
+    value: V
+    is_empty: bool
+
+    def on_next(self, item: U):
+        self.is_empty = False
+        return self.observer.on_next(item)
+
+    def on_next_and_complete(self, item: U):
+        return self.observer.on_next_and_complete(item)
+
+    def on_completed(self):
+        if self.is_empty:
+            return self.observer.on_next_and_complete(self.value)
+        
+        else:
+            return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
 @dataclassabc(frozen=True)
 class DefaultIfEmptyFlowable[U, V](SingleChildFlowableNode[U, U | V]):
     child: FlowableNode[U]
@@ -20,33 +44,14 @@ class DefaultIfEmptyFlowable[U, V](SingleChildFlowableNode[U, U | V]):
         state: State,
         args: SubscribeArgs[U],
     ) -> tuple[State, SubscriptionResult]:
-        outer_self = self
-
-        @dataclass
-        class DefaultIfEmptyObserver(Observer):
-            is_empty: bool
-
-            def on_next(self, item: U):
-                self.is_empty = False
-                return args.observer.on_next(item)
-
-            def on_next_and_complete(self, item: U):
-                return args.observer.on_next_and_complete(item)
-
-            def on_completed(self):
-                if self.is_empty:
-                    return args.observer.on_next_and_complete(outer_self.value)
-                
-                else:
-                    return args.observer.on_completed()
-
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
-
         return self.child.unsafe_subscribe(
             state=state,
             args=args.copy(
-                observer=DefaultIfEmptyObserver(is_empty=True),
+                observer=DefaultIfEmptyObserver(
+                    observer=args.observer,
+                    value=self.value,
+                    is_empty=True,
+                ),
             ),
         )
 
@@ -1,56 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Callable
 
-import continuationmonad
 from dataclassabc import dataclassabc
 
-from rxbp.state import State
-from rxbp.flowabletree.observer import Observer
-from rxbp.flowabletree.subscribeargs import SubscribeArgs
-from rxbp.flowabletree.subscriptionresult import SubscriptionResult
-from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.flowabletree.nodes import FlowableNode
+from rxbp.flowabletree.operations.fused import SKIP, FusableFlowableNode
 
 
 @dataclassabc(frozen=True)
-class FilterFlowable[U](SingleChildFlowableNode[U, U]):
+class FilterFlowable[U](FusableFlowableNode[U, U]):
     child: FlowableNode[U]
     predicate: Callable[[U], bool]
 
-    def unsafe_subscribe(
-        self,
-        state: State,
-        args: SubscribeArgs[U],
-    ) -> tuple[State, SubscriptionResult]:
-        outer_self = self
-
-        @dataclass
-        class FilterObserver(Observer):
-            def on_next(self, item: U):
-                if outer_self.predicate(item):
-                    return args.observer.on_next(item)
-                else:
-                    return continuationmonad.from_(None)
-
-            def on_next_and_complete(self, item: U):
-                if outer_self.predicate(item):
-                    return args.observer.on_next_and_complete(item)
-                else:
-                    return args.observer.on_completed()
-
-            def on_completed(self):
-                return args.observer.on_completed()
-
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
-
-        return self.child.unsafe_subscribe(
-            state=state,
-            args=args.copy(
-                observer=FilterObserver(),
-            ),
-        )
+    def fused_on_next(self, item: U):
+        if self.predicate(item):
+            return item
+        else:
+            return SKIP
 
 
 def init_filter_flowable[U](
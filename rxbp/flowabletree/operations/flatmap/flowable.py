@@ -6,7 +6,8 @@ from typing import Callable
 from dataclassabc import dataclassabc
 from donotation import do
 
-from rxbp.utils.framesummary import FrameSummary, FrameSummaryMixin
+from rxbp.utils.framesummary import CapturedStack, FrameSummaryMixin
+from rxbp.flowabletree.operations.buffer.flowable import init_buffer
 from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
@@ -22,7 +23,10 @@ from rxbp.flowabletree.operations.flatmap.observer import FlatMapObserver
 class FlatMapFlowableNode[U, V](FrameSummaryMixin, SingleChildFlowableNode[U, V]):
     child: FlowableNode[U]
     func: Callable[[U], FlowableNode[V]]
-    stack: tuple[FrameSummary, ...]
+    stack: CapturedStack | None
+
+    # maximum number of active inner flowables, unbounded if None
+    max_concurrency: int | None = None
 
     @do()
     def unsafe_subscribe(
@@ -40,6 +44,7 @@ class FlatMapFlowableNode[U, V](FrameSummaryMixin, SingleChildFlowableNode[U, V]
                     active_ids=tuple(),
                     certificates=tuple(),
                     is_outer_completed=False,
+                    max_concurrency=self.max_concurrency,
                 ),
             ),
             cancellables={},
@@ -72,6 +77,36 @@ class FlatMapFlowableNode[U, V](FrameSummaryMixin, SingleChildFlowableNode[U, V]
 def init_flat_map_node[U, V](
     child: FlowableNode[U], 
     func: Callable[[U], FlowableNode[V]],
-    stack: tuple[FrameSummary, ...],
+    stack: CapturedStack | None,
+    max_concurrency: int | None = None,
+    prefetch: int | None = None,
 ):
-    return FlatMapFlowableNode[U, V](child=child, func=func, stack=stack)
+    """
+    With `prefetch=n`, up to n outer items are requested ahead of the
+    subscribed inner flowables, and each inner flowable buffers up to n
+    items, such that it does not wait for the items of other inner
+    flowables to be acknowledged.
+    """
+
+    if prefetch is not None:
+        child = init_buffer(
+            child=child,
+            buffer_size=prefetch,
+            overflow='block',
+        )
+
+        inner_func = func
+
+        def func(item: U):
+            return init_buffer(
+                child=inner_func(item),
+                buffer_size=prefetch,
+                overflow='block',
+            )
+
+    return FlatMapFlowableNode[U, V](
+        child=child,
+        func=func,
+        stack=stack,
+        max_concurrency=max_concurrency,
+    )
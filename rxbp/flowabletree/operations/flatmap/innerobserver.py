@@ -23,6 +23,7 @@ from rxbp.flowabletree.operations.flatmap.states import (
     OnNextAndCompleteState,
     OnNextState,
     HasTerminatedState,
+    ResumeOuterStateMixin,
     StopContinuationStateMixin,
 )
 from rxbp.flowabletree.operations.flatmap.statetransitions import (
@@ -36,6 +37,15 @@ from rxbp.flowabletree.operations.flatmap.statetransitions import (
 from rxbp.flowabletree.operations.flatmap.sharedmemory import FlatMapSharedMemory
 
 
+@do()
+def _resume_outer(handler: DeferredHandler):
+    """Resumes the outer flowable backpressured by the concurrency limit"""
+
+    trampoline = yield from continuationmonad.get_trampoline()
+    certificate = handler.resume(trampoline, handler.weight, None)
+    return continuationmonad.from_(certificate)
+
+
 @dataclass
 class FlatMapInnerObserver[V](Observer[V]):
     shared: FlatMapSharedMemory
@@ -92,6 +102,9 @@ class FlatMapInnerObserver[V](Observer[V]):
             case AwaitOnNextState(certificate=certificate):
                 return continuationmonad.from_(certificate)
 
+            case ResumeOuterStateMixin(handler=handler):
+                return _resume_outer(handler)
+
             case OnNextAndCompleteState(value=value):
                 return self.shared.downstream.on_next_and_complete(value)
 
@@ -158,6 +171,9 @@ class FlatMapInnerObserver[V](Observer[V]):
             case StopContinuationStateMixin(certificate=certificate):
                 return continuationmonad.from_(certificate)
 
+            case ResumeOuterStateMixin(handler=handler):
+                return _resume_outer(handler)
+
             case _:
                 raise Exception(f"Unexpected state {state}.")
 
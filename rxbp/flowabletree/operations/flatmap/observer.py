@@ -12,7 +12,7 @@ from continuationmonad.typing import (
     Scheduler,
 )
 
-from rxbp.utils.framesummary import FrameSummary, to_execution_exception_message, to_operator_exception_message
+from rxbp.utils.framesummary import CapturedStack, to_execution_exception_message, to_operator_exception_message
 from rxbp.exceptions import RxBpException
 from rxbp.state import init_state
 from rxbp.flowabletree.nodes import FlowableNode
@@ -45,7 +45,7 @@ class FlatMapObserver[U, V](Observer):
     weight: int
     scheduler: Scheduler
     func: Callable[[U], FlowableNode[V]]
-    stack: tuple[FrameSummary, ...]
+    stack: CapturedStack | None
     raise_immediately: bool
 
     @do()
@@ -153,6 +153,7 @@ class FlatMapObserver[U, V](Observer):
                 id=id,
                 child=None,  # type: ignore
                 certificate=result.certificate,
+                handler=handler,
             )
 
         with self.shared.lock:
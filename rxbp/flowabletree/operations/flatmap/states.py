@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from continuationmonad.typing import (
     ContinuationCertificate,
@@ -37,6 +37,14 @@ class ActiveStateMixin(FlatMapState):
     is_outer_completed: bool
     # outer_certificate: ContinuationCertificate
 
+    # maximum number of active inner flowables, unbounded if None
+    max_concurrency: int | None = field(default=None, kw_only=True)
+
+    # Outer on_next call that is not acknowledged, because the maximum
+    # number of inner flowables is active. Its certificate is not part
+    # of the upstream continuation certificates.
+    outer_handler: DeferredHandler | None = field(default=None, kw_only=True)
+
 
 @dataclass(frozen=True)
 class StopContinuationStateMixin:
@@ -46,6 +54,16 @@ class StopContinuationStateMixin:
     certificate: ContinuationCertificate
 
 
+@dataclass(frozen=True)
+class ResumeOuterStateMixin:
+    """
+    Resume the backpressured outer on_next call instead of stopping the
+    continuation associated with the incoming upstream call.
+    """
+
+    handler: DeferredHandler
+
+
 @dataclass(frozen=True)
 class AwaitUpstreamStateMixin(ActiveStateMixin):
     """Await upstream items"""
@@ -77,11 +95,21 @@ class SubscribedStateOuterCompleted(StopContinuationStateMixin, AwaitUpstreamSta
     """Await first upstream item"""
 
 
+@dataclass(frozen=True, slots=True)
+class SubscribedOuterBackpressuredState(StopContinuationStateMixin, AwaitUpstreamStateMixin):
+    """Maximum number of inner flowables is active, outer is not acknowledged"""
+
+
 @dataclass(frozen=True, slots=True)
 class AwaitOnNextState(StopContinuationStateMixin, AwaitUpstreamStateMixin):
     """Await futher items."""
 
 
+@dataclass(frozen=True, slots=True)
+class AwaitOnNextResumeOuterState(ResumeOuterStateMixin, AwaitUpstreamStateMixin):
+    """Await further items, an inner flowable terminated."""
+
+
 @dataclass(frozen=True, slots=True)
 class AwaitDownstreamStateMixin(ActiveStateMixin):
     """Await downstream request"""
@@ -94,6 +122,11 @@ class AwaitDownstreamOuterCompletedState(StopContinuationStateMixin, AwaitDownst
     """Await downstream request"""
 
 
+@dataclass(frozen=True, slots=True)
+class AwaitDownstreamOuterBackpressuredState(StopContinuationStateMixin, AwaitDownstreamStateMixin):
+    """Maximum number of inner flowables is active, outer is not acknowledged"""
+
+
 @dataclass(frozen=True, slots=True)
 class OnNextState[U](AwaitDownstreamStateMixin):
     """send item"""
@@ -109,6 +142,11 @@ class KeepWaitingState(StopContinuationStateMixin, AwaitDownstreamStateMixin):
     # certificate: ContinuationCertificate
 
 
+@dataclass(frozen=True, slots=True)
+class KeepWaitingResumeOuterState(ResumeOuterStateMixin, AwaitDownstreamStateMixin):
+    """Await for downstream to request new item, an inner flowable terminated."""
+
+
 @dataclass(frozen=True, slots=True)
 class TerminatedStateMixin(FlatMapState):
     """Flowable either completed, errored, or cancelled"""
@@ -11,6 +11,8 @@ from continuationmonad.typing import (
 )
 
 from rxbp.flowabletree.operations.flatmap.states import (
+    ActiveStateMixin,
+    AwaitDownstreamOuterBackpressuredState,
     AwaitDownstreamOuterCompletedState,
     AwaitDownstreamStateMixin,
     AwaitUpstreamStateMixin,
@@ -26,9 +28,12 @@ from rxbp.flowabletree.operations.flatmap.states import (
     TerminatedStateMixin,
     OnNextState,
     KeepWaitingState,
+    KeepWaitingResumeOuterState,
     AwaitOnNextState,
+    AwaitOnNextResumeOuterState,
     BackpressuredOnNextCalls,
     OnNextAndCompleteState,
+    SubscribedOuterBackpressuredState,
 )
 
 
@@ -47,6 +52,100 @@ class ToStateTransition(FlatMapStateTransition):
         return self.state
 
 
+def _concurrency(state: ActiveStateMixin):
+    """Concurrency limit carried over to the next active state"""
+
+    return dict(
+        max_concurrency=state.max_concurrency,
+        outer_handler=state.outer_handler,
+    )
+
+
+def _has_outer_certificate(state: ActiveStateMixin):
+    """
+    The first upstream continuation certificate belongs to the outer
+    flowable, unless it is completed or backpressured.
+    """
+
+    return not state.is_outer_completed and state.outer_handler is None
+
+
+def _can_resume_outer(state: ActiveStateMixin, active_ids: tuple[int, ...]):
+    return (
+        state.outer_handler is not None
+        and len(active_ids) < state.max_concurrency  # type: ignore
+    )
+
+
+def _to_await_on_next_state(
+    state: ActiveStateMixin,
+    active_ids: tuple[int, ...],
+    certificates: tuple[ContinuationCertificate, ...],
+    is_outer_completed: bool,
+    certificate: ContinuationCertificate | None = None,
+):
+    """
+    Stops the continuation with the given certificate, or with the first
+    upstream continuation certificate if None. If an inner flowable
+    terminated, the backpressured outer call is resumed instead.
+    """
+
+    if _can_resume_outer(state, active_ids):
+        return AwaitOnNextResumeOuterState(
+            handler=state.outer_handler,  # type: ignore
+            active_ids=active_ids,
+            certificates=certificates
+            if certificate is None
+            else certificates + (certificate,),
+            is_outer_completed=is_outer_completed,
+            max_concurrency=state.max_concurrency,
+        )
+
+    if certificate is None:
+        certificate, certificates = certificates[0], certificates[1:]
+
+    return AwaitOnNextState(
+        active_ids=active_ids,
+        certificate=certificate,
+        certificates=certificates,
+        is_outer_completed=is_outer_completed,
+        **_concurrency(state),
+    )
+
+
+def _to_keep_waiting_state(
+    state: ActiveStateMixin,
+    on_next_calls: tuple[BackpressuredOnNextCalls, ...],
+    active_ids: tuple[int, ...],
+    certificates: tuple[ContinuationCertificate, ...],
+    is_outer_completed: bool,
+):
+    """
+    Stops the continuation with the first upstream continuation certificate.
+    If an inner flowable terminated, the backpressured outer call is resumed
+    instead.
+    """
+
+    if _can_resume_outer(state, active_ids):
+        return KeepWaitingResumeOuterState(
+            handler=state.outer_handler,  # type: ignore
+            on_next_calls=on_next_calls,
+            active_ids=active_ids,
+            certificates=certificates,
+            is_outer_completed=is_outer_completed,
+            max_concurrency=state.max_concurrency,
+        )
+
+    return KeepWaitingState(
+        on_next_calls=on_next_calls,
+        active_ids=active_ids,
+        certificate=certificates[0],
+        certificates=certificates[1:],
+        is_outer_completed=is_outer_completed,
+        **_concurrency(state),
+    )
+
+
 @dataclass
 class InactiveTransitionsMixin:
     id: int
@@ -90,6 +189,7 @@ class OnNextTransition[U](InactiveTransitionsMixin, FlatMapStateTransition):
                     active_ids=active_ids,
                     certificates=certificates,
                     is_outer_completed=is_outer_completed,
+                    **_concurrency(state),
                 )
 
             case AwaitDownstreamStateMixin(
@@ -107,11 +207,11 @@ class OnNextTransition[U](InactiveTransitionsMixin, FlatMapStateTransition):
                 )
                 n_on_next_calls = on_next_calls + (pre_state,)
 
-                return KeepWaitingState(
+                return _to_keep_waiting_state(
+                    state=state,
                     active_ids=active_ids,
                     on_next_calls=n_on_next_calls,
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    certificates=certificates,
                     is_outer_completed=is_outer_completed,
                 )
 
@@ -166,6 +266,7 @@ class RequestTransition(FlatMapStateTransition):
                                     if self.certificate
                                     else certificates,
                                     is_outer_completed=is_outer_completed,
+                                    **_concurrency(previous_state),
                                 )
 
                         else:
@@ -178,26 +279,19 @@ class RequestTransition(FlatMapStateTransition):
                                 if self.certificate
                                 else certificates,
                                 is_outer_completed=is_outer_completed,
+                                **_concurrency(previous_state),
                             )
 
                     case _:
                         # no backpressured upstream exist
 
-                        if self.certificate:
-                            return AwaitOnNextState(
-                                active_ids=active_ids,
-                                certificate=self.certificate,
-                                certificates=certificates,
-                                is_outer_completed=is_outer_completed,
-                            )
-
-                        else:
-                            return AwaitOnNextState(
-                                active_ids=active_ids,
-                                certificate=certificates[0],
-                                certificates=certificates[1:],
-                                is_outer_completed=is_outer_completed,
-                            )
+                        return _to_await_on_next_state(
+                            state=previous_state,
+                            active_ids=active_ids,
+                            certificates=certificates,
+                            is_outer_completed=is_outer_completed,
+                            certificate=self.certificate,
+                        )
 
             case CancelledAwaitRequestState(
                 certificates=certificates,
@@ -249,6 +343,7 @@ class OnNextAndCompleteTransition[U](InactiveTransitionsMixin, FlatMapStateTrans
                         active_ids=tuple(id for id in active_ids if id != self.id),
                         certificates=certificates,
                         is_outer_completed=is_outer_completed,
+                        **_concurrency(state),
                     )
 
             case AwaitDownstreamStateMixin(
@@ -266,11 +361,11 @@ class OnNextAndCompleteTransition[U](InactiveTransitionsMixin, FlatMapStateTrans
                 )
                 n_on_next_calls = on_next_calls + (pre_state,)
 
-                return KeepWaitingState(
+                return _to_keep_waiting_state(
+                    state=state,
                     active_ids=tuple(id for id in active_ids if id != self.id),
                     on_next_calls=n_on_next_calls,
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    certificates=certificates,
                     is_outer_completed=is_outer_completed,
                 )
 
@@ -297,10 +392,10 @@ class OnCompletedTransition(InactiveTransitionsMixin, FlatMapStateTransition):
                     )
 
                 else:
-                    return AwaitOnNextState(
+                    return _to_await_on_next_state(
+                        state=state,
                         active_ids=tuple(id for id in active_ids if id != self.id),
-                        certificate=certificates[0],
-                        certificates=certificates[1:],
+                        certificates=certificates,
                         is_outer_completed=is_outer_completed,
                     )
 
@@ -310,11 +405,11 @@ class OnCompletedTransition(InactiveTransitionsMixin, FlatMapStateTransition):
                 certificates=certificates,
                 is_outer_completed=is_outer_completed,
             ):
-                return KeepWaitingState(
+                return _to_keep_waiting_state(
+                    state=state,
                     on_next_calls=on_next_calls,
                     active_ids=tuple(id for id in active_ids if id != self.id),
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    certificates=certificates,
                     is_outer_completed=is_outer_completed,
                 )
 
@@ -349,7 +444,7 @@ class OnErrorTransition(InactiveTransitionsMixin, FlatMapStateTransition):
             case _:
                 return self._get_state(state)
             
-        if is_outer_completed:
+        if not _has_outer_certificate(state):
             return OnErrorState(
                 exception=self.exception,
                 certificates=dict(zip(active_ids, certificates, strict=True)),
@@ -370,6 +465,16 @@ class OnNextOuterTransition(FlatMapStateTransition):
     child: FlatMapStateTransition
     certificate: ContinuationCertificate
 
+    # outer on_next call, not acknowledged if the maximum number of inner
+    # flowables is active
+    handler: DeferredHandler
+
+    def _is_backpressured(self, state: ActiveStateMixin, active_ids: tuple[int, ...]):
+        return (
+            state.max_concurrency is not None
+            and state.max_concurrency <= len(active_ids)
+        )
+
     def get_state(self):
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
@@ -379,10 +484,24 @@ class OnNextOuterTransition(FlatMapStateTransition):
             ):
                 assert is_outer_completed is False
 
+                active_ids = active_ids + (self.id,)
+
+                if self._is_backpressured(state, active_ids):
+                    # the certificate of the inner subscription stops the outer call
+                    return SubscribedOuterBackpressuredState(
+                        active_ids=active_ids,
+                        certificate=self.certificate,
+                        certificates=certificates,
+                        is_outer_completed=False,
+                        max_concurrency=state.max_concurrency,
+                        outer_handler=self.handler,
+                    )
+
                 return SubscribedState(
-                    active_ids=active_ids + (self.id,),
-                    certificates=state.certificates + (self.certificate,),
+                    active_ids=active_ids,
+                    certificates=certificates + (self.certificate,),
                     is_outer_completed=False,
+                    **_concurrency(state),
                 )
 
             case AwaitDownstreamStateMixin(
@@ -391,11 +510,25 @@ class OnNextOuterTransition(FlatMapStateTransition):
             ):
                 assert is_outer_completed is False
 
+                active_ids = active_ids + (self.id,)
+
+                if self._is_backpressured(state, active_ids):
+                    return AwaitDownstreamOuterBackpressuredState(
+                        active_ids=active_ids,
+                        certificate=self.certificate,
+                        certificates=state.certificates,
+                        on_next_calls=state.on_next_calls,
+                        is_outer_completed=False,
+                        max_concurrency=state.max_concurrency,
+                        outer_handler=self.handler,
+                    )
+
                 return AwaitDownstreamStateMixin(
-                    active_ids=active_ids + (self.id,),
+                    active_ids=active_ids,
                     certificates=state.certificates + (self.certificate,),
                     on_next_calls=state.on_next_calls,
                     is_outer_completed=False,
+                    **_concurrency(state),
                 )
 
             case TerminatedStateMixin(
@@ -430,6 +563,7 @@ class OnNextAndCompleteOuterTransition[U](FlatMapStateTransition):
                     certificates=state.certificates,
                     is_outer_completed=True,
                     certificate=self.certificate,
+                    **_concurrency(state),
                 )
 
             case AwaitDownstreamStateMixin(
@@ -444,6 +578,7 @@ class OnNextAndCompleteOuterTransition[U](FlatMapStateTransition):
                     on_next_calls=state.on_next_calls,
                     is_outer_completed=True,
                     certificate=self.certificate,
+                    **_concurrency(state),
                 )
 
             case TerminatedStateMixin(
@@ -482,6 +617,7 @@ class OnCompletedOuterTransition(FlatMapStateTransition):
                         certificate=certificates[0],
                         certificates=certificates[1:],
                         is_outer_completed=True,
+                        **_concurrency(state),
                     )
 
             case AwaitDownstreamStateMixin(
@@ -495,6 +631,7 @@ class OnCompletedOuterTransition(FlatMapStateTransition):
                     certificate=certificates[0],
                     certificates=certificates[1:],
                     is_outer_completed=True,
+                    **_concurrency(state),
                 )
 
             case TerminatedStateMixin(
@@ -572,7 +709,7 @@ class CancelTransition(FlatMapStateTransition):
             ):
                 certificates = certificates + (self.certificate,)
 
-                if is_outer_completed:
+                if not _has_outer_certificate(state):
                     return CancelledState(
                         certificates=dict(zip(active_ids, certificates, strict=True)),
                         outer_certificate=None,
@@ -593,7 +730,7 @@ class CancelTransition(FlatMapStateTransition):
                     id for id in state.active_ids if id not in received_ids
                 )
 
-                if is_outer_completed:
+                if not _has_outer_certificate(state):
                     return CancelledAwaitRequestState(
                         certificate=self.certificate,
                         certificates=dict(zip(active_ids, certificates, strict=True)),
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+class _FusedSignal:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+# returned by a fused stage to drop the current item
+SKIP = _FusedSignal('SKIP')
+
+# returned by a fused stage to complete the stream
+COMPLETE = _FusedSignal('COMPLETE')
+
+
+class FusableFlowableNode[U, V](SingleChildFlowableNode[U, V]):
+    """
+    Represents a stateless node with a single child.
+
+    Consecutive fusable nodes are collapsed into a single fused node when
+    the outermost node is subscribed. The fused node subscribes to the first
+    non-fusable child with a single observer that runs the stages of all
+    collapsed nodes on each item.
+    """
+
+    @abstractmethod
+    def fused_on_next(self, item: U) -> V | _FusedSignal:
+        """
+        Returns the transformed item, `SKIP` if the item is dropped,
+        or `COMPLETE` if the stream completes instead.
+        """
+
+    def fused_on_next_and_complete(self, item: U) -> V | _FusedSignal:
+        """
+        Returns the transformed item, or `COMPLETE` if only the
+        completion is propagated.
+        """
+
+        result = self.fused_on_next(item)
+
+        if result is SKIP:
+            return COMPLETE
+        else:
+            return result
+
+    def fused_on_completed(self) -> None:
+        pass
+
+    def fused_on_error(self, exception: Exception) -> None:
+        pass
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[V],
+    ) -> tuple[State, SubscriptionResult]:
+        stages = []
+        node = self
+
+        while isinstance(node, FusableFlowableNode):
+            stages.append(node)
+            node = node.child
+
+        return init_fused_flowable(
+            child=node,
+            stages=tuple(reversed(stages)),
+        ).unsafe_subscribe(state=state, args=args)
+
+
+@dataclass(slots=True)
+class FusedObserver[U, V](Observer[U]):
+    observer: Observer[V]
+    stages: tuple[FusableFlowableNode, ...]
+
+    def _complete(self, index: int, items: list[V]):
+        for stage in self.stages[index:]:
+            stage.fused_on_completed()
+
+        def on_next_subscription(_, __):
+            if items:
+                return self.observer.on_next_batch(items).flat_map(
+                    lambda _: self.observer.on_completed()
+                )
+
+            else:
+                return self.observer.on_completed()
+
+        # upstream is not resumed
+        return continuationmonad.defer(on_next_subscription)
+
+    def on_next(self, item: U):
+        for index, stage in enumerate(self.stages):
+            item = stage.fused_on_next(item)
+
+            if item is SKIP:
+                return continuationmonad.from_(None)
+
+            elif item is COMPLETE:
+                return self._complete(index + 1, [])
+
+        return self.observer.on_next(item)
+
+    def on_next_batch(self, items: list[U]):
+        results = []
+
+        for item in items:
+            for index, stage in enumerate(self.stages):
+                item = stage.fused_on_next(item)
+
+                if item is SKIP:
+                    break
+
+                elif item is COMPLETE:
+                    return self._complete(index + 1, results)
+
+            else:
+                results.append(item)
+
+        if results:
+            return self.observer.on_next_batch(results)
+
+        else:
+            return continuationmonad.from_(None)
+
+    def on_next_and_complete(self, item: U):
+        for index, stage in enumerate(self.stages):
+            item = stage.fused_on_next_and_complete(item)
+
+            if item is COMPLETE:
+                for stage in self.stages[index + 1:]:
+                    stage.fused_on_completed()
+
+                return self.observer.on_completed()
+
+        return self.observer.on_next_and_complete(item)
+
+    def on_completed(self):
+        for stage in self.stages:
+            stage.fused_on_completed()
+
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        for stage in self.stages:
+            stage.fused_on_error(exception)
+
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class FusedFlowable[U, V](SingleChildFlowableNode[U, V]):
+    child: FlowableNode[U]
+    stages: tuple[FusableFlowableNode, ...]
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[V],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=FusedObserver(
+                    observer=args.observer,
+                    stages=self.stages,
+                ),
+            ),
+        )
+
+
+def init_fused_flowable[U, V](
+    child: FlowableNode[U],
+    stages: tuple[FusableFlowableNode, ...],
+):
+    return FusedFlowable[U, V](
+        child=child,
+        stages=stages,
+    )
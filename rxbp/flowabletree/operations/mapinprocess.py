@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from dataclassabc import dataclassabc
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.flowabletree.operations.parallelmap import init_parallel_map_flowable
+from rxbp.flowabletree.operations.tolist import init_to_list_flowable
+from rxbp.utils.framesummary import CapturedStack
+
+
+def _map_chunk[U, V](func: Callable[[U], V], chunk: list[U]) -> list[V]:
+    # executed in the worker process
+    return [func(item) for item in chunk]
+
+
+@dataclass(slots=True)
+class UnbatchObserver[U](Observer[list[U]]):
+    """Sends each received chunk as a batch of items."""
+
+    observer: Observer[U]
+
+    def on_next(self, items: list[U]):
+        return self.observer.on_next_batch(items)
+
+    def on_next_and_complete(self, items: list[U]):
+        # the last chunk is empty, if the item count is a multiple of
+        # the chunk size
+        if not items:
+            return self.observer.on_completed()
+
+        *init, last = items
+
+        if not init:
+            return self.observer.on_next_and_complete(last)
+
+        return self.observer.on_next_batch(init).flat_map(
+            lambda _: self.observer.on_next_and_complete(last)
+        )
+
+    def on_completed(self):
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class UnbatchFlowable[U](SingleChildFlowableNode[list[U], U]):
+    child: FlowableNode[list[U]]
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=UnbatchObserver(observer=args.observer),
+            ),
+        )
+
+
+def init_map_in_process_flowable[U, V](
+    child: FlowableNode[U],
+    func: Callable[[U], V],
+    workers: int,
+    chunk_size: int | None = None,
+    executor: Executor | None = None,
+    stack: CapturedStack | None = None,
+):
+    """
+    Gathers the items into chunks that are mapped in worker processes,
+    such that the function and the items are pickled once per chunk.
+    At most `workers` chunks are in flight.
+    """
+
+    if chunk_size is None:
+        chunk_size = 64
+
+    return UnbatchFlowable[V](
+        child=init_parallel_map_flowable(
+            child=init_to_list_flowable(child=child, size=chunk_size),
+            func=partial(_map_chunk, func),
+            workers=workers,
+            executor=executor,
+            use_processes=True,
+            stack=stack,
+        ),
+    )
@@ -19,10 +19,9 @@ class MergeCancellable(Cancellable):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case TerminatedStateMixin(
                 certificates=certificates,
             ):
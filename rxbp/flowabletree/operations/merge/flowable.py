@@ -11,8 +11,12 @@ from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import MultiChildrenFlowableNode, FlowableNode
+from rxbp.flowabletree.operations.merge.pendingqueue import (
+    MergeFairness,
+    init_pending_queue,
+)
 from rxbp.flowabletree.operations.merge.states import InitState
-from rxbp.flowabletree.operations.merge.statetransitions import ToStateTransition
+from rxbp.flowabletree.operations.merge.statetransitions import StateCell
 from rxbp.flowabletree.operations.merge.sharedmemory import MergeSharedMemory
 from rxbp.flowabletree.operations.merge.observer import MergeObserver
 
@@ -20,6 +24,7 @@ from rxbp.flowabletree.operations.merge.observer import MergeObserver
 @dataclassabc(frozen=True)
 class MergeFlowableNode[U](MultiChildrenFlowableNode[U, U]):
     children: tuple[FlowableNode, ...]
+    fairness: MergeFairness
 
     @do()
     def unsafe_subscribe(
@@ -36,10 +41,7 @@ class MergeFlowableNode[U](MultiChildrenFlowableNode[U, U]):
 
         certificates = []
         cancellables: list[tuple[int, Cancellable]] = []
-        active_ids = []
-
         for id, child in enumerate(self.children):
-            active_ids.append(id)
             n_state, n_result = child.unsafe_subscribe(
                 state=state,
                 args=args.copy(
@@ -57,10 +59,11 @@ class MergeFlowableNode[U](MultiChildrenFlowableNode[U, U]):
 
         certificate, *others = certificates
 
-        shared.transition = ToStateTransition(
+        shared.transition = StateCell(
             state=InitState(
-                active_ids=tuple(active_ids),
-                certificates=tuple(others),
+                active_ids=set(range(len(self.children))),
+                certificates=others,
+                on_next_calls=init_pending_queue(self.fairness),
             ),
         )
         shared.cancellables = dict(cancellables)
@@ -73,5 +76,14 @@ class MergeFlowableNode[U](MultiChildrenFlowableNode[U, U]):
         )
 
 
-def init_merge_flowable_node[U](children: tuple[FlowableNode[U], ...]):
-    return MergeFlowableNode[U](children=children)
+def init_merge_flowable_node[U](
+    children: tuple[FlowableNode[U], ...],
+    fairness: MergeFairness | None = None,
+):
+    if fairness is None:
+        fairness = 'fifo'
+
+    return MergeFlowableNode[U](
+        children=children,
+        fairness=fairness,
+    )
@@ -23,7 +23,6 @@ from rxbp.flowabletree.operations.merge.states import (
 )
 from rxbp.flowabletree.operations.merge.statetransitions import (
     RequestTransition,
-    ToStateTransition,
     OnCompletedTransition,
     OnErrorTransition,
     OnNextTransition,
@@ -62,9 +61,7 @@ class MergeObserver[V](Observer[V]):
                 )
 
                 with self.shared.lock:
-                    transition.child = self.shared.transition
-                    state = transition.get_state()
-                    self.shared.transition = ToStateTransition(state=state)
+                    state = self.shared.transition.apply(transition)
 
                 match state:
                     case CancelledStopRequestState(
@@ -89,6 +86,9 @@ class MergeObserver[V](Observer[V]):
             case OnNextAndCompleteState(value=value):
                 return self.shared.downstream.on_next_and_complete(value)
 
+            case OnCompletedState():
+                return self.shared.downstream.on_completed()
+
             case HasTerminatedState(certificate=certificate):
                 return continuationmonad.from_(certificate)
 
@@ -109,10 +109,8 @@ class MergeObserver[V](Observer[V]):
             )
 
             with self.shared.lock:
-                transition.child = self.shared.transition
-                self.shared.transition = transition
+                state = self.shared.transition.apply(transition)
 
-            state = transition.get_state()
             certificate = self._on_next(state)
             return certificate
 
@@ -129,10 +127,8 @@ class MergeObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        state = transition.get_state()
         return self._on_next(state)
 
     def on_completed(self):
@@ -142,10 +138,9 @@ class MergeObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnCompletedState():
                 return self.shared.downstream.on_completed()
 
@@ -163,10 +158,9 @@ class MergeObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnErrorState(
                 exception=exception,
                 certificates=certificates,
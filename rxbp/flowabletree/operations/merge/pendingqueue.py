@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Literal
+
+from rxbp.flowabletree.operations.merge.states import BackpressuredOnNextCalls
+
+
+type MergeFairness = Literal['fifo', 'round_robin']
+
+
+class PendingQueue(ABC):
+    """
+    Backpressured on_next calls of the upstream flowables.
+
+    An upstream flowable waits for the acknowledgment of its item,
+    therefore, there is at most one pending call per upstream id.
+    The queue is modified while holding the lock of the merge operator.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def __contains__(self, id: int) -> bool: ...
+
+    @abstractmethod
+    def push(self, call: BackpressuredOnNextCalls): ...
+
+    @abstractmethod
+    def pop(self) -> BackpressuredOnNextCalls | None:
+        """Returns the next call or None if the queue is empty."""
+
+
+class FifoPendingQueue(PendingQueue):
+    """Calls are sent in the order they are received."""
+
+    __slots__ = ('_calls', '_ids')
+
+    def __init__(self):
+        self._calls: deque[BackpressuredOnNextCalls] = deque()
+        self._ids: set[int] = set()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __contains__(self, id: int):
+        return id in self._ids
+
+    def push(self, call: BackpressuredOnNextCalls):
+        self._calls.append(call)
+        self._ids.add(call.id)
+
+    def pop(self):
+        if not self._calls:
+            return None
+
+        call = self._calls.popleft()
+        self._ids.discard(call.id)
+        return call
+
+
+class RoundRobinPendingQueue(PendingQueue):
+    """
+    Calls are sent in the cyclic order of the upstream ids, starting
+    after the id of the previously sent call.
+    """
+
+    __slots__ = ('_calls', '_heap', '_cycle', '_last_id')
+
+    def __init__(self):
+        self._calls: dict[int, BackpressuredOnNextCalls] = {}
+
+        # a call is ordered by the cycle in which it is sent and its id
+        self._heap: list[tuple[int, int]] = []
+        self._cycle = 0
+        self._last_id = -1
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __contains__(self, id: int):
+        return id in self._calls
+
+    def push(self, call: BackpressuredOnNextCalls):
+        if self._last_id < call.id:
+            cycle = self._cycle
+        else:
+            cycle = self._cycle + 1
+
+        self._calls[call.id] = call
+        heapq.heappush(self._heap, (cycle, call.id))
+
+    def pop(self):
+        if not self._heap:
+            return None
+
+        self._cycle, self._last_id = heapq.heappop(self._heap)
+        return self._calls.pop(self._last_id)
+
+
+def init_pending_queue(fairness: MergeFairness) -> PendingQueue:
+    match fairness:
+        case 'fifo':
+            return FifoPendingQueue()
+
+        case 'round_robin':
+            return RoundRobinPendingQueue()
+
+        case _:
+            raise Exception(f"Unexpected fairness policy {fairness}.")
@@ -6,12 +6,12 @@ from dataclassabc import dataclassabc
 
 from rxbp.cancellable import Cancellable
 from rxbp.flowabletree.observer import Observer
-from rxbp.flowabletree.operations.merge.statetransitions import MergeStateTransition
+from rxbp.flowabletree.operations.merge.statetransitions import StateCell
 
 
 @dataclassabc(frozen=False)
 class MergeSharedMemory:
     downstream: Observer
-    transition: MergeStateTransition
+    transition: StateCell
     lock: Lock
     cancellables: dict[int, Cancellable]
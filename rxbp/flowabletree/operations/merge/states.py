@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from continuationmonad.typing import (
     ContinuationCertificate,
     DeferredHandler,
 )
 
+if TYPE_CHECKING:
+    from rxbp.flowabletree.operations.merge.pendingqueue import PendingQueue
+
 
 @dataclass(frozen=True, slots=True)
 class BackpressuredOnNextCalls[U]:
@@ -33,10 +37,16 @@ class ActiveStateMixin(MergeState):
     
     # n_children: int
 
-    active_ids: tuple[int, ...]
+    # The containers are shared between consecutive states and are
+    # modified in place while holding the lock.
+
+    active_ids: set[int]
 
     # upstream continuation certificates
-    certificates: tuple[ContinuationCertificate, ...]
+    certificates: list[ContinuationCertificate]
+
+    # backpressured upstream calls, empty while awaiting upstream
+    on_next_calls: PendingQueue
 
 
 @dataclass(frozen=True)
@@ -66,7 +76,8 @@ class AwaitOnNextState(StopContinuationStateMixin, AwaitUpstreamStateMixin):
 class AwaitDownstreamStateMixin(ActiveStateMixin):
     """Await downstream request"""
 
-    on_next_calls: tuple[BackpressuredOnNextCalls, ...]
+    # id of the upstream whose call sends the items to downstream
+    sending_id: int
 
 
 @dataclass(frozen=True, slots=True)
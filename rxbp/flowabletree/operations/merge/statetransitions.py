@@ -56,6 +56,7 @@ Transitions:
 - request:
         AwaitDownstream         -> OnNext
                                 -> OnNextAndComplete        if all upstream completed
+                                -> OnCompleted              if all upstream completed and no items were received
                                 -> AwaitOnNext              if no other items were received
         CancelledAwaitRequest   -> CancelledStopRequest
 - on_next_and_complete: 
@@ -83,15 +84,27 @@ class MergeStateTransition(ABC):
     def get_state(self) -> MergeState: ...
 
 
-@dataclass(frozen=True)
-class ToStateTransition(MergeStateTransition):
-    """Transitions to predefined state"""
+class StateCell(MergeStateTransition):
+    """Holds the current state, updated in place while holding the lock"""
 
-    state: MergeState
+    __slots__ = ('state',)
+
+    def __init__(self, state: MergeState):
+        self.state = state
 
     def get_state(self):
         return self.state
 
+    def apply(self, transition) -> MergeState:
+        """
+        Evaluates the transition on the current state, must be called
+        while holding the lock.
+        """
+
+        transition.child = self
+        self.state = transition.get_state()
+        return self.state
+
 
 @dataclass
 class InactiveTransitionsMixin:
@@ -125,34 +138,38 @@ class OnNextTransition[U](InactiveTransitionsMixin, MergeStateTransition):
             case AwaitUpstreamStateMixin(
                 active_ids=active_ids,
                 certificates=certificates,
+                on_next_calls=on_next_calls,
             ):
                 return OnNextState(
                     value=self.value,
                     observer=self.observer,
-                    on_next_calls=tuple(),
+                    on_next_calls=on_next_calls,
                     active_ids=active_ids,
                     certificates=certificates,
+                    sending_id=self.id,
                 )
 
             case AwaitDownstreamStateMixin(
                 on_next_calls=on_next_calls,
                 active_ids=active_ids,
                 certificates=certificates,
+                sending_id=sending_id,
             ):
                 # backpressure on_next call
-
-                pre_state = BackpressuredOnNextCalls(
-                    id=self.id,
-                    value=self.value,
-                    observer=self.observer,
+                on_next_calls.push(
+                    BackpressuredOnNextCalls(
+                        id=self.id,
+                        value=self.value,
+                        observer=self.observer,
+                    )
                 )
-                n_on_next_calls = on_next_calls + (pre_state,)
 
                 return KeepWaitingState(
                     active_ids=active_ids,
-                    on_next_calls=n_on_next_calls,
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    on_next_calls=on_next_calls,
+                    certificate=certificates.pop(),
+                    certificates=certificates,
+                    sending_id=sending_id,
                 )
 
             case _:
@@ -174,65 +191,52 @@ class RequestTransition(MergeStateTransition):
                 on_next_calls=on_next_calls,
                 active_ids=active_ids,
                 certificates=certificates,
+                sending_id=sending_id,
             ):
-                match on_next_calls:
-                    case [
-                        BackpressuredOnNextCalls(
-                            value=value,
-                            observer=observer,
-                        ),
-                        *others,
-                    ]:
+                match on_next_calls.pop():
+                    case BackpressuredOnNextCalls(
+                        value=value,
+                        observer=observer,
+                    ):
                         # backpressured upstream exist
 
-                        if observer is None:
-                            # upstream called on_next_and_complete
-
-                            # last element in buffer
-                            if len(active_ids) == 0:
-                                return OnNextAndCompleteState(
-                                    certificates={},
-                                    value=value,
-                                )
-
-                            else:
-                                return OnNextState(
-                                    observer=None,
-                                    value=value,
-                                    on_next_calls=tuple(others),
-                                    active_ids=active_ids,
-                                    certificates=certificates + (self.certificate,)
-                                    if self.certificate
-                                    else certificates,
-                                )
-
-                        else:
-                            return OnNextState(
+                        # last element in buffer sent by on_next_and_complete
+                        if observer is None and len(active_ids) == 0:
+                            return OnNextAndCompleteState(
+                                certificates={},
                                 value=value,
-                                observer=observer,
-                                on_next_calls=tuple(others),
-                                active_ids=active_ids,
-                                certificates=certificates + (self.certificate,)
-                                if self.certificate
-                                else certificates,
                             )
 
+                        if self.certificate:
+                            certificates.append(self.certificate)
+
+                        return OnNextState(
+                            value=value,
+                            observer=observer,
+                            on_next_calls=on_next_calls,
+                            active_ids=active_ids,
+                            certificates=certificates,
+                            sending_id=sending_id,
+                        )
+
                     case _:
                         # no backpressured upstream exist
 
+                        if len(active_ids) == 0:
+                            return OnCompletedState(certificates={})
+
                         if self.certificate:
-                            return AwaitOnNextState(
-                                active_ids=active_ids,
-                                certificate=self.certificate,
-                                certificates=certificates,
-                            )
+                            certificate = self.certificate
 
                         else:
-                            return AwaitOnNextState(
-                                active_ids=active_ids,
-                                certificate=certificates[0],
-                                certificates=certificates[1:],
-                            )
+                            certificate = certificates.pop()
+
+                        return AwaitOnNextState(
+                            active_ids=active_ids,
+                            on_next_calls=on_next_calls,
+                            certificate=certificate,
+                            certificates=certificates,
+                        )
 
             case CancelledAwaitRequestState(
                 certificates=certificates,
@@ -264,6 +268,7 @@ class OnNextAndCompleteTransition[U](InactiveTransitionsMixin, MergeStateTransit
             case AwaitUpstreamStateMixin(
                 active_ids=active_ids,
                 certificates=certificates,
+                on_next_calls=on_next_calls,
             ):
                 if len(active_ids) == 1:
                     return OnNextAndCompleteState(
@@ -272,33 +277,39 @@ class OnNextAndCompleteTransition[U](InactiveTransitionsMixin, MergeStateTransit
                     )
 
                 else:
+                    active_ids.discard(self.id)
+
                     return OnNextState(
                         value=self.value,
                         observer=None,
-                        on_next_calls=tuple(),
-                        active_ids=tuple(id for id in active_ids if id != self.id),
+                        on_next_calls=on_next_calls,
+                        active_ids=active_ids,
                         certificates=certificates,
+                        sending_id=self.id,
                     )
 
             case AwaitDownstreamStateMixin(
                 on_next_calls=on_next_calls,
                 active_ids=active_ids,
                 certificates=certificates,
+                sending_id=sending_id,
             ):
                 # backpressure on_next call
-
-                pre_state = BackpressuredOnNextCalls(
-                    id=self.id,
-                    value=self.value,
-                    observer=None,
+                on_next_calls.push(
+                    BackpressuredOnNextCalls(
+                        id=self.id,
+                        value=self.value,
+                        observer=None,
+                    )
                 )
-                n_on_next_calls = on_next_calls + (pre_state,)
+                active_ids.discard(self.id)
 
                 return KeepWaitingState(
-                    active_ids=tuple(id for id in active_ids if id != self.id),
-                    on_next_calls=n_on_next_calls,
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    active_ids=active_ids,
+                    on_next_calls=on_next_calls,
+                    certificate=certificates.pop(),
+                    certificates=certificates,
+                    sending_id=sending_id,
                 )
 
             case _:
@@ -315,27 +326,35 @@ class OnCompletedTransition(InactiveTransitionsMixin, MergeStateTransition):
             case AwaitUpstreamStateMixin(
                 active_ids=active_ids,
                 certificates=certificates,
+                on_next_calls=on_next_calls,
             ):
                 if len(active_ids) == 1:
                     return OnCompletedState(certificates={})
 
                 else:
+                    active_ids.discard(self.id)
+
                     return AwaitOnNextState(
-                        active_ids=tuple(id for id in active_ids if id != self.id),
-                        certificate=certificates[0],
-                        certificates=certificates[1:],
+                        active_ids=active_ids,
+                        on_next_calls=on_next_calls,
+                        certificate=certificates.pop(),
+                        certificates=certificates,
                     )
 
             case AwaitDownstreamStateMixin(
                 on_next_calls=on_next_calls,
                 active_ids=active_ids,
                 certificates=certificates,
+                sending_id=sending_id,
             ):
+                active_ids.discard(self.id)
+
                 return KeepWaitingState(
                     on_next_calls=on_next_calls,
-                    active_ids=tuple(id for id in active_ids if id != self.id),
-                    certificate=certificates[0],
-                    certificates=certificates[1:],
+                    active_ids=active_ids,
+                    certificate=certificates.pop(),
+                    certificates=certificates,
+                    sending_id=sending_id,
                 )
 
             case _:
@@ -351,10 +370,11 @@ class OnErrorTransition(InactiveTransitionsMixin, MergeStateTransition):
     def get_state(self):
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
+                active_ids=active_ids,
                 certificates=certificates,
-                n_children=n_children,
             ):
-                awaiting_ids = tuple(range(n_children))
+                # the failing upstream is not cancelled
+                awaiting_ids = (id for id in active_ids if id != self.id)
 
                 return OnErrorState(
                     exception=self.exception,
@@ -363,13 +383,16 @@ class OnErrorTransition(InactiveTransitionsMixin, MergeStateTransition):
 
             case AwaitDownstreamStateMixin(
                 on_next_calls=on_next_calls,
+                active_ids=active_ids,
                 certificates=certificates,
-                n_children=n_children,
             ):
-                received_ids = tuple(call.id for call in on_next_calls)
-                awaiting_ids = tuple(
-                    id for id in range(n_children) if id not in received_ids
+                # backpressured upstream are not resumed and need no certificate
+                awaiting_ids = (
+                    id
+                    for id in active_ids
+                    if id != self.id and id not in on_next_calls
                 )
+
                 return OnErrorState(
                     exception=self.exception,
                     certificates=dict(zip(awaiting_ids, certificates)),
@@ -387,25 +410,28 @@ class CancelTransition(MergeStateTransition):
     def get_state(self):
         match child_state := self.child.get_state():
             case AwaitUpstreamStateMixin(
+                active_ids=active_ids,
                 certificates=certificates,
-                n_children=n_children,
             ):
-                awaiting_ids = tuple(range(n_children))
-                certificates = certificates + (self.certificate,)
+                certificates.append(self.certificate)
 
                 return CancelledState(
-                    certificates=dict(zip(awaiting_ids, certificates)),
+                    certificates=dict(zip(active_ids, certificates)),
                 )
 
             case AwaitDownstreamStateMixin(
                 on_next_calls=on_next_calls,
+                active_ids=active_ids,
                 certificates=certificates,
-                n_children=n_children,
+                sending_id=sending_id,
             ):
-                received_ids = tuple(call.id for call in on_next_calls)
-                awaiting_ids = tuple(
-                    id for id in range(n_children) if id not in received_ids
+                # the sending upstream receives its certificate on request
+                awaiting_ids = (
+                    id
+                    for id in active_ids
+                    if id != sending_id and id not in on_next_calls
                 )
+
                 return CancelledAwaitRequestState(
                     certificate=self.certificate,
                     certificates=dict(zip(awaiting_ids, certificates)),
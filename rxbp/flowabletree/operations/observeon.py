@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+from continuationmonad.typing import Scheduler
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+@dataclass(slots=True)
+class ObserveOnObserver[U](Observer[U]):
+    """
+    Sends the items on the scheduler. Upstream is resumed once the
+    item is acknowledged, hence, backpressure crosses the thread boundary.
+    """
+
+    observer: Observer[U]
+    scheduler: Scheduler
+
+    def on_next(self, item: U):
+        return continuationmonad.schedule_on(self.scheduler).flat_map(
+            lambda _: self.observer.on_next(item)
+        )
+
+    def on_next_batch(self, items: list[U]):
+        return continuationmonad.schedule_on(self.scheduler).flat_map(
+            lambda _: self.observer.on_next_batch(items)
+        )
+
+    def on_next_and_complete(self, item: U):
+        return continuationmonad.schedule_on(self.scheduler).flat_map(
+            lambda _: self.observer.on_next_and_complete(item)
+        )
+
+    def on_completed(self):
+        return continuationmonad.schedule_on(self.scheduler).flat_map(
+            lambda _: self.observer.on_completed()
+        )
+
+    def on_error(self, exception: Exception):
+        return continuationmonad.schedule_on(self.scheduler).flat_map(
+            lambda _: self.observer.on_error(exception)
+        )
+
+
+@dataclassabc(frozen=True)
+class ObserveOnFlowable[U](SingleChildFlowableNode[U, U]):
+    child: FlowableNode[U]
+    scheduler: Scheduler
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=ObserveOnObserver(
+                    observer=args.observer,
+                    scheduler=self.scheduler,
+                ),
+            ),
+        )
+
+
+def init_observe_on_flowable[U](
+    child: FlowableNode[U],
+    scheduler: Scheduler,
+):
+    return ObserveOnFlowable[U](
+        child=child,
+        scheduler=scheduler,
+    )
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import traceback
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, override
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+from continuationmonad.typing import (
+    ContinuationCertificate,
+    DeferredHandler,
+    Scheduler,
+)
+
+from rxbp.cancellable import Cancellable
+from rxbp.exceptions import RxBpException
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.utils.framesummary import (
+    CapturedStack,
+    to_execution_exception_message,
+    to_operator_exception_message,
+)
+
+
+@dataclass
+class ParallelMapObserver[U, V](Cancellable, Observer[U]):
+    """
+    Submits the items to the executor and acknowledges them immediately
+    as long as fewer than `workers` items are in flight. Otherwise, the
+    acknowledgment is deferred until a result is sent downstream, hence,
+    at most `workers` items are requested ahead of downstream.
+
+    Results are only sent downstream within the continuation of an
+    upstream call, such that downstream is never called concurrently.
+    """
+
+    observer: Observer[V]
+    upstream_cancellable: Cancellable | None
+    func: Callable[[U], V]
+    executor: Executor
+    workers: int
+
+    # results are sent in the order of the items, otherwise in the
+    # order they are completed
+    ordered: bool
+
+    # executor is shut down when the stream terminates
+    owns_executor: bool
+
+    # a waiting upstream call is resumed on the scheduler
+    scheduler: Scheduler | None
+
+    lock: Lock
+
+    # futures of the items in flight in the order of the items
+    pending: deque[Future[V]]
+
+    # futures in the order they are completed, used if not ordered
+    completed: deque[Future[V]]
+
+    # upstream call waiting for the next result
+    handler: DeferredHandler | None
+
+    is_cancelled: bool
+
+    stack: CapturedStack | None
+
+    def _pop_ready(self) -> Future[V] | None:
+        """
+        Returns the future of the next result if it is done, must be
+        called while holding the lock.
+        """
+
+        if self.ordered:
+            if self.pending and self.pending[0].done():
+                return self.pending.popleft()
+
+        elif self.completed:
+            future = self.completed.popleft()
+            self.pending.remove(future)
+            return future
+
+        return None
+
+    def _on_done(self, future: Future[V]):
+        with self.lock:
+            if self.is_cancelled:
+                return
+
+            if not self.ordered:
+                self.completed.append(future)
+
+            if self.handler is None:
+                return
+
+            if (ready := self._pop_ready()) is None:
+                return
+
+            handler, self.handler = self.handler, None
+
+        def task():
+            trampoline = continuationmonad.init_trampoline()
+
+            def trampoline_task():
+                return handler.resume(trampoline, handler.weight, ready)
+
+            return trampoline.start_loop(
+                trampoline_task, weight=handler.weight, cancellation=None
+            )
+
+        if self.scheduler is None:
+            task()
+
+        else:
+            self.scheduler.schedule(task, weight=handler.weight)
+
+    def _submit(self, item: U):
+        # raises if the executor is shut down or broken, e.g. after a
+        # worker process died
+        future = self.executor.submit(self.func, item)
+
+        with self.lock:
+            self.pending.append(future)
+
+        # called immediately if the future is already done
+        future.add_done_callback(self._on_done)
+
+    def _await_result(self):
+        def on_await_subscription(trampoline, handler: DeferredHandler):
+            with self.lock:
+                if (future := self._pop_ready()) is None:
+                    self.handler = handler
+
+            if future is None:
+                return continuationmonad.from_(
+                    trampoline._create_certificate(
+                        weight=handler.weight, stack=tuple()
+                    )
+                )
+
+            certificate = handler.resume(trampoline, handler.weight, future)
+            return continuationmonad.from_(certificate)
+
+        return continuationmonad.defer(on_await_subscription)
+
+    def _release(self):
+        """Drops the items in flight and shuts down an owned executor."""
+
+        with self.lock:
+            pending, self.pending = tuple(self.pending), deque()
+
+        for future in pending:
+            future.cancel()
+
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _to_exception(self):
+        """
+        Wraps the exception raised by the function or the executor, must
+        be called while handling it.
+        """
+
+        return RxBpException(
+            "\n".join(
+                (
+                    to_execution_exception_message(traceback.format_exc()),
+                    to_operator_exception_message(stack=self.stack),
+                )
+            )
+        )
+
+    def _fail(self, exception: Exception):
+        self._release()
+
+        # upstream is not resumed
+        return continuationmonad.defer(
+            lambda _, __: self.observer.on_error(exception)
+        )
+
+    def _send(self, future: Future[V]):
+        try:
+            value = future.result()
+
+        except Exception:
+            return self._fail(self._to_exception())
+
+        return self.observer.on_next(value)
+
+    def _send_results(self, max_in_flight: int, min_in_flight: int = 0):
+        """
+        Sends results until at most `max_in_flight` items are in flight.
+        Results that are already available are sent as well, as long as
+        more than `min_in_flight` items remain in flight.
+        """
+
+        with self.lock:
+            n_in_flight = len(self.pending)
+
+            if min_in_flight < n_in_flight:
+                future = self._pop_ready()
+
+            else:
+                future = None
+
+        if future is not None:
+            result = self._send(future)
+
+        elif max_in_flight < n_in_flight:
+            result = self._await_result().flat_map(self._send)
+
+        else:
+            return continuationmonad.from_(None)
+
+        return result.flat_map(
+            lambda _: self._send_results(max_in_flight, min_in_flight)
+        )
+
+    def _send_last(self, future: Future[V]):
+        try:
+            value = future.result()
+
+        except Exception:
+            return self._fail(self._to_exception())
+
+        self._release()
+        return self.observer.on_next_and_complete(value)
+
+    def _complete(self):
+        with self.lock:
+            n_in_flight = len(self.pending)
+
+        if n_in_flight == 0:
+            self._release()
+            return self.observer.on_completed()
+
+        return (
+            self._send_results(max_in_flight=1, min_in_flight=1)
+            .flat_map(lambda _: self._await_result())
+            .flat_map(self._send_last)
+        )
+
+    def on_next(self, item: U):
+        try:
+            self._submit(item)
+
+        except Exception:
+            return self._fail(self._to_exception())
+
+        return self._send_results(max_in_flight=self.workers - 1)
+
+    def on_next_and_complete(self, item: U):
+        try:
+            self._submit(item)
+
+        except Exception:
+            return self._fail(self._to_exception())
+
+        return self._complete()
+
+    def on_completed(self):
+        return self._complete()
+
+    def on_error(self, exception: Exception):
+        self._release()
+        return self.observer.on_error(exception)
+
+    def cancel(self, certificate: ContinuationCertificate):
+        with self.lock:
+            self.is_cancelled = True
+            self.handler = None
+
+        self._release()
+
+        if self.upstream_cancellable is not None:
+            self.upstream_cancellable.cancel(certificate)
+
+
+@dataclassabc(frozen=True)
+class ParallelMapFlowable[U, V](SingleChildFlowableNode[U, V]):
+    child: FlowableNode[U]
+    func: Callable[[U], V]
+    workers: int
+    ordered: bool
+
+    # a new thread or process pool executor is created per subscription
+    # if None
+    executor: Executor | None
+    use_processes: bool
+
+    stack: CapturedStack | None
+
+    @override
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[V],
+    ) -> tuple[State, SubscriptionResult]:
+        if self.executor is None and self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        elif self.executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix='rxbp-parallel-map',
+            )
+
+        else:
+            executor = self.executor
+
+        observer = ParallelMapObserver(
+            observer=args.observer,
+            upstream_cancellable=None,
+            func=self.func,
+            executor=executor,
+            workers=self.workers,
+            ordered=self.ordered,
+            owns_executor=self.executor is None,
+            scheduler=args.scheduler,
+            lock=Lock(),
+            pending=deque(),
+            completed=deque(),
+            handler=None,
+            is_cancelled=False,
+            stack=self.stack,
+        )
+
+        state, result = self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(observer=observer),
+        )
+
+        observer.upstream_cancellable = result.cancellable
+
+        return state, SubscriptionResult(
+            certificate=result.certificate,
+            cancellable=observer,
+        )
+
+
+def init_parallel_map_flowable[U, V](
+    child: FlowableNode[U],
+    func: Callable[[U], V],
+    workers: int,
+    ordered: bool | None = None,
+    executor: Executor | None = None,
+    use_processes: bool | None = None,
+    stack: CapturedStack | None = None,
+):
+    if ordered is None:
+        ordered = True
+
+    if use_processes is None:
+        use_processes = False
+
+    return ParallelMapFlowable[U, V](
+        child=child,
+        func=func,
+        workers=workers,
+        ordered=ordered,
+        executor=executor,
+        use_processes=use_processes,
+        stack=stack,
+    )
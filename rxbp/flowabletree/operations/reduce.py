@@ -13,6 +13,51 @@ from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
 
 
+@dataclass(slots=True)
+class ReduceObserver[U](Observer[U]):
+    observer: Observer[U]
+    func: Callable[[U, U], U]
+    is_first: bool
+    acc: U | None
+
+    def on_next(self, item: U):
+        if self.is_first:
+            self.is_first = False
+            self.acc = item
+
+        else:
+            self.acc = self.func(self.acc, item)  # type: ignore
+        
+        return continuationmonad.from_(None)
+
+    def on_next_batch(self, items: list[U]):
+        if not items:
+            return continuationmonad.from_(None)
+
+        if self.is_first:
+            self.is_first = False
+            acc, *items = items
+
+        else:
+            acc = self.acc
+
+        for item in items:
+            acc = self.func(acc, item)  # type: ignore
+
+        self.acc = acc
+        return continuationmonad.from_(None)
+
+    def on_next_and_complete(self, item: U):
+        self.acc = self.func(self.acc, item)  # type: ignore
+        return self.observer.on_next_and_complete(self.acc)
+
+    def on_completed(self):
+        return self.observer.on_next_and_complete(self.acc)
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
 @dataclassabc(frozen=True)
 class ReduceFlowable[U](SingleChildFlowableNode[U, U]):
     child: FlowableNode[U]
@@ -23,37 +68,15 @@ class ReduceFlowable[U](SingleChildFlowableNode[U, U]):
         state: State,
         args: SubscribeArgs[U],
     ) -> tuple[State, SubscriptionResult]:
-        outer_self = self
-
-        @dataclass
-        class ReduceObserver(Observer[U]):
-            is_first: bool
-            acc: U | None
-
-            def on_next(self, item: U):
-                if self.is_first:
-                    self.is_first = False
-                    self.acc = item
-
-                else:
-                    self.acc = outer_self.func(self.acc, item)
-                
-                return continuationmonad.from_(None)
-
-            def on_next_and_complete(self, item: U):
-                self.acc = outer_self.func(self.acc, item)
-                return args.observer.on_next_and_complete(self.acc)
-
-            def on_completed(self):
-                return args.observer.on_next_and_complete(self.acc)
-
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
-
         return self.child.unsafe_subscribe(
             state=state,
             args=args.copy(
-                observer=ReduceObserver(is_first=True, acc=None),
+                observer=ReduceObserver(
+                    observer=args.observer,
+                    func=self.func,
+                    is_first=True,
+                    acc=None,
+                ),
             ),
         )
 
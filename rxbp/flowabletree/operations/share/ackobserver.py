@@ -14,14 +14,15 @@ from rxbp.flowabletree.observer import Observer
 from rxbp.flowabletree.operations.share.states import (
     HasErroredState,
     CancelledKeepAwaitDownstreamState,
+    DetachedCancelledState,
+    SubscriberDetachedState,
     RequestUpstream,
     AwaitOnNext,
+    OnCompletedFromBuffer,
     OnNextFromBuffer,
-    TerminatedStateMixin,
 )
 from rxbp.flowabletree.operations.share.statetransitions import (
     RequestTransition,
-    ToStateTransition,
 )
 from rxbp.flowabletree.operations.share.sharedmemory import ShareSharedMemory
 
@@ -49,54 +50,37 @@ class ShareAckObserver(CMObserver):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-
-            match state := transition.get_state():
+            match state := self.shared.transition.apply(transition):
                 case RequestUpstream():
-                    # total_weight = sum(self.shared.weight_partition(id) for id in buffer_map)
-                    total_weight = sum(w for w in state.weights.values())
-
-                    certificate = self.shared.deferred_handler.resume(
-                        trampoline, total_weight, None
+                    upstream_certificate = self.shared.deferred_handler.resume(
+                        trampoline, state.buffer.total_weight, None
                     )
 
-                    # state.certificate, others = certificate.take(weight)
-
-                    requested_certificates = {}
-                    for id, weight in state.weights.items():
-                        requested_certificates[id], certificate = certificate.take(weight)
-                        
-                    state.requested_certificates = requested_certificates
-
-            self.shared.transition = ToStateTransition(state)
+                    # the remaining part is taken by other waiting subscribers
+                    certificate, state.upstream_certificate = upstream_certificate.take(
+                        state.weight
+                    )
 
         match state:
             case RequestUpstream():
-                return state.requested_certificates[self.id]
+                return certificate
             
             case AwaitOnNext():
-                # todo: adapt to new weight
-                # either split current certificate, or merge current certificate with borrowed certificate
                 return state.certificate
 
             case CancelledKeepAwaitDownstreamState():
                 return state.certificate
 
             case OnNextFromBuffer():
-                item = self.shared.get_buffer_item(state.index)
-
-                if state.pop_item:
-                    self.shared.pop_buffer(1)
-
                 def trampoline_task():
-                    if state.is_completed:
-                        continuation = self.observer.on_next_and_complete(item)
+                    if state.complete_downstream:
+                        continuation = self.observer.on_next_and_complete(state.value)
                         observer = continuationmonad.init_anonymous_observer(
                             on_success=lambda t, w, c: c
                         )
 
                     else:
-                        continuation = self.observer.on_next(item)
+                        continuation = self.observer.on_next(state.value)
                         observer=self
 
                     certificate =  continuation.subscribe(
@@ -110,23 +94,53 @@ class ShareAckObserver(CMObserver):
                     return certificate
                 
                 return trampoline.schedule(trampoline_task, self.weight, self.cancellation)
-            
-            case HasErroredState(exception=exception):
-                return self.observer.on_error(exception=exception).subscribe(
-                    args=continuationmonad.init_subscribe_args(
-                        observer=self,
-                        weight=weight,
-                        cancellation=self.cancellation,
-                        trampoline=trampoline,
+
+            case OnCompletedFromBuffer():
+                def trampoline_task():
+                    return self.observer.on_completed().subscribe(
+                        args=continuationmonad.init_subscribe_args(
+                            observer=continuationmonad.init_anonymous_observer(
+                                on_success=lambda t, w, c: c
+                            ),
+                            weight=weight,
+                            cancellation=self.cancellation,
+                            trampoline=trampoline,
+                        )
                     )
-                )
 
-            case TerminatedStateMixin():
-                return state.requested_certificates[self.id]
+                return trampoline.schedule(trampoline_task, self.weight, self.cancellation)
+            
+            case DetachedCancelledState(exception=exception):
+                # no active downstream observers
+                self.shared.upstream_cancellation.cancel(state.certificates)
+                return self._send_error(trampoline, weight, exception)
+
+            case SubscriberDetachedState(exception=exception):
+                return self._send_error(trampoline, weight, exception)
+
+            case HasErroredState(exception=exception):
+                return self._send_error(trampoline, weight, exception)
 
             case _:
                 raise Exception(f"Unexpected state {state}")
 
+    def _send_error(
+        self,
+        trampoline: Trampoline,
+        weight: int,
+        exception: Exception,
+    ) -> ContinuationCertificate:
+        return self.observer.on_error(exception=exception).subscribe(
+            args=continuationmonad.init_subscribe_args(
+                observer=continuationmonad.init_anonymous_observer(
+                    on_success=lambda t, w, c: c
+                ),
+                weight=weight,
+                cancellation=self.cancellation,
+                trampoline=trampoline,
+            )
+        )
+
     def on_error(
         self,
         trampoline: Trampoline,
@@ -11,9 +11,9 @@ from rxbp.flowabletree.operations.share.statetransitions import (
 )
 from rxbp.flowabletree.operations.share.sharedmemory import ShareSharedMemory
 from rxbp.flowabletree.operations.share.states import (
-    AdjustBufferStateMixin,
     CancelledState,
     HasTerminatedState,
+    SubscriberCancelledState,
 )
 
 
@@ -34,17 +34,12 @@ class ShareCancellation(CancellationState):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match transition.get_state():
-            case CancelledState(requested_certificates=requested_certificates):
-                self.upstream_cancellation.cancel(tuple(requested_certificates.values()))
+        match state:
+            case CancelledState(certificates=certificates):
+                self.upstream_cancellation.cancel(certificates)
 
-            case AdjustBufferStateMixin(n_buffer_pop=n_buffer_pop):
+            case SubscriberCancelledState() | HasTerminatedState():
                 # still active downstream observers remaining
-
-                self.shared.pop_buffer(n_buffer_pop)
-
-            case HasTerminatedState():
                 pass
@@ -8,8 +8,10 @@ from rxbp.state import State
 from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
-from rxbp.flowabletree.operations.share.states import InitState
-from rxbp.flowabletree.operations.share.statetransitions import ToStateTransition
+from rxbp.flowabletree.operations.share.laggauge import ShareLagGauge
+from rxbp.flowabletree.operations.share.sharebuffer import ShareBuffer
+from rxbp.flowabletree.operations.share.states import InitState, LagPolicy
+from rxbp.flowabletree.operations.share.statetransitions import StateCell
 from rxbp.flowabletree.operations.share.sharedmemory import ShareSharedMemory
 from rxbp.flowabletree.operations.share.cancellable import ShareCancellation
 from rxbp.flowabletree.operations.share.ackobserver import ShareAckObserver
@@ -20,6 +22,11 @@ from rxbp.flowabletree.operations.share.observer import SharedObserver
 class ShareFlowableNode[U](SingleChildFlowableNode[U, U]):
     child: FlowableNode
 
+    # maximum number of items a subscriber lags behind the fastest one
+    max_lag: int | None
+    on_lag: LagPolicy
+    gauge: ShareLagGauge | None
+
     def discover(
         self, 
         state: State,
@@ -62,16 +69,12 @@ class ShareFlowableNode[U](SingleChildFlowableNode[U, U]):
             total_weight = state.shared_weights[self]
 
             shared = ShareSharedMemory(
-                upstream_cancellation=None,
+                upstream_cancellation=None,  # type: ignore
                 transition=None,  # type: ignore
                 deferred_handler=None,  # type: ignore
                 lock=Lock(),
-                buffer_lock=Lock(),
-                first_index=0,
-                buffer=[],
-                total_weight=total_weight,
-                weight_partition={},
-                init_certificate=None,
+                buffer=ShareBuffer(),
+                init_certificate=None,  # type: ignore
             )
 
             observer = SharedObserver(
@@ -79,8 +82,13 @@ class ShareFlowableNode[U](SingleChildFlowableNode[U, U]):
                 weight=args.weight,
                 ack_observers={},
                 cancellations={},
+                max_lag=self.max_lag,
+                on_lag=self.on_lag,
             )
 
+            if self.gauge is not None:
+                self.gauge._bind(shared.buffer, shared.lock)
+
             state.shared_observers[self] = observer
 
             state, result = self.child.unsafe_subscribe(
@@ -93,30 +101,25 @@ class ShareFlowableNode[U](SingleChildFlowableNode[U, U]):
             shared.upstream_cancellation = result.cancellable
             shared.init_certificate = result.certificate
 
-            shared.transition = ToStateTransition(
+            shared.transition = StateCell(
                 InitState(
-                    buffer_map={},
-                    first_buffer_index=0,
-                    last_buffer_index=-1,
+                    buffer=shared.buffer,
+                    is_requested=True,
+                    upstream_certificate=None,
+                    released_certificates=[],
                     cancelled_certificates={},
-                    requested_certificates={},
+                    detached={},
                     is_completed=False,
-                    weights={},
+                    complete_with_item=False,
                 )
             )
 
         shared = observer.shared
 
-        init_state = shared.transition.state
-
-        id = len(init_state.buffer_map)
-        init_state.buffer_map[id] = 0
+        id = shared.buffer.add_subscriber(args.weight)
         certificate, shared.init_certificate = shared.init_certificate.take(
             args.weight
         )
-        # print(certificate)
-        init_state.requested_certificates[id] = None
-        init_state.weights[id] = args.weight
 
         downstream_cancellation = ShareCancellation(
             id=id,
@@ -143,5 +146,18 @@ class ShareFlowableNode[U](SingleChildFlowableNode[U, U]):
         )
 
 
-def init_share_flowable_node[V](child: FlowableNode[V]):
-    return ShareFlowableNode[V](child=child)
+def init_share_flowable_node[V](
+    child: FlowableNode[V],
+    max_lag: int | None = None,
+    on_lag: LagPolicy | None = None,
+    gauge: ShareLagGauge | None = None,
+):
+    if on_lag is None:
+        on_lag = 'drop_for_slow'
+
+    return ShareFlowableNode[V](
+        child=child,
+        max_lag=max_lag,
+        on_lag=on_lag,
+        gauge=gauge,
+    )
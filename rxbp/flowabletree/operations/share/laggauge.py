@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from threading import Lock
+
+from rxbp.flowabletree.operations.share.sharebuffer import ShareBuffer
+
+
+class ShareLagGauge:
+    """
+    Reads the lag of the downstream subscribers of a share operator, i.e.
+    the number of items received from upstream but not yet sent to a
+    subscriber. The gauge is bound to the most recent subscription.
+    """
+
+    __slots__ = ('_buffer', '_lock')
+
+    def __init__(self):
+        self._buffer: ShareBuffer | None = None
+        self._lock: Lock | None = None
+
+    def _bind(self, buffer: ShareBuffer, lock: Lock):
+        self._buffer = buffer
+        self._lock = lock
+
+    def lags(self) -> dict[int, int]:
+        """Lag per subscriber id."""
+
+        if self._buffer is None:
+            return {}
+
+        with self._lock:  # type: ignore
+            return self._buffer.lags()
+
+    @property
+    def max_lag(self) -> int:
+        if self._buffer is None:
+            return 0
+
+        with self._lock:  # type: ignore
+            return self._buffer.max_lag
+
+    @property
+    def n_dropped(self) -> int:
+        """Items skipped for slow subscribers."""
+
+        if self._buffer is None:
+            return 0
+
+        return self._buffer.n_dropped
+
+    @property
+    def n_detached(self) -> int:
+        if self._buffer is None:
+            return 0
+
+        return self._buffer.n_detached
+
+
+def init_share_lag_gauge():
+    return ShareLagGauge()
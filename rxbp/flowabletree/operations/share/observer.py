@@ -16,6 +16,7 @@ from rxbp.flowabletree.observer import Observer
 from rxbp.flowabletree.operations.share.states import (
     CancelledState,
     HasTerminatedState,
+    LagPolicy,
     OnCompletedState,
     OnErrorState,
     OnNext,
@@ -36,6 +37,8 @@ class SharedObserver[V](Observer[V]):
     cancellations: dict[int, CancellationState]
     shared: ShareSharedMemory
     weight: int
+    max_lag: int | None
+    on_lag: LagPolicy
 
     @do()
     def on_next(self, item: V):
@@ -50,50 +53,65 @@ class SharedObserver[V](Observer[V]):
 
             transition = OnNextTransition(
                 child=None,  # type: ignore
+                item=item,
+                max_lag=self.max_lag,
+                on_lag=self.on_lag,
             )
 
             with self.shared.lock:
-                transition.child = self.shared.transition
-                self.shared.transition = transition
+                state = self.shared.transition.apply(transition)
 
-            match state := transition.get_state():
+            match state:
                 case OnNext():
-                    if state.buffer_item:
-                        self.shared.buffer.append(item)
-
-                    assert state.send_ids
-
                     def gen_certificates():
-                        for id in state.requested_certificates:
-                            if id in state.send_ids:
-                                ack_observer = self.ack_observers[id]
-
-                                certificate = ack_observer.observer.on_next(
-                                    item
-                                ).subscribe(
-                                    args=continuationmonad.init_subscribe_args(
-                                        observer=ack_observer,
-                                        weight=ack_observer.weight,
-                                        cancellation=ack_observer.cancellation,
-                                        trampoline=trampoline,
-                                    )
-                                )
-                                # todo: merge certificate with requested_certificates
+                        for id in state.send_ids:
+                            ack_observer = self.ack_observers[id]
 
-                            else:
-                                certificate = state.requested_certificates[id]
-                                assert certificate.validated is False
+                            yield ack_observer.observer.on_next(
+                                item
+                            ).subscribe(
+                                args=continuationmonad.init_subscribe_args(
+                                    observer=ack_observer,
+                                    weight=ack_observer.weight,
+                                    cancellation=ack_observer.cancellation,
+                                    trampoline=trampoline,
+                                )
+                            )
 
-                            yield certificate
+                        # subscribers not receiving the item
+                        yield from state.certificates
 
                     certificates = tuple(gen_certificates())
                     # print(certificates)
                     certificate = continuationmonad.init_composite_continuation_certificate(certificates)
                     # print(certificate)
                     return certificate
+
+                case OnErrorState(exception=exception):
+                    # maximum lag exceeded, upstream is not resumed
+                    def gen_certificates():
+                        for id in state.send_ids:
+                            yield self.ack_observers[id].observer.on_error(
+                                exception
+                            ).subscribe(
+                                args=continuationmonad.init_subscribe_args(
+                                    observer=continuationmonad.init_anonymous_observer(
+                                        on_success=lambda t, w, c: c
+                                    ),
+                                    weight=self.ack_observers[id].weight,
+                                    cancellation=self.ack_observers[id].cancellation,
+                                    trampoline=trampoline,
+                                )
+                            )
+
+                        yield from state.certificates
+
+                    return continuationmonad.init_composite_continuation_certificate(
+                        tuple(gen_certificates())
+                    )
                 
                 case HasTerminatedState():
-                    return ContinuationCertificate.merge(tuple(state.requested_certificates.values()))
+                    return ContinuationCertificate.merge(state.certificates)
 
                 case _:
                     raise Exception(f"Unexpected state {state}")
@@ -106,32 +124,38 @@ class SharedObserver[V](Observer[V]):
 
         transition = OnNextAndCompleteTransition(
             child=None,  # type: ignore
+            item=item,
+            max_lag=self.max_lag,
+            on_lag=self.on_lag,
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
-            case OnNext(
-                send_ids=send_ids,
-            ):
-                assert 0 < len(send_ids), f"{len(send_ids)}"
+        match state:
+            case OnNext():
+                def gen_certificates():
+                    for id in state.send_ids:
+                        yield self.ack_observers[id].observer.on_next_and_complete(
+                            item
+                        )
 
-                if state.buffer_item:
-                    self.shared.buffer.append(item)
+                    # subscribers not receiving the item
+                    for certificate in state.certificates:
+                        yield continuationmonad.from_(certificate)
+
+                return (
+                    continuationmonad.zip(tuple(gen_certificates()))
+                    .map(lambda c: ContinuationCertificate.merge(c))
+                )
 
+            case OnErrorState(exception=exception):
                 def gen_certificates():
-                    for id in state.requested_certificates:
-                        if id in state.send_ids:
-                            yield self.ack_observers[id].observer.on_next_and_complete(
-                                item
-                            )
+                    for id in state.send_ids:
+                        yield self.ack_observers[id].observer.on_error(exception)
 
-                        else:
-                            certificate = state.requested_certificates[id]
-                            assert certificate.validated is False
-                            yield continuationmonad.from_(certificate)
+                    for certificate in state.certificates:
+                        yield continuationmonad.from_(certificate)
 
                 return (
                     continuationmonad.zip(tuple(gen_certificates()))
@@ -139,7 +163,7 @@ class SharedObserver[V](Observer[V]):
                 )
 
             case HasTerminatedState():
-                certificate = ContinuationCertificate.merge(tuple(state.requested_certificates.values()))
+                certificate = ContinuationCertificate.merge(state.certificates)
                 return continuationmonad.from_(certificate)
 
             case _:
@@ -151,20 +175,16 @@ class SharedObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnCompletedState():
                 def gen_certificates():
-                    for id in state.requested_certificates:
-                        if id in state.send_ids:
-                            yield self.ack_observers[id].observer.on_completed()
+                    for id in state.send_ids:
+                        yield self.ack_observers[id].observer.on_completed()
 
-                        else:
-                            certificate = state.requested_certificates[id]
-                            assert certificate.validated is False
-                            yield continuationmonad.from_(certificate)
+                    for certificate in state.certificates:
+                        yield continuationmonad.from_(certificate)
 
                 return (
                     continuationmonad.zip(tuple(gen_certificates()))
@@ -182,7 +202,7 @@ class SharedObserver[V](Observer[V]):
                 # )
 
             case HasTerminatedState():
-                certificate = ContinuationCertificate.merge(tuple(state.requested_certificates.values()))
+                certificate = ContinuationCertificate.merge(state.certificates)
                 return continuationmonad.from_(certificate)
 
             case _:
@@ -195,21 +215,17 @@ class SharedObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnErrorState():
 
                 def gen_certificates():
-                    for id in state.requested_certificates:
-                        if id in state.send_ids:
-                            yield self.ack_observers[id].observer.on_error(exception)
+                    for id in state.send_ids:
+                        yield self.ack_observers[id].observer.on_error(exception)
 
-                        else:
-                            certificate = state.requested_certificates[id]
-                            assert certificate.validated is False
-                            yield continuationmonad.from_(certificate)
+                    for certificate in state.certificates:
+                        yield continuationmonad.from_(certificate)
 
                 return (
                     continuationmonad.zip(tuple(gen_certificates()))
@@ -227,7 +243,7 @@ class SharedObserver[V](Observer[V]):
                 # )
 
             case HasTerminatedState():
-                certificate = ContinuationCertificate.merge(tuple(state.requested_certificates.values()))
+                certificate = ContinuationCertificate.merge(state.certificates)
                 return continuationmonad.from_(certificate)
 
             case _:
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from rxbp.utils.ringbuffer import RingBuffer
+
+
+class ShareBuffer[V]:
+    """
+    Items received from upstream together with a cursor per downstream
+    subscriber pointing to the index of the next item it receives.
+
+    Only the items between the smallest cursor and the last received item
+    are kept. The subscribers are grouped by their cursor, such that the
+    smallest cursor and the slowest subscribers are found without visiting
+    all subscribers.
+
+    The methods are called while holding the lock of the share operator.
+    """
+
+    __slots__ = (
+        '_items',
+        '_first_index',
+        '_last_index',
+        '_cursors',
+        '_groups',
+        '_min_cursor',
+        '_waiting',
+        '_weights',
+        '_total_weight',
+        '_next_id',
+        '_n_dropped',
+        '_n_detached',
+    )
+
+    def __init__(self, capacity: int | None = None):
+        if capacity is None:
+            capacity = 16
+
+        self._items = RingBuffer[V](capacity=capacity)
+
+        # index of the first buffered item
+        self._first_index = 0
+
+        # index of the last item received from upstream
+        self._last_index = -1
+
+        self._cursors: dict[int, int] = {}
+
+        # subscribers grouped by their cursor
+        self._groups: dict[int, dict[int, None]] = {}
+        self._min_cursor = 0
+
+        # subscribers that requested an item that is not yet received
+        self._waiting: dict[int, None] = {}
+
+        self._weights: dict[int, int] = {}
+        self._total_weight = 0
+        self._next_id = 0
+
+        # items skipped and subscribers detached by the lag policy
+        self._n_dropped = 0
+        self._n_detached = 0
+
+    @property
+    def total_weight(self):
+        return self._total_weight
+
+    @property
+    def n_subscribers(self):
+        return len(self._cursors)
+
+    @property
+    def n_dropped(self):
+        return self._n_dropped
+
+    @property
+    def n_detached(self):
+        return self._n_detached
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_weight(self, id: int):
+        return self._weights[id]
+
+    def set_weight(self, id: int, weight: int):
+        self._total_weight += weight - self._weights[id]
+        self._weights[id] = weight
+
+    @property
+    def max_lag(self):
+        """Lag of the slowest subscribers."""
+
+        if not self._cursors:
+            return 0
+
+        return self._last_index + 1 - self._min_cursor
+
+    def lag(self, id: int):
+        """Number of received items not yet sent to the subscriber."""
+
+        return self._last_index + 1 - self._cursors[id]
+
+    def lags(self) -> dict[int, int]:
+        return {id: self._last_index + 1 - c for id, c in self._cursors.items()}
+
+    def slowest(self) -> tuple[int, ...]:
+        """Ids of the subscribers pointing to the smallest cursor."""
+
+        return tuple(self._groups.get(self._min_cursor, ()))
+
+    def has_item(self, id: int):
+        return self._cursors[id] <= self._last_index
+
+    def is_waiting(self, id: int):
+        return id in self._waiting
+
+    def add_subscriber(self, weight: int) -> int:
+        """
+        Adds a subscriber waiting for the next upstream item.
+        """
+
+        id = self._next_id
+        self._next_id += 1
+
+        cursor = self._last_index + 1
+
+        if not self._cursors:
+            self._min_cursor = cursor
+
+        self._cursors[id] = cursor
+        self._groups.setdefault(cursor, {})[id] = None
+        self._waiting[id] = None
+
+        self._weights[id] = weight
+        self._total_weight += weight
+        return id
+
+    def remove_subscriber(self, id: int) -> bool:
+        """
+        Removes the subscriber and returns whether it was waiting for an item.
+        """
+
+        cursor = self._cursors.pop(id)
+        self._leave(cursor, id)
+
+        self._total_weight -= self._weights.pop(id)
+
+        is_waiting = id in self._waiting
+        if is_waiting:
+            del self._waiting[id]
+
+        if cursor == self._min_cursor:
+            while (
+                self._min_cursor <= self._last_index
+                and self._min_cursor not in self._groups
+            ):
+                self._pop_item(self._min_cursor)
+                self._min_cursor += 1
+
+        return is_waiting
+
+    def detach(self, id: int):
+        """
+        Removes a subscriber that is not waiting for an item.
+        """
+
+        self.remove_subscriber(id)
+        self._n_detached += 1
+
+    def wait(self, id: int):
+        self._waiting[id] = None
+
+    def pop_waiting(self) -> tuple[int, ...]:
+        waiting = tuple(self._waiting)
+        self._waiting.clear()
+        return waiting
+
+    def append(self, item: V) -> tuple[int, ...]:
+        """
+        Adds an upstream item and returns the ids of the waiting subscribers
+        the item is sent to.
+        """
+
+        self._last_index += 1
+
+        send_ids = self.pop_waiting()
+
+        for id in send_ids:
+            self._advance(id)
+
+        # item is buffered for subscribers that did not yet request it
+        if self._min_cursor <= self._last_index:
+            if not self._items:
+                self._first_index = self._last_index
+
+            elif self._items.is_full():
+                self._grow()
+
+            self._items.append(item)
+
+        return send_ids
+
+    def pop(self, id: int) -> V:
+        """
+        Returns the next buffered item of the subscriber and moves its cursor.
+        """
+
+        cursor = self._cursors[id]
+        item = self._items[cursor - self._first_index]
+        self._advance(id)
+        return item
+
+    def skip(self, id: int):
+        """
+        Moves the cursor of the subscriber without sending the item.
+        """
+
+        self._advance(id)
+        self._n_dropped += 1
+
+    def _advance(self, id: int):
+        cursor = self._cursors[id]
+        self._cursors[id] = cursor + 1
+
+        self._leave(cursor, id)
+        self._groups.setdefault(cursor + 1, {})[id] = None
+
+        # the smallest cursor moves, if no other subscriber points to it
+        if cursor == self._min_cursor and cursor not in self._groups:
+            self._pop_item(cursor)
+            self._min_cursor = cursor + 1
+
+    def _leave(self, cursor: int, id: int):
+        group = self._groups[cursor]
+        del group[id]
+
+        if not group:
+            del self._groups[cursor]
+
+    def _pop_item(self, index: int):
+        if self._items and self._first_index == index:
+            self._items.popleft()
+            self._first_index += 1
+
+    def _grow(self):
+        items = RingBuffer[V](capacity=2 * self._items.capacity)
+
+        for item in self._items:
+            items.append(item)
+
+        self._items = items
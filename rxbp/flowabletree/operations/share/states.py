@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Literal
 
 from continuationmonad.typing import ContinuationCertificate
 
+from rxbp.flowabletree.operations.share.sharebuffer import ShareBuffer
+
+
+type LagPolicy = Literal['drop_for_slow', 'detach_slow', 'error']
+
 
 class ShareState:
     pass
@@ -11,22 +17,33 @@ class ShareState:
 
 @dataclass(frozen=False)
 class ActiveStateMixin(ShareState):
-    # buffer indices are modified on ack
-    buffer_map: dict[int, int]
+    # Subscriber cursors and buffered items, the buffer is shared between
+    # consecutive states and is modified in place while holding the lock.
+    buffer: ShareBuffer
 
-    first_buffer_index: int
-    last_buffer_index: int
+    # upstream is requested to send the next item
+    is_requested: bool
 
-    # # last_buffer_index+1 when element
-    # is_ack: bool
+    # Part of the certificate returned by the upstream request, which is
+    # not yet taken by a waiting downstream subscriber.
+    upstream_certificate: ContinuationCertificate | None
 
-    weights: dict[int, int]
+    # certificates of cancelled waiting subscribers returned to upstream
+    released_certificates: list[ContinuationCertificate]
 
-    requested_certificates: dict[int, ContinuationCertificate]
+    # certificates of cancelled subscribers returned on their next request
     cancelled_certificates: dict[int, ContinuationCertificate]
 
+    # subscribers removed from the buffer for exceeding the maximum lag,
+    # they are sent the exception on their next request
+    detached: dict[int, Exception]
+
+    # upstream completed, remaining subscribers receive the buffered items
     is_completed: bool
 
+    # the last item is sent with `on_next_and_complete`
+    complete_with_item: bool
+
 
 @dataclass(frozen=False)
 class StopContinuationStateMixin:
@@ -37,84 +54,76 @@ class StopContinuationStateMixin:
 
 
 @dataclass(frozen=False)
-class AdjustBufferStateMixin(ActiveStateMixin):
-    n_buffer_pop: int
+class UpstreamCertificatesMixin:
+    """Certificates merged into the certificate returned to upstream"""
 
-
-@dataclass(frozen=False)
-class AwaitUpstreamStateMixin(ActiveStateMixin):
-    """At least one downstream observer requested a new item."""
+    certificates: tuple[ContinuationCertificate, ...]
 
 
 @dataclass(frozen=False)
-class AwaitUpstreamAdjustBufferState(AdjustBufferStateMixin, AwaitUpstreamStateMixin):
-    # n_buffer_pop: int
+class InitState(ActiveStateMixin):
     pass
 
 
 @dataclass(frozen=False)
-class InitState(AwaitUpstreamStateMixin):
-    pass
+class RequestUpstream(ActiveStateMixin):
+    """Downstream subscriber requested new upstream item"""
 
+    # weight of requesting downstream subscriber
+    weight: int
 
-@dataclass(frozen=False, slots=True)
-class RequestUpstream(AwaitUpstreamStateMixin):
-    # upstream_ack_observer: DeferredHandler
-    # certificate: ContinuationCertificate
-    pass
 
+@dataclass(frozen=False)
+class AwaitOnNext(StopContinuationStateMixin, ActiveStateMixin):
+    """Item is requested but not yet received"""
 
-@dataclass(frozen=False, slots=True)
-class AwaitOnNext(AwaitUpstreamStateMixin):
-    certificate: ContinuationCertificate
 
+@dataclass(frozen=False)
+class OnNextFromBuffer[V](ActiveStateMixin):
+    value: V
 
-@dataclass(frozen=False, slots=True)
-class OnNextFromBuffer(AwaitUpstreamStateMixin):
-    index: int
-    pop_item: bool
+    # the item is the last one and is sent with `on_next_and_complete`
+    complete_downstream: bool
 
 
 @dataclass(frozen=False)
-class AwaitDownstreamStateMixin(ActiveStateMixin):
-    # cancelled_certificates: dict[int, ContinuationCertificate]
-    pass
+class OnCompletedFromBuffer(ActiveStateMixin):
+    """All buffered items are sent, complete downstream subscriber"""
 
 
 @dataclass(frozen=False)
-class AwaitDownstreamAdjustBufferState(AdjustBufferStateMixin, AwaitDownstreamStateMixin):
-    # n_buffer_pop: int
-    pass
+class SubscriberCancelledState(ActiveStateMixin):
+    """Downstream subscriber cancelled, other subscribers remain"""
 
 
 @dataclass(frozen=False)
-class CancelledKeepAwaitDownstreamState(StopContinuationStateMixin, AwaitDownstreamStateMixin):
-    pass
+class SubscriberDetachedState(ActiveStateMixin):
+    """Detached downstream subscriber requests new item"""
 
+    exception: Exception
 
-@dataclass(frozen=False, slots=True)
-class OnNext(AwaitDownstreamStateMixin):
+
+@dataclass(frozen=False)
+class OnNext(UpstreamCertificatesMixin, ActiveStateMixin):
     send_ids: tuple[int, ...]
-    buffer_item: bool
 
 
-@dataclass(frozen=True, slots=True)
-class TerminatedStateMixin(ShareState):
-    requested_certificates: dict[int, ContinuationCertificate]
+@dataclass(frozen=False)
+class OnCompletedState(UpstreamCertificatesMixin, ActiveStateMixin):
+    send_ids: tuple[int, ...]
 
 
-# @dataclass(frozen=False, slots=True)
-# class OnNextAndComplete(AwaitDownstreamStateMixin):
-#     send_ids: tuple[int, ...]
-#     buffer_item: bool
+@dataclass(frozen=False, slots=True)
+class CancelledKeepAwaitDownstreamState(StopContinuationStateMixin, ShareState):
+    """Cancelled downstream subscriber requests new item"""
 
 
-@dataclass(frozen=True, slots=True)
-class OnCompletedState(TerminatedStateMixin):
-    send_ids: tuple[int, ...]
+@dataclass(frozen=True)
+class TerminatedStateMixin(ShareState):
+    certificates: tuple[ContinuationCertificate, ...]
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True)
 class ErrorStateMixin(TerminatedStateMixin):
     exception: Exception
 
@@ -131,7 +140,16 @@ class HasErroredState(ErrorStateMixin):
 
 @dataclass(frozen=True, slots=True)
 class CancelledState(TerminatedStateMixin):
-    pass
+    """All downstream subscribers cancelled"""
+
+    cancelled_certificates: dict[int, ContinuationCertificate]
+
+
+@dataclass(frozen=True, slots=True)
+class DetachedCancelledState(CancelledState):
+    """Last remaining downstream subscriber is detached"""
+
+    exception: Exception
 
 
 @dataclass(frozen=True, slots=True)
@@ -1,28 +1,29 @@
 from abc import ABC, abstractmethod
-from dataclasses import replace
 
 from dataclassabc import dataclassabc
 
 from continuationmonad.typing import ContinuationCertificate
 
+from rxbp.exceptions import ShareLagException
 from rxbp.flowabletree.operations.share.states import (
-    AwaitUpstreamAdjustBufferState,
-    ErrorStateMixin,
-    HasErroredState,
-    HasTerminatedState,
-    AwaitDownstreamAdjustBufferState,
-    CancelledKeepAwaitDownstreamState,
-    RequestUpstream,
     ActiveStateMixin,
     AwaitOnNext,
-    AwaitUpstreamStateMixin,
-    AwaitDownstreamStateMixin,
+    CancelledKeepAwaitDownstreamState,
     CancelledState,
+    DetachedCancelledState,
+    ErrorStateMixin,
+    HasErroredState,
+    HasTerminatedState,
+    LagPolicy,
+    OnCompletedFromBuffer,
     OnCompletedState,
     OnErrorState,
-    OnNextFromBuffer,
     OnNext,
+    OnNextFromBuffer,
+    RequestUpstream,
     ShareState,
+    SubscriberCancelledState,
+    SubscriberDetachedState,
     TerminatedStateMixin,
 )
 
@@ -31,15 +32,16 @@ State Machine
 -------------
 
 State groups (-), states (>):
-- Active - AwaitUpstream
+- Active
   > Init
   > RequestUpstream
   > AwaitOnNext
   > OnNextFromBuffer
-- Active - AwaitDownstream
+  > OnCompletedFromBuffer
+  > SubscriberCancelled
   > OnNext
-- Terminated
   > OnCompleted
+- Terminated
   > Cancelled
   > HasTerminated
 - Terminated - Errored
@@ -48,34 +50,33 @@ State groups (-), states (>):
 
 Transitions:
 - on_next:
-        AwaitUpstream           -> OnNext
+        Active                  -> OnNext
+                                -> OnError                  if maximum lag is exceeded and lag policy is 'error'
         Cancelled               -> HasTerminated
 - request:
-        Active                  -> RequestUpstream          if first request
-                                -> AwaitOnNext              if item is requested but not yet reveived
-                                -> OnNextFromBuffer
+        Active                  -> OnNextFromBuffer         if item is buffered
+                                -> OnCompletedFromBuffer    if upstream completed
+                                -> AwaitOnNext              if item is requested but not yet received
+                                -> RequestUpstream
+                                -> CancelledKeepAwaitDownstream if subscriber is cancelled
+                                -> SubscriberDetached       if subscriber is detached
+                                -> DetachedCancelled        if last remaining subscriber is detached
+        Cancelled               -> CancelledKeepAwaitDownstream
         Error                   -> HasErrored
-
-
-
-        CancelledAwaitRequest   -> CancelledStopRequest
 - on_next_and_complete: 
-        AwaitUpstream           -> OnNext
-        AwaitDownstream         -> OnNextAndComplete        if all upstream completed
-        Terminated              -> HasTerminated
+        Active                  -> OnNext
+                                -> OnError                  if maximum lag is exceeded and lag policy is 'error'
+        Cancelled               -> HasTerminated
 - on_completed:
-        AwaitUpstream           -> AwaitOnNext
-                                -> OnCompleted              if all upstream completed
-        AwaitDownstream         -> KeepWaiting
-        Terminated              -> HasTerminated
+        Active                  -> OnCompleted
+        Cancelled               -> HasTerminated
 - on_error:
-        AwaitUpstream           -> OnError
-        AwaitDownstream         -> OnError
-        Terminated              -> HasTerminated
+        Active                  -> OnError
+        Cancelled               -> HasTerminated
 - cancel:
-        AwaitUpstream           -> Cancelled
-        AwaitDownstream         -> CancelledAwaitRequest
-        Terminated              -> Cancelled
+        Active                  -> SubscriberCancelled
+                                -> Cancelled                if all subscribers are cancelled
+        Terminated              -> HasTerminated
 """
 
 
@@ -84,54 +85,133 @@ class ShareStateTransition(ABC):
     def get_state(self) -> ShareState: ...
 
 
-@dataclassabc(frozen=True)
-class ToStateTransition(ShareStateTransition):
-    """Transitions to predefined state"""
+class StateCell(ShareStateTransition):
+    """Holds the current state, updated in place while holding the lock"""
+
+    __slots__ = ('state',)
 
-    state: ShareState
+    def __init__(self, state: ShareState):
+        self.state = state
 
     def get_state(self):
         return self.state
 
+    def apply(self, transition) -> ShareState:
+        """
+        Evaluates the transition on the current state, must be called
+        while holding the lock.
+        """
+
+        transition.child = self
+        self.state = transition.get_state()
+        return self.state
+
+
+def _to_active_state(cls, state: ActiveStateMixin, **kwargs):
+    """
+    Creates the next active state taking over the fields of the
+    previous state that are not overwritten.
+    """
+
+    fields = dict(
+        buffer=state.buffer,
+        is_requested=state.is_requested,
+        upstream_certificate=state.upstream_certificate,
+        released_certificates=state.released_certificates,
+        cancelled_certificates=state.cancelled_certificates,
+        detached=state.detached,
+        is_completed=state.is_completed,
+        complete_with_item=state.complete_with_item,
+    )
+
+    return cls(**(fields | kwargs))
+
+
+def _get_upstream_certificates(state: ActiveStateMixin):
+    """
+    Certificates of the downstream subscribers not sent the next upstream item.
+    """
+
+    if state.upstream_certificate is None:
+        return tuple(state.released_certificates)
+
+    return (state.upstream_certificate, *state.released_certificates)
+
+
+def _apply_lag_policy(
+    state: ActiveStateMixin,
+    send_ids: tuple[int, ...],
+    max_lag: int | None,
+    on_lag: LagPolicy,
+):
+    """
+    Applies the lag policy after an upstream item is added to the buffer.
+    The lag grows by at most one per item, hence only the slowest
+    subscribers can exceed the maximum lag. Returns the error state, if
+    the share operator fails.
+    """
+
+    buffer = state.buffer
+
+    if max_lag is None or buffer.max_lag <= max_lag:
+        return None
+
+    match on_lag:
+        case 'drop_for_slow':
+            for id in buffer.slowest():
+                buffer.skip(id)
+
+        case 'detach_slow':
+            for id in buffer.slowest():
+                buffer.detach(id)
+                state.detached[id] = ShareLagException(
+                    f"Subscriber {id} lagged more than {max_lag} items behind."
+                )
+
+        case 'error':
+            return OnErrorState(
+                exception=ShareLagException(
+                    f"Subscribers lagged more than {max_lag} items behind."
+                ),
+                send_ids=send_ids,
+                certificates=_get_upstream_certificates(state),
+            )
+
+        case _:
+            raise Exception(f"Unexpected lag policy {on_lag}.")
+
 
 @dataclassabc(frozen=False)
-class OnNextTransition(ShareStateTransition):
+class OnNextTransition[V](ShareStateTransition):
     """Item received"""
+
     child: ShareStateTransition
+    item: V
+    max_lag: int | None
+    on_lag: LagPolicy
 
     def get_state(self):
         match state := self.child.get_state():
-            case AwaitUpstreamStateMixin(
-                # buffer_map=buffer_map,
-                # first_buffer_index=first_buffer_index,
-                # last_buffer_index=last_buffer_index,
-                # requested_certificates=requested_certificates,
-            ):
-                last_buffer_index = state.last_buffer_index + 1
+            case ActiveStateMixin(is_requested=True):
+                send_ids = state.buffer.append(self.item)
 
-                send_ids = tuple(
-                    id
-                    for id, index in state.buffer_map.items()
-                    if index == last_buffer_index
-                )
+                if error_state := _apply_lag_policy(
+                    state, send_ids, self.max_lag, self.on_lag
+                ):
+                    return error_state
 
-                # not all subscribers request new item
-                buffer_item = state.first_buffer_index != last_buffer_index
-
-                return OnNext(
-                    buffer_map=state.buffer_map,
-                    first_buffer_index=state.first_buffer_index,
-                    last_buffer_index=last_buffer_index,
-                    weights=state.weights,
-                    requested_certificates=state.requested_certificates,
+                return _to_active_state(
+                    OnNext,
+                    state,
                     send_ids=send_ids,
-                    buffer_item=buffer_item,
-                    is_completed=False,
-                    cancelled_certificates=state.cancelled_certificates,
+                    certificates=_get_upstream_certificates(state),
+                    is_requested=False,
+                    upstream_certificate=None,
+                    released_certificates=[],
                 )
 
-            case CancelledState(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
+            case CancelledState(certificates=certificates):
+                return HasTerminatedState(certificates=certificates)
 
             case _:
                 raise Exception(
@@ -149,158 +229,126 @@ class RequestTransition(ShareStateTransition):
 
     def get_state(self):
         match state := self.child.get_state():
-            case ActiveStateMixin():
-
-                def gen_weights():
-                    for id, w in state.weights.items():
-                        if id == self.id:
-                            yield id, self.weight
-                        else:
-                            yield id, w
-            
-                weights = dict(gen_weights())
-
+            case ActiveStateMixin(buffer=buffer):
                 if self.id in state.cancelled_certificates:
                     return CancelledKeepAwaitDownstreamState(
-                        buffer_map=state.buffer_map,
-                        first_buffer_index=state.first_buffer_index,
-                        last_buffer_index=state.last_buffer_index,
-                        weights=weights,
-                        requested_certificates=state.requested_certificates,
-                        certificate=state.cancelled_certificates[self.id],
-                        is_completed=state.is_completed,
-                        cancelled_certificates=state.cancelled_certificates,
+                        certificate=state.cancelled_certificates.pop(self.id),
                     )
 
-                # update buffer_map
-                buffer_map = {}
-                for id, index in state.buffer_map.items():
-                    if id == self.id:
-                        sel_index = index
-                        buffer_map[id] = index + 1
-
-                    else:
-                        buffer_map[id] = index
-
-                if state.last_buffer_index == sel_index:
-                    """ there is no item in the buffer """
-
-                    if isinstance(state, AwaitDownstreamStateMixin):
-                        """ request new upstream item """
-
-                        return RequestUpstream(
-                            buffer_map=buffer_map,
-                            first_buffer_index=state.first_buffer_index,
-                            last_buffer_index=state.last_buffer_index,
-                            weights=weights,
-                            requested_certificates=state.requested_certificates,
-                            # certificate=None,
-                            is_completed=state.is_completed,
-                            cancelled_certificates=state.cancelled_certificates,
-                        )
+                if self.id in state.detached:
+                    exception = state.detached.pop(self.id)
+
+                    if (
+                        buffer.n_subscribers == 0
+                        and not state.detached
+                        and not state.is_completed
+                    ):
+                        # no active downstream observers
 
-                    else:
-                        certificate = state.requested_certificates[self.id]
-                        # requested_certificates = {id: c for id, c in requested_certificates.items() if id != self.id}
-
-                        return AwaitOnNext(
-                            buffer_map=buffer_map,
-                            first_buffer_index=state.first_buffer_index,
-                            last_buffer_index=state.last_buffer_index,
-                            weights=weights,
-                            requested_certificates=state.requested_certificates,
-                            certificate=certificate,
-                            is_completed=state.is_completed,
+                        return DetachedCancelledState(
+                            certificates=_get_upstream_certificates(state),
                             cancelled_certificates=state.cancelled_certificates,
+                            exception=exception,
                         )
 
-                else:
-                    """ there is an item in the buffer """
+                    return _to_active_state(
+                        SubscriberDetachedState,
+                        state,
+                        exception=exception,
+                    )
 
-                    if sel_index == state.first_buffer_index:
-                        # update first index
+                buffer.set_weight(self.id, self.weight)
 
-                        n_observers = sum(
-                            index
-                            for index in buffer_map.values()
-                            if index == state.first_buffer_index
-                        )
+                if buffer.has_item(self.id):
+                    value = buffer.pop(self.id)
 
-                        # no upstream points to first index
-                        if pop_item := n_observers == 0:
-                            first_buffer_index = state.first_buffer_index + 1
-
-                    else:
-                        pop_item = False
-
-                    return OnNextFromBuffer(
-                        buffer_map=buffer_map,
-                        first_buffer_index=first_buffer_index,
-                        last_buffer_index=state.last_buffer_index,
-                        weights=weights,
-                        requested_certificates=state.requested_certificates,
-                        is_completed=state.is_completed,
-                        index=sel_index,
-                        pop_item=pop_item,
-                        cancelled_certificates=state.cancelled_certificates,
+                    return _to_active_state(
+                        OnNextFromBuffer,
+                        state,
+                        value=value,
+                        complete_downstream=state.complete_with_item
+                        and not buffer.has_item(self.id),
                     )
-            
+
+                if state.is_completed:
+                    return _to_active_state(OnCompletedFromBuffer, state)
+
+                buffer.wait(self.id)
+
+                if state.is_requested:
+                    # item is requested but not yet received
+                    certificate, upstream_certificate = (
+                        state.upstream_certificate.take(self.weight)  # type: ignore
+                    )
+
+                    return _to_active_state(
+                        AwaitOnNext,
+                        state,
+                        certificate=certificate,
+                        upstream_certificate=upstream_certificate,
+                    )
+
+                else:
+                    return _to_active_state(
+                        RequestUpstream,
+                        state,
+                        weight=self.weight,
+                        is_requested=True,
+                    )
+
+            case CancelledState(cancelled_certificates=cancelled_certificates):
+                return CancelledKeepAwaitDownstreamState(
+                    certificate=cancelled_certificates.pop(self.id),
+                )
+
             case ErrorStateMixin(
                 exception=exception,
-                requested_certificates=requested_certificates,
+                certificates=certificates,
             ):
                 # send on_error
 
                 return HasErroredState(
                     exception=exception,
-                    requested_certificates=requested_certificates,
+                    certificates=certificates,
                 )
 
-            case TerminatedStateMixin(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
-
             case _:
                 raise Exception(f"Unexpected state {state}.")
 
 
 @dataclassabc(frozen=False)
-class OnNextAndCompleteTransition(ShareStateTransition):
+class OnNextAndCompleteTransition[V](ShareStateTransition):
     """Item received, stream is complete"""
+
     child: ShareStateTransition
+    item: V
+    max_lag: int | None
+    on_lag: LagPolicy
 
     def get_state(self):
         match state := self.child.get_state():
-            case AwaitUpstreamStateMixin(
-                buffer_map=buffer_map,
-                first_buffer_index=first_buffer_index,
-                last_buffer_index=last_buffer_index,
-                # is_ack=is_ack,
-                requested_certificates=requested_certificates,
-            ):
-                n_last_buffer_index = last_buffer_index + 1
+            case ActiveStateMixin(is_requested=True):
+                send_ids = state.buffer.append(self.item)
 
-                send_ids = tuple(
-                    id
-                    for id, index in buffer_map.items()
-                    if index == n_last_buffer_index
-                )
-
-                buffer_item = first_buffer_index != n_last_buffer_index      # all subscribers request new item
+                if error_state := _apply_lag_policy(
+                    state, send_ids, self.max_lag, self.on_lag
+                ):
+                    return error_state
 
-                return OnNext(
-                    buffer_map=buffer_map,
-                    first_buffer_index=first_buffer_index,
-                    last_buffer_index=n_last_buffer_index,
-                    weights=state.weights,
-                    requested_certificates=requested_certificates,
+                return _to_active_state(
+                    OnNext,
+                    state,
                     send_ids=send_ids,
-                    buffer_item=buffer_item,
+                    certificates=_get_upstream_certificates(state),
+                    is_requested=False,
+                    upstream_certificate=None,
+                    released_certificates=[],
                     is_completed=True,
-                    cancelled_certificates=state.cancelled_certificates,
+                    complete_with_item=True,
                 )
 
-            case CancelledState(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
+            case CancelledState(certificates=certificates):
+                return HasTerminatedState(certificates=certificates)
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -314,22 +362,20 @@ class OnCompletedTransition(ShareStateTransition):
 
     def get_state(self):
         match state := self.child.get_state():
-            case ActiveStateMixin(
-                buffer_map=buffer_map,
-                last_buffer_index=last_buffer_index,
-                requested_certificates=requested_certificates,
-            ):
-                send_ids = tuple(
-                    id for id, index in buffer_map.items() if last_buffer_index <= index
-                )
-
-                return OnCompletedState(
-                    send_ids=send_ids,
-                    requested_certificates=requested_certificates,
+            case ActiveStateMixin():
+                return _to_active_state(
+                    OnCompletedState,
+                    state,
+                    send_ids=state.buffer.pop_waiting(),
+                    certificates=_get_upstream_certificates(state),
+                    is_requested=False,
+                    upstream_certificate=None,
+                    released_certificates=[],
+                    is_completed=True,
                 )
             
-            case CancelledState(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
+            case CancelledState(certificates=certificates):
+                return HasTerminatedState(certificates=certificates)
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -342,23 +388,15 @@ class OnErrorTransition(ShareStateTransition):
 
     def get_state(self):
         match state := self.child.get_state():
-            case ActiveStateMixin(
-                buffer_map=buffer_map,
-                last_buffer_index=last_buffer_index,
-                requested_certificates=requested_certificates,
-            ):
-                send_ids = tuple(
-                    id for id, index in buffer_map.items() if index == last_buffer_index
-                )
-
+            case ActiveStateMixin():
                 return OnErrorState(
                     exception=self.exception,
-                    send_ids=send_ids,
-                    requested_certificates=requested_certificates,
+                    send_ids=state.buffer.pop_waiting(),
+                    certificates=_get_upstream_certificates(state),
                 )
 
-            case CancelledState(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
+            case CancelledState(certificates=certificates):
+                return HasTerminatedState(certificates=certificates)
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -372,65 +410,35 @@ class CancelTransition(ShareStateTransition):
 
     def get_state(self):
         match state := self.child.get_state():
-            case ActiveStateMixin(
-                buffer_map=buffer_map,
-                requested_certificates=requested_certificates,
-                first_buffer_index=first_buffer_index,
-            ):
-                # remove downstrem from buffer
-                n_buffer_map = {
-                    id: index for id, index in buffer_map.items() if id != self.id
-                }
+            case ActiveStateMixin(buffer=buffer):
+                # remove downstream from buffer
+                if self.id in state.detached:
+                    del state.detached[self.id]
+                    state.cancelled_certificates[self.id] = self.certificate
 
-                certificate = requested_certificates[self.id].or_(self.certificate)
+                elif buffer.remove_subscriber(self.id):
+                    # the continuation of the waiting subscriber is already stopped
+                    state.released_certificates.append(self.certificate)
 
-                if len(n_buffer_map) == 0:
-                    # no active downstream observers
+                else:
+                    state.cancelled_certificates[self.id] = self.certificate
 
-                    requested_certificates = requested_certificates | {self.id: certificate}
+                if (
+                    buffer.n_subscribers == 0
+                    and not state.detached
+                    and not state.is_completed
+                ):
+                    # no active downstream observers
 
                     return CancelledState(
-                        requested_certificates=requested_certificates,
+                        certificates=_get_upstream_certificates(state),
+                        cancelled_certificates=state.cancelled_certificates,
                     )
-                
-                else:
-                    first_buffer_index = min(n_buffer_map.values())
-                    n_buffer_pop = first_buffer_index - first_buffer_index
-
-                    match state:
-                        case AwaitUpstreamStateMixin():
-                            requested_certificates = requested_certificates | {self.id: certificate}
-
-                            return AwaitUpstreamAdjustBufferState(
-                                buffer_map=n_buffer_map,
-                                first_buffer_index=first_buffer_index,
-                                last_buffer_index=state.last_buffer_index,
-                                weights=state.weights,
-                                requested_certificates=requested_certificates,
-                                is_completed=state.is_completed,
-                                n_buffer_pop=n_buffer_pop,
-                                cancelled_certificates=state.cancelled_certificates,
-                            )
-
-                        case AwaitDownstreamStateMixin(
-                            cancelled_certificates=cancelled_certificates,
-                        ):
-                            cancelled_certificates = cancelled_certificates | {self.id: certificate}
-                            requested_certificates = {id: c for id, c in requested_certificates.items() if id != self.id}
-
-                            return AwaitDownstreamAdjustBufferState(
-                                buffer_map=n_buffer_map,
-                                first_buffer_index=first_buffer_index,
-                                last_buffer_index=state.last_buffer_index,
-                                weights=state.weights,
-                                requested_certificates=requested_certificates,
-                                is_completed=state.is_completed,
-                                n_buffer_pop=n_buffer_pop,
-                                cancelled_certificates=cancelled_certificates,
-                            )
-
-            case TerminatedStateMixin(requested_certificates=requested_certificates):
-                return HasTerminatedState(requested_certificates=requested_certificates)
+
+                return _to_active_state(SubscriberCancelledState, state)
+
+            case TerminatedStateMixin(certificates=certificates):
+                return HasTerminatedState(certificates=certificates)
 
             case _:
                 raise Exception(f"Unexpected state {state}.")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+@dataclass(slots=True)
+class SkipObserver[U](Observer[U]):
+    observer: Observer[U]
+    remaining: int
+
+    def on_next(self, item: U):
+        if self.remaining:
+            self.remaining -= 1
+            return continuationmonad.from_(None)
+
+        else:
+            return self.observer.on_next(item)
+
+    def on_next_batch(self, items: list[U]):
+        if self.remaining:
+            n_skipped = min(self.remaining, len(items))
+            self.remaining -= n_skipped
+            items = items[n_skipped:]
+
+            if not items:
+                return continuationmonad.from_(None)
+
+        return self.observer.on_next_batch(items)
+
+    def on_next_and_complete(self, item: U):
+        if self.remaining:
+            return self.observer.on_completed()
+
+        else:
+            return self.observer.on_next_and_complete(item)
+
+    def on_completed(self):
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class SkipFlowable[U](SingleChildFlowableNode[U, U]):
+    child: FlowableNode[U]
+    count: int
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=SkipObserver(
+                    observer=args.observer,
+                    remaining=self.count,
+                ),
+            ),
+        )
+
+
+def init_skip_flowable[U](
+    child: FlowableNode[U],
+    count: int,
+):
+    return SkipFlowable[U](
+        child=child,
+        count=count,
+    )
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+
+from dataclassabc import dataclassabc
+from donotation import do
+
+import continuationmonad
+from continuationmonad.typing import ContinuationCertificate, Scheduler
+
+from rxbp.cancellable import Cancellable, CancellationState
+from rxbp.state import State, init_state
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.subscribeandconnect import subscribe_single_sink
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+@dataclass(frozen=False)
+class SubscribeOnCancellation(CancellationState):
+    """Forwards the cancellation to upstream once it is subscribed"""
+
+    lock: Lock
+    upstream_cancellable: Cancellable | None
+    _certificate: ContinuationCertificate | None
+
+    def cancel(self, certificate: ContinuationCertificate):
+        with self.lock:
+            super().cancel(certificate)
+            upstream_cancellable = self.upstream_cancellable
+
+        if upstream_cancellable is not None:
+            upstream_cancellable.cancel(certificate)
+
+    def set_upstream(self, cancellable: Cancellable):
+        with self.lock:
+            self.upstream_cancellable = cancellable
+            certificate = self.is_cancelled()
+
+        if certificate is not None:
+            cancellable.cancel(certificate)
+
+
+@dataclassabc(frozen=True)
+class SubscribeOnFlowable[U](SingleChildFlowableNode[U, U]):
+    """
+    Subscribes the child on the scheduler. The child is subscribed on its
+    own, like the inner flowables of `flat_map`, therefore, flowables shared
+    inside the child are not shared with flowables outside of it.
+    """
+
+    child: FlowableNode[U]
+    scheduler: Scheduler
+
+    def discover(self, state: State):
+        return state
+
+    def assign_weights(self, state: State, weight: int):
+        return state
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        cancellation = SubscribeOnCancellation(
+            lock=Lock(),
+            upstream_cancellable=None,
+            _certificate=None,
+        )
+
+        @do()
+        def subscribe_child():
+            yield from continuationmonad.schedule_on(self.scheduler)
+
+            trampoline = yield from continuationmonad.get_trampoline()
+
+            _, result = subscribe_single_sink(
+                source=self.child,
+                args=args.copy(scheduler=self.scheduler),
+                state=init_state(subscription_trampoline=trampoline),
+            )
+
+            cancellation.set_upstream(result.cancellable)
+            return continuationmonad.from_(result.certificate)
+
+        certificate = continuationmonad.fork(
+            source=continuationmonad.from_(None).flat_map(
+                lambda _: subscribe_child()
+            ),
+            on_error=args.observer.on_error,
+            scheduler=state.subscription_trampoline,
+            cancellation=cancellation,
+            weight=args.weight,
+        )
+
+        return state, SubscriptionResult(
+            certificate=certificate,
+            cancellable=cancellation,
+        )
+
+
+def init_subscribe_on_flowable[U](
+    child: FlowableNode[U],
+    scheduler: Scheduler,
+):
+    return SubscribeOnFlowable[U](
+        child=child,
+        scheduler=scheduler,
+    )
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+@dataclass(slots=True)
+class TakeObserver[U](Observer[U]):
+    observer: Observer[U]
+    remaining: int
+
+    def on_next(self, item: U):
+        self.remaining -= 1
+
+        if 0 < self.remaining:
+            return self.observer.on_next(item)
+
+        # upstream is not resumed
+        elif self.remaining == 0:
+            def on_next_subscription(_, __):
+                return self.observer.on_next_and_complete(item)
+
+        else:
+            def on_next_subscription(_, __):
+                return self.observer.on_completed()
+
+        return continuationmonad.defer(on_next_subscription)
+
+    def on_next_batch(self, items: list[U]):
+        if len(items) < self.remaining:
+            self.remaining -= len(items)
+            return self.observer.on_next_batch(items)
+
+        taken = items[:max(self.remaining, 0)]
+        self.remaining = 0
+
+        # upstream is not resumed
+        def on_next_subscription(_, __):
+            match taken:
+                case []:
+                    return self.observer.on_completed()
+
+                case [item]:
+                    return self.observer.on_next_and_complete(item)
+
+                case [*init, last]:
+                    return self.observer.on_next_batch(init).flat_map(
+                        lambda _: self.observer.on_next_and_complete(last)
+                    )
+
+        return continuationmonad.defer(on_next_subscription)
+
+    def on_next_and_complete(self, item: U):
+        if 0 < self.remaining:
+            return self.observer.on_next_and_complete(item)
+
+        else:
+            return self.observer.on_completed()
+
+    def on_completed(self):
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class TakeFlowable[U](SingleChildFlowableNode[U, U]):
+    child: FlowableNode[U]
+    count: int
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[U],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=TakeObserver(
+                    observer=args.observer,
+                    remaining=self.count,
+                ),
+            ),
+        )
+
+
+def init_take_flowable[U](
+    child: FlowableNode[U],
+    count: int,
+):
+    return TakeFlowable[U](
+        child=child,
+        count=count,
+    )
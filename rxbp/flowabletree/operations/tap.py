@@ -1,73 +1,47 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Callable
 
 from dataclassabc import dataclassabc
 
-from continuationmonad.typing import ContinuationCertificate, ContinuationMonad
-
-from rxbp.state import State
-from rxbp.flowabletree.observer import Observer
-from rxbp.flowabletree.subscribeargs import SubscribeArgs
-from rxbp.flowabletree.subscriptionresult import SubscriptionResult
-from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+from rxbp.flowabletree.nodes import FlowableNode
+from rxbp.flowabletree.operations.fused import FusableFlowableNode
 
 
 @dataclassabc(frozen=True)
-class TapFlowable[U](SingleChildFlowableNode[U, U]):
+class TapFlowable[U](FusableFlowableNode[U, U]):
     child: FlowableNode[U]
     on_next: Callable[[U], None] | None
     on_next_and_complete: Callable[[U], None] | None
     on_completed: Callable[[], None] | None
     on_error: Callable[[Exception], None] | None
 
-    def unsafe_subscribe(
-        self,
-        state: State,
-        args: SubscribeArgs[V],
-    ) -> tuple[State, SubscriptionResult]:
-        outer_self = self
-
-        @dataclass
-        class TapObserver(Observer):
-            def on_next(self, item: U):
-                if outer_self.on_next:
-                    outer_self.on_next(item)
-
-                return args.observer.on_next(item)
-
-            def on_next_and_complete(self, item: U):
-                if outer_self.on_next_and_complete:
-                    outer_self.on_next_and_complete(item)
-
-                else:
-                    if outer_self.on_next:
-                        outer_self.on_next(item)
+    def fused_on_next(self, item: U):
+        if self.on_next:
+            self.on_next(item)
 
-                    if outer_self.on_completed:
-                        outer_self.on_completed()
+        return item
 
-                return args.observer.on_next_and_complete(item)
+    def fused_on_next_and_complete(self, item: U):
+        if self.on_next_and_complete:
+            self.on_next_and_complete(item)
 
-            def on_completed(self) -> ContinuationMonad[ContinuationCertificate]:
-                if outer_self.on_completed:
-                    outer_self.on_completed()
+        else:
+            if self.on_next:
+                self.on_next(item)
 
-                return args.observer.on_completed()
+            if self.on_completed:
+                self.on_completed()
 
-            def on_error(self, exception: Exception) -> ContinuationMonad[ContinuationCertificate]:
-                if outer_self.on_error:
-                    outer_self.on_error(exception)
+        return item
 
-                return args.observer.on_error(exception)
+    def fused_on_completed(self):
+        if self.on_completed:
+            self.on_completed()
 
-        return self.child.unsafe_subscribe(
-            state=state,
-            args=args.copy(
-                observer=TapObserver(),
-            ),
-        )
+    def fused_on_error(self, exception: Exception):
+        if self.on_error:
+            self.on_error(exception)
 
 
 def init_tap_flowable[U](
@@ -12,65 +12,85 @@ from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
 
 
-@dataclassabc(frozen=True)
-class ToListFlowable[U](SingleChildFlowableNode[U, U]):
-    child: FlowableNode[U]
-    size: int | None
+@dataclass(slots=True)
+class ToListObserver[U](Observer[U]):
+    observer: Observer[list[U]]
+    acc: list[U]
 
-    def unsafe_subscribe(
-        self,
-        state: State,
-        args: SubscribeArgs[list[U]],
-    ) -> tuple[State, SubscriptionResult]:
-        @dataclass
-        class ToListObserver(Observer[U]):
-            acc: list[U]
+    def on_next(self, item: U):
+        self.acc.append(item)
+        return continuationmonad.from_(None)
+
+    def on_next_batch(self, items: list[U]):
+        self.acc.extend(items)
+        return continuationmonad.from_(None)
 
-            def on_next(self, item: U):
-                self.acc.append(item)
-                return continuationmonad.from_(None)
+    def on_next_and_complete(self, item: U):
+        self.acc.append(item)
+        return self.observer.on_next_and_complete(self.acc)
 
-            def on_next_and_complete(self, item: U):
-                self.acc.append(item)
-                return args.observer.on_next_and_complete(self.acc)
+    def on_completed(self):
+        return self.observer.on_next_and_complete(self.acc)
 
-            def on_completed(self):
-                return args.observer.on_next_and_complete(self.acc)
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
 
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
 
-        @dataclass
-        class BatchedObserver(Observer[U]):
-            size: int
-            acc: list[U]
+@dataclass(slots=True)
+class BatchedObserver[U](Observer[U]):
+    observer: Observer[list[U]]
+    size: int
+    acc: list[U]
 
-            def on_next(self, item: U):
-                self.acc.append(item)
+    def on_next(self, item: U):
+        self.acc.append(item)
+
+        if len(self.acc) == self.size:
+            batched = self.acc
+            self.acc = []
+            return self.observer.on_next(batched)
+
+        else:
+            return continuationmonad.from_(None)
 
-                if len(self.acc) == self.size:
-                    batched = self.acc
-                    self.acc = []
-                    return args.observer.on_next(batched)
+    def on_next_batch(self, items: list[U]):
+        self.acc.extend(items)
 
-                else:
-                    return continuationmonad.from_(None)
+        if len(self.acc) < self.size:
+            return continuationmonad.from_(None)
 
-            def on_next_and_complete(self, item: U):
-                self.acc.append(item)
-                return args.observer.on_next_and_complete(self.acc)
+        acc = self.acc
+        n_full = len(acc) - len(acc) % self.size
+        batches = [acc[i:i + self.size] for i in range(0, n_full, self.size)]
+        self.acc = acc[n_full:]
+        return self.observer.on_next_batch(batches)
 
-            def on_completed(self):
-                return args.observer.on_next_and_complete(self.acc)
+    def on_next_and_complete(self, item: U):
+        self.acc.append(item)
+        return self.observer.on_next_and_complete(self.acc)
 
-            def on_error(self, exception: Exception):
-                return args.observer.on_error(exception)
+    def on_completed(self):
+        return self.observer.on_next_and_complete(self.acc)
 
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class ToListFlowable[U](SingleChildFlowableNode[U, U]):
+    child: FlowableNode[U]
+    size: int | None
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[list[U]],
+    ) -> tuple[State, SubscriptionResult]:
         if self.size is None:
-            observer = ToListObserver(acc=[])
+            observer = ToListObserver(observer=args.observer, acc=[])
 
         else:
-            observer = BatchedObserver(acc=[], size=self.size)
+            observer = BatchedObserver(observer=args.observer, acc=[], size=self.size)
 
         return self.child.unsafe_subscribe(
             state=state,
@@ -21,10 +21,9 @@ class ZipCancellable(Cancellable):
         )
         
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case CancelledState(certificates=certificates):
                 for id, certificate in certificates.items():
                     self.cancellables[id].cancel((certificate,))
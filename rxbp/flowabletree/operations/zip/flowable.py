@@ -10,7 +10,7 @@ from rxbp.flowabletree.subscribeargs import SubscribeArgs
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
 from rxbp.flowabletree.nodes import MultiChildrenFlowableNode, FlowableNode
 from rxbp.flowabletree.operations.zip.states import AwaitUpstreamStateMixin
-from rxbp.flowabletree.operations.zip.statetransitions import ToStateTransition
+from rxbp.flowabletree.operations.zip.statetransitions import StateCell
 from rxbp.flowabletree.operations.zip.sharedmemory import ZipSharedMemory
 from rxbp.flowabletree.operations.zip.cancellable import ZipCancellable
 from rxbp.flowabletree.operations.zip.observer import ZipObserver
@@ -19,7 +19,9 @@ from rxbp.flowabletree.operations.zip.observer import ZipObserver
 @dataclassabc(frozen=True)
 class ControlledZipFlowableNode[A, U](MultiChildrenFlowableNode[U, tuple[U, ...]]):
     children: tuple[FlowableNode, ...]
-    func: Callable[[A, dict[int, U]], tuple[A, tuple[int, ...], U]]
+    # selects the values sent downstream and the upstream flowables to hold back,
+    # the values are zipped to a tuple if no function is given
+    func: Callable[[A, dict[int, U]], tuple[A, tuple[int, ...], U]] | None
     initial: A
 
     @do()
@@ -31,6 +33,8 @@ class ControlledZipFlowableNode[A, U](MultiChildrenFlowableNode[U, tuple[U, ...]
             downstream=args.observer,
             zip_func=self.func,
             n_children=len(self.children),
+            values=[None] * len(self.children),
+            observers=[None] * len(self.children),
             transition=None,  # type: ignore
             cancellables=None,  # type: ignore
             acc=self.initial,
@@ -57,11 +61,10 @@ class ControlledZipFlowableNode[A, U](MultiChildrenFlowableNode[U, tuple[U, ...]
 
         certificate, *others = certificates
 
-        shared.transition = ToStateTransition(
+        shared.transition = StateCell(
             state=AwaitUpstreamStateMixin(
-                certificates=tuple(others),
-                values={},
-                observers={},
+                certificates=others,
+                received=0,
                 is_completed=False,
             )
         )
@@ -91,15 +94,11 @@ def init_controlled_zip_flowable_node[A, U](
 )
 
 
-def init_zip_flowable_node[A, U](
+def init_zip_flowable_node[U](
     children: tuple[FlowableNode[U], ...],
 ):
-    def zip_func(acc: A, val: dict[int, U]):
-        _, zipped_values = zip(*sorted(val.items()))
-        return acc, tuple(), zipped_values
-
-    return ControlledZipFlowableNode[A, U](
+    return ControlledZipFlowableNode[None, U](
         children=children,
-        func=zip_func,
+        func=None,
         initial=None,
 )
@@ -25,7 +25,6 @@ from rxbp.flowabletree.operations.zip.statetransitions import (
     OnNextTransition,
     OnNextAndCompleteTransition,
     OnCompletedTransition,
-    ToStateTransition,
 )
 from rxbp.flowabletree.operations.zip.sharedmemory import ZipSharedMemory
 
@@ -35,6 +34,27 @@ class ZipObserver[V](Observer[V]):
     shared: ZipSharedMemory
     id: int
 
+    def _zip_values(self):
+        """
+        Returns the item sent downstream and the bitmask of the upstream
+        flowables that are held back.
+        """
+
+        shared = self.shared
+
+        if shared.zip_func is None:
+            return tuple(shared.values), 0
+
+        shared.acc, hold_back, item = shared.zip_func(
+            shared.acc, dict(enumerate(shared.values))
+        )
+
+        received = 0
+        for id in hold_back:
+            received |= 1 << id
+
+        return item, received
+
     def on_next(self, value: V):
         # print(f'on_next({value}), id={self.id}')
 
@@ -45,41 +65,37 @@ class ZipObserver[V](Observer[V]):
 
             transition = OnNextTransition(
                 id=self.id,
-                value=value,
-                observer=handler,
                 n_children=self.shared.n_children,
                 child=None,  # type: ignore
             )
 
             with self.shared.lock:
-                transition.child = self.shared.transition
-                self.shared.transition = transition
+                self.shared.values[self.id] = value
+                self.shared.observers[self.id] = handler
+                state = self.shared.transition.apply(transition)
 
-            match state := transition.get_state():
+            match state:
                 # wait for other upstream items
                 case AwaitFurtherState(certificate=certificate):
                     return certificate
 
                 # all upstream items received
-                case OnNextState(
-                    values=values,
-                ):
+                case OnNextState():
                     # backpressure selected upstream flowables
-                    self.shared.acc, hold_back, on_next_items = self.shared.zip_func(self.shared.acc, state.values)
-
-                    complete_downstream = [False]
+                    on_next_items, received = self._zip_values()
 
-                    def gen_deferred_handlers():
-                        for id in range(self.shared.n_children):
-                            if id not in hold_back:
-                                if id in state.observers:
-                                    yield state.observers[id]
-                                else:
-                                    complete_downstream[0] = True
+                    if received:
+                        handlers = tuple(
+                            observer
+                            for id, observer in enumerate(self.shared.observers)
+                            if not received >> id & 1
+                        )
 
-                    handlers = tuple(gen_deferred_handlers())
+                    else:
+                        handlers = tuple(self.shared.observers)
 
-                    if complete_downstream[0]:
+                    # upstream flowable completed in a previous round but was held back
+                    if any(handler is None for handler in handlers):
                         return self.shared.downstream.on_next_and_complete(
                             on_next_items
                         )
@@ -93,22 +109,13 @@ class ZipObserver[V](Observer[V]):
 
                         transition = RequestTransition(
                             child=None,  # type: ignore
-                            certificates=tuple(others),
-                            values={},
-                            observers={
-                                id: value
-                                for id, value in state.observers.items()
-                                if id in hold_back
-                            },
+                            certificates=others,
+                            received=received,
                             n_children=self.shared.n_children,
                         )
 
                         with self.shared.lock:
-                            transition.child = self.shared.transition
-                            n_state = transition.get_state()
-                            self.shared.transition = ToStateTransition(
-                                state=n_state
-                            )
+                            n_state = self.shared.transition.apply(transition)
 
                         match n_state:
                             case CancelledState(certificates=certificates):
@@ -119,10 +126,8 @@ class ZipObserver[V](Observer[V]):
 
                         return continuationmonad.from_(certificate)
 
-                case OnNextAndCompleteState(
-                    values=values,
-                ):
-                    _, _, on_next_items = self.shared.zip_func(self.shared.acc, values)
+                case OnNextAndCompleteState():
+                    on_next_items, _ = self._zip_values()
                     return self.shared.downstream.on_next_and_complete(on_next_items)
 
                 case TerminatedStateMixin(certificate=certificate):
@@ -139,24 +144,23 @@ class ZipObserver[V](Observer[V]):
 
         transition = OnNextAndCompleteTransition(
             id=self.id,
-            value=value,
             n_children=self.shared.n_children,
             child=None,  # type: ignore
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            self.shared.values[self.id] = value
+            self.shared.observers[self.id] = None
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             # wait for other upstream items
             case AwaitFurtherState(certificate=certificate):
                 return continuationmonad.from_(certificate)
 
             case OnNextAndCompleteState():
-                _, zipped_values = zip(*sorted(state.values.items()))
-
-                return self.shared.downstream.on_next_and_complete(zipped_values)
+                on_next_items, _ = self._zip_values()
+                return self.shared.downstream.on_next_and_complete(on_next_items)
 
             case TerminatedStateMixin(certificate=certificate):
                 return continuationmonad.from_(certificate)
@@ -172,10 +176,9 @@ class ZipObserver[V](Observer[V]):
         )  # type: ignore
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnCompletedState(
                 certificates=certificates,
             ):
@@ -199,10 +202,9 @@ class ZipObserver[V](Observer[V]):
         )
 
         with self.shared.lock:
-            transition.child = self.shared.transition
-            self.shared.transition = transition
+            state = self.shared.transition.apply(transition)
 
-        match state := transition.get_state():
+        match state:
             case OnErrorState(
                 exception=exception,
                 certificates=certificates,
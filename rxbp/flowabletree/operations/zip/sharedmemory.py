@@ -6,17 +6,25 @@ from typing import Callable
 
 from dataclassabc import dataclassabc
 
+from continuationmonad.typing import DeferredHandler
+
 from rxbp.cancellable import Cancellable
 from rxbp.flowabletree.observer import Observer
-from rxbp.flowabletree.operations.zip.statetransitions import ZipStateTransition
+from rxbp.flowabletree.operations.zip.statetransitions import StateCell
 
 
 @dataclassabc
 class ZipSharedMemory[A, U]:
-    transition: ZipStateTransition
+    transition: StateCell
     downstream: Observer[tuple[U, ...]]
-    zip_func: Callable[[A, dict[int, U]], tuple[A, tuple[int, ...], U]]
+    # the received values are zipped to a tuple if no function is given
+    zip_func: Callable[[A, dict[int, U]], tuple[A, tuple[int, ...], U]] | None
     n_children: int
+
+    # slots indexed by upstream id, written while holding the lock
+    values: list[U]
+    observers: list[DeferredHandler | None]
+
     cancellables: dict[int, Cancellable]
     lock: Lock
     acc: A
@@ -5,7 +5,6 @@ from dataclasses import dataclass
 
 from continuationmonad.typing import (
     ContinuationCertificate,
-    DeferredHandler,
 )
 
 
@@ -13,19 +12,17 @@ class ZipState(ABC): ...
 
 
 @dataclass(frozen=True)
-class ActiveStateMixin[U](ZipState):
+class ActiveStateMixin(ZipState):
     """
     Represents states where the Zip operator is active.
 
     Depending on the provided selector, some upstream flowables are hold back (backpressured).
-    In this case, observers and values attribute are initially not empty.
+    In this case, the received bitmask is initially not empty.
     """
 
-    # Deferred continuationmonad observers used to request a new item from inactive upstream flowables.
-    observers: dict[int, DeferredHandler]
-
-    # Received values
-    values: dict[int, U]
+    # Bitmask of upstream ids whose value and deferred observer are stored
+    # in the slots of the shared memory.
+    received: int
 
 
 @dataclass(frozen=True)
@@ -42,7 +39,8 @@ class AwaitUpstreamStateMixin(ActiveStateMixin):
 
     # Certificates returned when requesting new upstream item, one is returned to downstream flowable during subscription.
     # Hence, the number qquals the number of active upstream flowables minus one.
-    certificates: tuple[ContinuationCertificate, ...]
+    # The list is shared between consecutive states and is modified in place while holding the lock.
+    certificates: list[ContinuationCertificate]
 
     # Zip operator is scheduled to complete when all upstream items are received.
     is_completed: bool
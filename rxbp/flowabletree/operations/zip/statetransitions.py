@@ -7,7 +7,6 @@ from dataclassabc import dataclassabc
 
 from continuationmonad.typing import (
     ContinuationCertificate,
-    DeferredHandler,
 )
 
 from rxbp.flowabletree.operations.zip.states import (
@@ -76,15 +75,27 @@ class ZipStateTransition(ABC):
     def get_state(self) -> ZipState: ...
 
 
-@dataclassabc(frozen=True)
-class ToStateTransition(ZipStateTransition):
-    """Transitions to predefined state"""
+class StateCell(ZipStateTransition):
+    """Holds the current state, updated in place while holding the lock"""
 
-    state: ZipState
+    __slots__ = ('state',)
+
+    def __init__(self, state: ZipState):
+        self.state = state
 
     def get_state(self):
         return self.state
 
+    def apply(self, transition) -> ZipState:
+        """
+        Evaluates the transition on the current state, must be called
+        while holding the lock.
+        """
+
+        transition.child = self
+        self.state = transition.get_state()
+        return self.state
+
 
 @dataclass
 class AssignCertificatesMixin:
@@ -92,11 +103,11 @@ class AssignCertificatesMixin:
     
     def _assign_certificates(
         self,
-        received_ids: tuple[int, ...],
-        certificates: tuple[ContinuationCertificate, ...],
+        received: int,
+        certificates: list[ContinuationCertificate],
     ):
         awaiting_ids = tuple(
-            id for id in range(self.n_children) if id not in received_ids
+            id for id in range(self.n_children) if not received >> id & 1
         )
 
         assert len(awaiting_ids) == len(certificates), f'{awaiting_ids}, {certificates}'
@@ -122,10 +133,10 @@ class InactiveTransitionsMixin():
                 raise Exception(f"Unexpected state {state}.")
 
 @dataclass
-class OnNextTransition[U](InactiveTransitionsMixin, ZipStateTransition):
+class OnNextTransition(InactiveTransitionsMixin, ZipStateTransition):
+    """Upstream item is stored in its slot"""
+
     child: ZipStateTransition
-    value: U
-    observer: DeferredHandler
     n_children: int
 
     def get_state(self):
@@ -134,31 +145,27 @@ class OnNextTransition[U](InactiveTransitionsMixin, ZipStateTransition):
                 certificates=certificates,
                 is_completed=is_completed,
             ):
-                values = state.values | {self.id: self.value}
-                observers = state.observers | {self.id: self.observer}
+                received = state.received | (1 << self.id)
 
-                if len(values) == self.n_children:
+                if received == (1 << self.n_children) - 1:
                     assert len(certificates) == 0
 
                     if is_completed:
                         return OnNextAndCompleteState(
-                            values=values,
-                            observers=observers,
+                            received=received,
                             certificates={},
                         )
 
                     else:
                         return OnNextState(
-                            values=values,
-                            observers=observers,
+                            received=received,
                         )
 
                 else:
                     return AwaitFurtherState(
-                        values=values,
-                        observers=observers,
-                        certificate=certificates[0],
-                        certificates=certificates[1:],
+                        received=received,
+                        certificate=certificates.pop(),
+                        certificates=certificates,
                         is_completed=is_completed,
                     )
 
@@ -171,16 +178,16 @@ class RequestTransition(AssignCertificatesMixin, ZipStateTransition):
     """Downstream requests new item"""
 
     child: ZipStateTransition
-    values: dict[int, None]
-    observers: dict[int, DeferredHandler]
-    certificates: tuple[ContinuationCertificate, ...]
+
+    # bitmask of the upstream flowables held back by the selector
+    received: int
+    certificates: list[ContinuationCertificate]
 
     def get_state(self):
         match state := self.child.get_state():
             case OnNextState():
                 return AwaitOnNextState(
-                    values=self.values,
-                    observers=self.observers,
+                    received=self.received,
                     certificates=self.certificates,
                     is_completed=False,
                 )
@@ -188,8 +195,8 @@ class RequestTransition(AssignCertificatesMixin, ZipStateTransition):
             case CancelledAwaitRequestState(certificate=certificate):
                 return CancelledState(
                     certificates=self._assign_certificates(
-                        received_ids=tuple(self.values),
-                        certificates=self.certificates + (certificate,),
+                        received=self.received,
+                        certificates=self.certificates + [certificate],
                     ),
                 )
 
@@ -198,34 +205,32 @@ class RequestTransition(AssignCertificatesMixin, ZipStateTransition):
 
 
 @dataclass
-class OnNextAndCompleteTransition[U](InactiveTransitionsMixin, ZipStateTransition):
+class OnNextAndCompleteTransition(InactiveTransitionsMixin, ZipStateTransition):
+    """Upstream item is stored in its slot, upstream is complete"""
+
     child: ZipStateTransition
     n_children: int
-    value: U
 
     def get_state(self):
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
                 certificates=certificates,
             ):
-                values = state.values | {self.id: self.value}
-                observers = state.observers
+                received = state.received | (1 << self.id)
 
-                if len(values) == self.n_children:
+                if received == (1 << self.n_children) - 1:
                     assert len(certificates) == 0
 
                     return OnNextAndCompleteState(
-                        values=values,
-                        observers=observers,
+                        received=received,
                         certificates={},
                     )
 
                 else:
                     return AwaitFurtherState(
-                        certificate=certificates[0],
-                        certificates=certificates[1:],
-                        values=values,
-                        observers=observers,
+                        certificate=certificates.pop(),
+                        certificates=certificates,
+                        received=received,
                         is_completed=True,
                     )
 
@@ -240,11 +245,11 @@ class OnCompletedTransition(InactiveTransitionsMixin, AssignCertificatesMixin, Z
     def get_state(self):
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
-                values=values,
+                received=received,
                 certificates=certificates,
             ):
                 certificates = self._assign_certificates(
-                    received_ids=tuple(values) + (self.id,),
+                    received=received | (1 << self.id),
                     certificates=certificates,
                 )
                 return OnCompletedState(
@@ -264,12 +269,12 @@ class OnErrorTransition(InactiveTransitionsMixin, AssignCertificatesMixin, ZipSt
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
                 certificates=certificates,
-                values=values,
+                received=received,
             ):
                 return OnErrorState(
                     exception=self.exception,
                     certificates=self._assign_certificates(
-                        received_ids=tuple(values) + (self.id,),
+                        received=received | (1 << self.id),
                         certificates=certificates,
                     ),
                 )
@@ -286,12 +291,12 @@ class CancelTransition(AssignCertificatesMixin, ZipStateTransition):
     def get_state(self):
         match state := self.child.get_state():
             case AwaitUpstreamStateMixin(
-                values=values,
+                received=received,
                 certificates=certificates,
             ):
                 certificates=self._assign_certificates(
-                    received_ids=tuple(values),
-                    certificates=certificates + (self.certificate,),
+                    received=received,
+                    certificates=certificates + [self.certificate],
                 )
                 return CancelledState(
                     certificates=certificates,
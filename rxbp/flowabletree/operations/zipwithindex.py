@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dataclassabc import dataclassabc
+
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.flowabletree.nodes import FlowableNode, SingleChildFlowableNode
+
+
+@dataclass(slots=True)
+class ZipWithIndexObserver[U](Observer[U]):
+    observer: Observer[tuple[U, int]]
+    index: int
+
+    def on_next(self, item: U):
+        index = self.index
+        self.index = index + 1
+        return self.observer.on_next((item, index))
+
+    def on_next_and_complete(self, item: U):
+        return self.observer.on_next_and_complete((item, self.index))
+
+    def on_completed(self):
+        return self.observer.on_completed()
+
+    def on_error(self, exception: Exception):
+        return self.observer.on_error(exception)
+
+
+@dataclassabc(frozen=True)
+class ZipWithIndexFlowable[U](SingleChildFlowableNode[U, tuple[U, int]]):
+    child: FlowableNode[U]
+
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[tuple[U, int]],
+    ) -> tuple[State, SubscriptionResult]:
+        return self.child.unsafe_subscribe(
+            state=state,
+            args=args.copy(
+                observer=ZipWithIndexObserver(
+                    observer=args.observer,
+                    index=0,
+                ),
+            ),
+        )
+
+
+def init_zip_with_index_flowable[U](child: FlowableNode[U]):
+    return ZipWithIndexFlowable[U](child=child)
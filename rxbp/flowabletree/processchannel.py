@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from threading import Thread
+from typing import Any, Callable, override
+
+from dataclassabc import dataclassabc
+
+import continuationmonad
+from continuationmonad.typing import (
+    ContinuationCertificate,
+    ContinuationMonad,
+    Scheduler,
+)
+
+from rxbp.cancellable import Cancellable, CancellationState
+from rxbp.exceptions import BufferOverflowException
+from rxbp.state import State
+from rxbp.flowabletree.observer import Observer
+from rxbp.flowabletree.nodes import FlowableNode
+from rxbp.flowabletree.from_ import DEFAULT_STACK_BUDGET, _continue_with
+from rxbp.flowabletree.sources.connectable import ConnectableFlowableNode
+from rxbp.flowabletree.subscribeandconnect import init_sink_task
+from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.utils.shmring import (
+    COMPLETED,
+    ERROR,
+    ITEM,
+    Record,
+    SharedMemoryRing,
+    encode_record,
+)
+
+
+class ProcessChannel:
+    """
+    Handle of a ring buffer in shared memory that moves the items of a
+    flowable from one process to another.
+
+    The handle is passed as argument to the other process when it is
+    started, as the lock shared by the processes can only be inherited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        condition: Any,
+        ring: SharedMemoryRing | None = None,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.condition = condition
+
+        # keeps the shared memory block alive in the creating process
+        self._ring = ring
+
+        # writes the items in this process
+        self._thread: Thread | None = None
+
+    def __getstate__(self):
+        return self.name, self.capacity, self.condition
+
+    def __setstate__(self, state):
+        self.name, self.capacity, self.condition = state
+        self._ring = None
+        self._thread = None
+
+    def _attach(self):
+        shared_memory = SharedMemory(name=self.name)
+        return SharedMemoryRing(shared_memory, self.capacity)
+
+    def join(self, timeout: float | None = None):
+        """
+        Waits until the flowable written to the channel in this process
+        terminated.
+        """
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def init_process_channel(capacity: int | None = None):
+    """
+    Creates a channel whose ring buffer holds `capacity` bytes.
+    """
+
+    if capacity is None:
+        capacity = 1 << 20
+
+    # records are aligned to 8 bytes
+    capacity = -(-capacity // 8) * 8
+
+    ring = SharedMemoryRing.create(capacity)
+
+    return ProcessChannel(
+        name=ring.shared_memory.name,
+        capacity=capacity,
+        condition=multiprocessing.Condition(),
+        ring=ring,
+    )
+
+
+@dataclass
+class ProcessChannelObserver[U](Observer[U]):
+    """
+    Writes the items to the ring buffer. An item is acknowledged once the
+    reading process released enough space, which blocks the thread
+    running the flowable. Upstream is cancelled once the reader is closed.
+    """
+
+    ring: SharedMemoryRing
+    condition: Any
+    scheduler: Scheduler
+
+    # returns the certificate that ends the subscription
+    on_terminated: Callable[[], ContinuationCertificate]
+
+    cancellable: Cancellable | None
+
+    def on_subscribed(self, result: SubscriptionResult):
+        self.cancellable = result.cancellable
+
+    def _write(self, record: Record):
+        """
+        Writes the record and returns True, or returns False if the reader
+        is closed.
+        """
+
+        with self.condition:
+            while not self.ring.is_closed:
+                if self.ring.write(record):
+                    self.condition.notify_all()
+                    return True
+
+                self.condition.wait()
+
+        return False
+
+    def write(self, kind: int, obj: Any):
+        return self._write(encode_record(kind, obj))
+
+    def write_error(self, exception: Exception):
+        try:
+            record = encode_record(ERROR, exception)
+
+        except Exception:
+            # exception cannot be pickled
+            record = encode_record(
+                ERROR, Exception(f"{type(exception).__name__}: {exception}")
+            )
+
+        return self._write(record)
+
+    def _stop(self):
+        if self.cancellable is not None:
+            self.cancellable.cancel(
+                certificate=self.scheduler._create_certificate(
+                    weight=1, stack=tuple()
+                )
+            )
+
+        # upstream is not resumed
+        return continuationmonad.defer(
+            lambda _, __: continuationmonad.from_(self.on_terminated())
+        )
+
+    def _fail(self, exception: Exception):
+        self.write_error(exception)
+        return self._stop()
+
+    def on_next(self, item: U):
+        try:
+            is_written = self.write(ITEM, item)
+
+        except BufferOverflowException as exception:
+            return self._fail(exception)
+
+        if not is_written:
+            return self._stop()
+
+        return continuationmonad.from_(None)
+
+    def on_next_and_complete(self, item: U):
+        try:
+            is_written = self.write(ITEM, item)
+
+        except BufferOverflowException as exception:
+            return self._fail(exception)
+
+        if not is_written:
+            return self._stop()
+
+        self.write(COMPLETED, None)
+        return continuationmonad.from_(self.on_terminated())
+
+    def on_completed(self):
+        self.write(COMPLETED, None)
+        return continuationmonad.from_(self.on_terminated())
+
+    def on_error(self, exception: Exception):
+        self.write_error(exception)
+        return continuationmonad.from_(self.on_terminated())
+
+
+def to_process_channel[U](
+    source: FlowableNode[U],
+    channel: ProcessChannel | None = None,
+    capacity: int | None = None,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+):
+    """
+    Runs the flowable on a background thread and writes its items to the
+    channel, a new channel is created if None.
+    """
+
+    if channel is None:
+        channel = init_process_channel(capacity=capacity)
+
+    scheduler = continuationmonad.init_main_scheduler()
+
+    observer = ProcessChannelObserver[U](
+        ring=channel._attach(),
+        condition=channel.condition,
+        scheduler=scheduler,
+        on_terminated=lambda: scheduler.stop(1),
+        cancellable=None,
+    )
+
+    schedule_task = init_sink_task(
+        source=source,
+        observer=observer,
+        scheduler=scheduler,
+        connections=connections,
+        on_subscribed=observer.on_subscribed,
+    )
+
+    def run():
+        try:
+            scheduler.run(schedule_task, weight=1, cancellation=None)
+
+        except Exception as exception:
+            observer.write_error(exception)
+
+    channel._thread = Thread(target=run, daemon=True)
+    channel._thread.start()
+
+    return channel
+
+
+class _ProcessChannelReader(CancellationState):
+    """
+    Reads the records of the channel. The space of a record is released
+    when the next record is requested, that is, once the item is
+    acknowledged downstream.
+
+    Cancelling the reader closes the ring, such that the writer stops
+    waiting for space.
+    """
+
+    def __init__(self, channel: ProcessChannel, copy: bool):
+        super().__init__()
+
+        self._condition = channel.condition
+        self._ring = channel._attach()
+        self._copy = copy
+        self._is_closed = False
+
+    def next(self):
+        """Returns the next record, or None if the reader is closed."""
+
+        with self._condition:
+            if self._is_closed:
+                return None
+
+            self._ring.release()
+            self._condition.notify_all()
+
+            while (record := self._ring.read(copy=self._copy)) is None:
+                self._condition.wait()
+
+                if self._is_closed:
+                    return None
+
+        return record
+
+    def close(self):
+        with self._condition:
+            if self._is_closed:
+                return
+
+            self._is_closed = True
+            self._ring.release()
+            self._ring.close()
+            self._condition.notify_all()
+
+            shared_memory = self._ring.shared_memory
+            shared_memory.unlink()
+
+        try:
+            shared_memory.close()
+
+        except BufferError:
+            # items read without copy still refer to the shared memory,
+            # which is unmapped once they are garbage collected
+            pass
+
+    def cancel(self, certificate: ContinuationCertificate):
+        super().cancel(certificate)
+        self.close()
+
+
+@dataclassabc(frozen=True)
+class FromProcessChannel[V](FlowableNode[V]):
+    channel: ProcessChannel
+    copy: bool
+    stack_budget: int
+
+    def _send_item(
+        self,
+        observer: Observer[V],
+        reader: _ProcessChannelReader,
+        budget: int,
+    ) -> ContinuationMonad[ContinuationCertificate]:
+        if (record := reader.next()) is None:
+            # the reader is cancelled, downstream is not called anymore
+            return continuationmonad.from_(reader.is_cancelled())
+
+        kind, obj = record
+
+        if kind == ITEM:
+            return _continue_with(
+                ack=observer.on_next(obj),
+                budget=budget,
+                stack_budget=self.stack_budget,
+                func=lambda budget: self._send_item(observer, reader, budget),
+            )
+
+        reader.close()
+
+        if kind == COMPLETED:
+            return observer.on_completed()
+
+        else:
+            return observer.on_error(obj)
+
+    @override
+    def unsafe_subscribe(
+        self,
+        state: State,
+        args: SubscribeArgs[V],
+    ) -> tuple[State, SubscriptionResult]:
+        reader = _ProcessChannelReader(self.channel, copy=self.copy)
+
+        certificate = continuationmonad.fork(
+            source=continuationmonad.from_(None).flat_map(
+                lambda _: self._send_item(args.observer, reader, self.stack_budget)
+            ),
+            on_error=args.observer.on_error,
+            scheduler=state.subscription_trampoline,  # ensures scheduling on trampoline
+            cancellation=reader,
+            weight=args.weight,
+        )
+
+        return state, SubscriptionResult(
+            certificate=certificate,
+            cancellable=reader,
+        )
+
+
+def from_process_channel(
+    channel: ProcessChannel,
+    copy: bool | None = None,
+    stack_budget: int | None = None,
+):
+    """
+    Reads the items written to the channel by another process. The
+    reading blocks the scheduler until the next item is written.
+    """
+
+    if copy is None:
+        copy = True
+
+    if stack_budget is None:
+        stack_budget = DEFAULT_STACK_BUDGET
+
+    return FromProcessChannel(
+        channel=channel,
+        copy=copy,
+        stack_budget=stack_budget,
+    )
@@ -58,9 +58,8 @@ class ConnectableFlowableNode[V](FlowableNode[V]):
     init_item: V
 
     def discover(self, state: State):
-        state = state.copy(
-            discovered_connectables=state.discovered_connectables + [self]
-        )
+        # the list is created for each subscription and extended in place
+        state.discovered_connectables.append(self)
         return state.connections[self].discover(state)
 
     # def assign_weight(self, state: State, _):
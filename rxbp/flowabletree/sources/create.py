@@ -76,7 +76,8 @@ class Create[V](FlowableNode[V]):
 
         return state, SubscriptionResult(
             certificate=certificate,
-            cancellable=init_cancellation_state(),
+            # stops the scheduled continuations of the source
+            cancellable=cancellable,
         )
 
 
@@ -1,11 +1,15 @@
+import weakref
 from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
 
-from continuationmonad.typing import ContinuationCertificate
+import continuationmonad
+from continuationmonad.typing import ContinuationCertificate, Scheduler
 
 from rxbp.flowabletree.observer import Observer
-from rxbp.flowabletree.subscribeargs import SubscribeArgs
+from rxbp.flowabletree.subscribeargs import SubscribeArgs, init_subscribe_args
 from rxbp.flowabletree.subscriptionresult import SubscriptionResult
-from rxbp.state import State
+from rxbp.state import State, init_state
 from rxbp.flowabletree.nodes import FlowableNode
 from rxbp.flowabletree.sources.connectable import ConnectableFlowableNode
 from rxbp.flowabletree.subscription import Subscription
@@ -44,6 +48,80 @@ def subscribe_and_connect(
     return state
 
 
+@dataclass(frozen=True)
+class SubscriptionPlan:
+    """Result of the discover and assign weights traversals of a flowable tree"""
+
+    # only read while subscribing
+    shared_weights: dict
+
+
+# Plans of the flowable trees subscribed without connections keyed by the id
+# of their root node. Hashing a frozen node would visit the entire tree,
+# therefore, the node is referenced weakly and its entry is removed once it
+# is garbage collected.
+_plans: dict[int, tuple[weakref.ref, SubscriptionPlan]] = {}
+_plans_lock = Lock()
+
+
+def _get_plan(source: FlowableNode) -> SubscriptionPlan | None:
+    with _plans_lock:
+        entry = _plans.get(id(source))
+
+    if entry is None:
+        return None
+
+    ref, plan = entry
+
+    if ref() is not source:
+        return None
+
+    return plan
+
+
+def _set_plan(source: FlowableNode, plan: SubscriptionPlan):
+    key = id(source)
+
+    def remove_plan(ref: weakref.ref):
+        with _plans_lock:
+            if _plans.get(key, (None,))[0] is ref:
+                del _plans[key]
+
+    try:
+        ref = weakref.ref(source, remove_plan)
+
+    except TypeError:
+        # node does not support weak references
+        return
+
+    with _plans_lock:
+        _plans[key] = (ref, plan)
+
+
+def _subscribe_with_plan(
+    source: FlowableNode,
+    args: SubscribeArgs,
+    state: State,
+):
+    """
+    Subscribes a flowable tree without connections. The traversals
+    assigning the weights are done on the first subscription only.
+    """
+
+    plan = _get_plan(source)
+
+    if plan is None:
+        state = source.discover(state)
+        state = source.assign_weights(state, 1)
+
+        _set_plan(source, SubscriptionPlan(shared_weights=state.shared_weights))
+
+    else:
+        state = state.copy(shared_weights=plan.shared_weights)
+
+    return source.unsafe_subscribe(state, args=args)
+
+
 def subscribe_single_sink(
     source: FlowableNode,
     args: SubscribeArgs,
@@ -86,14 +164,22 @@ def subscribe_single_sink_on_trampoline(
     args: SubscribeArgs,
     state: State,
     connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+    on_subscribed: Callable[[SubscriptionResult], None] | None = None,
 ):    
     def trampoline_task(state=state):
-        _, result = subscribe_single_sink(
-            source=source,
-            args=args,
-            state=state,
-            connections=connections,
-        )
+        if not connections and not state.connections:
+            _, result = _subscribe_with_plan(source=source, args=args, state=state)
+
+        else:
+            _, result = subscribe_single_sink(
+                source=source,
+                args=args,
+                state=state,
+                connections=connections,
+            )
+
+        if on_subscribed is not None:
+            on_subscribed(result)
 
         return result.certificate
 
@@ -103,6 +189,43 @@ def subscribe_single_sink_on_trampoline(
         cancellation=None,
     )
 
+def init_sink_task(
+    source: FlowableNode,
+    observer: Observer,
+    scheduler: Scheduler,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+    on_subscribed: Callable[[SubscriptionResult], None] | None = None,
+):
+    """
+    Returns the task that subscribes the sink observer to the source
+    when executed on the given scheduler. The subscription result is
+    passed to `on_subscribed`, e.g. to cancel the subscription later on.
+    """
+
+    if connections is None:
+        connections = {}
+
+    subscribe_trampoline = continuationmonad.init_trampoline()
+
+    def schedule_task():
+        state = init_state(
+            subscription_trampoline=subscribe_trampoline,
+        )
+
+        return subscribe_single_sink_on_trampoline(
+            source=source,
+            args=init_subscribe_args(
+                observer=observer,
+                weight=1,
+                scheduler=scheduler,
+            ),
+            state=state,
+            connections=connections,
+            on_subscribed=on_subscribed,
+        )
+
+    return schedule_task
+
 
 # def subscribe_and_connect(
 #     subscriptions: tuple[Subscription, ...],
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from collections import deque
 from dataclasses import dataclass
 from threading import RLock
 from typing import Callable
@@ -19,88 +22,305 @@ from continuationmonad.typing import (
     MainScheduler,
 )
 
-from rxbp.cancellable import CancellationState
+from rxbp.cancellable import Cancellable, CancellationState
 from rxbp.flowabletree.subscribeargs import init_subscribe_args
 from rxbp.state import init_state
 from rxbp.flowabletree.observer import Observer
 from rxbp.flowabletree.nodes import FlowableNode
 from rxbp.flowabletree.sources.connectable import ConnectableFlowableNode
-from rxbp.flowabletree.subscribeandconnect import subscribe_single_sink_on_trampoline
+from rxbp.flowabletree.subscribeandconnect import (
+    init_sink_task,
+    subscribe_single_sink_on_trampoline,
+)
+from rxbp.flowabletree.subscriptionresult import SubscriptionResult
+from rxbp.schedulers.asyncioscheduler import (
+    AsyncIOScheduler,
+    init_asyncio_scheduler,
+)
+
+
+@dataclass
+class MainObserver[U](Observer[U]):
+    # None if the items are not kept
+    received_items: list[U] | deque[U] | None
+    received_exception: Exception | None
+    is_completed: bool
+    item_count: int
+
+    # called with each received item
+    sink: Callable[[U], None] | None
+
+    # called once the flowable terminates, returns the certificate
+    # that ends the main task
+    on_terminated: Callable[[], ContinuationCertificate]
+
+    scheduler: Scheduler
+
+    # cancels upstream if the sink raises or the awaiting task is
+    # cancelled
+    cancellable: Cancellable | None
+
+    # upstream cancelled before it got subscribed is cancelled as soon
+    # as it is subscribed
+    is_cancelled: bool
+
+    def on_subscribed(self, result: SubscriptionResult):
+        self.cancellable = result.cancellable
+
+        if self.is_cancelled:
+            self._cancel_upstream()
+
+    def _cancel_upstream(self):
+        self.is_cancelled = True
+
+        if self.cancellable is not None:
+            self.cancellable.cancel(
+                certificate=self.scheduler._create_certificate(
+                    weight=1, stack=tuple()
+                )
+            )
+
+    def _receive(self, values: list[U]):
+        """
+        Passes the values to the sink and keeps them. Returns False, if
+        the sink raised an exception.
+        """
+
+        self.item_count += len(values)
+
+        if self.sink is not None:
+            try:
+                for value in values:
+                    self.sink(value)
+
+            except Exception as exception:
+                self.received_exception = exception
+                self.is_completed = True
+                return False
+
+        if self.received_items is not None:
+            self.received_items.extend(values)
+
+        return True
+
+    def _fail(self):
+        self._cancel_upstream()
+
+        # upstream is not resumed
+        return continuationmonad.defer(
+            lambda _, __: continuationmonad.from_(self.on_terminated())
+        )
+
+    def on_next(self, value: U):
+        if not self._receive([value]):
+            return self._fail()
+
+        return continuationmonad.from_(None)
+
+    def on_next_batch(self, values: list[U]):
+        if not self._receive(values):
+            return self._fail()
+
+        return continuationmonad.from_(None)
+
+    def on_next_and_complete(self, value: U):
+        self._receive([value])
+        self.is_completed = True
+        return continuationmonad.from_(self.on_terminated())
+
+    def on_completed(self):
+        self.is_completed = True
+        return continuationmonad.from_(self.on_terminated())
+
+    def on_error(self, exception: Exception):
+        self.received_exception = exception
+        self.is_completed = True
+        return continuationmonad.from_(self.on_terminated())
+
+
+def init_main_observer[U](
+    on_terminated: Callable[[], ContinuationCertificate],
+    scheduler: Scheduler,
+    sink: Callable[[U], None] | None = None,
+    keep_last: int | None = None,
+):
+    """
+    Items are collected in a list, unless a sink is given. If `keep_last`
+    is specified, only the last `keep_last` items are kept.
+    """
+
+    if keep_last == 0:
+        received_items = None
+
+    elif keep_last is not None:
+        received_items = deque(maxlen=keep_last)
+
+    elif sink is not None:
+        received_items = None
+
+    else:
+        received_items = []
+
+    return MainObserver[U](
+        received_items=received_items,
+        received_exception=None,
+        is_completed=False,
+        item_count=0,
+        sink=sink,
+        on_terminated=on_terminated,
+        scheduler=scheduler,
+        cancellable=None,
+        is_cancelled=False,
+    )
+
+
+@dataclass(frozen=True)
+class DrainResult:
+    item_count: int
+    elapsed: float
+    exception: Exception | None
+
+
+def _run_main_observer[U](
+    source: FlowableNode[U],
+    observer: MainObserver[U],
+    scheduler: MainScheduler,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None,
+):
+    schedule_task = init_sink_task(
+        source=source,
+        observer=observer,
+        scheduler=scheduler,
+        connections=connections,
+        on_subscribed=observer.on_subscribed,
+    )
+
+    scheduler.run(schedule_task, weight=1, cancellation=None)
+
+    assert observer.is_completed
 
 
 def run[U](
     source: FlowableNode[U],
     scheduler: MainScheduler | None = None,
     connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
-):
+    sink: Callable[[U], None] | None = None,
+    keep_last: int | None = None,
+) -> list[U]:
     if scheduler is None:
         scheduler = continuationmonad.init_main_scheduler()
 
-    subscribe_trampoline = continuationmonad.init_trampoline()
+    observer = init_main_observer(
+        on_terminated=lambda: scheduler.stop(1),
+        scheduler=scheduler,
+        sink=sink,
+        keep_last=keep_last,
+    )
 
-    @dataclass()
-    class MainObserver(Observer[U]):
-        received_items: list[U]
-        received_exception: list[Exception | None]
-        is_completed: bool
+    _run_main_observer(
+        source=source,
+        observer=observer,
+        scheduler=scheduler,
+        connections=connections,
+    )
 
-        def on_next(self, value: U):
-            self.received_items.append(value)
-            return continuationmonad.from_(None)
+    if observer.received_exception:
+        raise observer.received_exception
 
-        def on_next_and_complete(self, value: U):
-            self.received_items.append(value)
-            self.is_completed = True
-            return continuationmonad.from_(scheduler.stop(1))
+    if observer.received_items is None:
+        return []
 
-        def on_completed(self):
-            self.is_completed = True
-            return continuationmonad.from_(scheduler.stop(1))
+    return list(observer.received_items)
 
-        def on_error(self, exception: Exception):
-            self.received_exception[0] = exception
-            self.is_completed = True
-            return continuationmonad.from_(scheduler.stop(1))
 
-    if connections is None:
-        connections = {}
+def drain[U](
+    source: FlowableNode[U],
+    scheduler: MainScheduler | None = None,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+    sink: Callable[[U], None] | None = None,
+) -> DrainResult:
+    if scheduler is None:
+        scheduler = continuationmonad.init_main_scheduler()
 
-    observer = MainObserver(
-        received_items=[],
-        received_exception=[None],
-        is_completed=False,
+    observer = init_main_observer(
+        on_terminated=lambda: scheduler.stop(1),
+        scheduler=scheduler,
+        sink=sink,
+        keep_last=0,
     )
 
-    def schedule_task():
-        # def trampoline_task():
-        state = init_state(
-            subscription_trampoline=subscribe_trampoline,
-            # scheduler=scheduler,
-        )
+    start = time.perf_counter()
 
-        return subscribe_single_sink_on_trampoline(
-            source=source,
-            args=init_subscribe_args(
-                observer=observer,
-                weight=1,
-                scheduler=scheduler,
-            ),
-            state=state,
-            connections=connections,
-        )
+    _run_main_observer(
+        source=source,
+        observer=observer,
+        scheduler=scheduler,
+        connections=connections,
+    )
 
-        # return result.certificate
+    return DrainResult(
+        item_count=observer.item_count,
+        elapsed=time.perf_counter() - start,
+        exception=observer.received_exception,
+    )
 
-        # return subscribe_trampoline.run(trampoline_task, weight=1)
 
-    scheduler.run(schedule_task, weight=1, cancellation=None)
+async def run_async[U](
+    source: FlowableNode[U],
+    scheduler: AsyncIOScheduler | None = None,
+    connections: dict[ConnectableFlowableNode, FlowableNode] | None = None,
+    sink: Callable[[U], None] | None = None,
+    keep_last: int | None = None,
+) -> list[U]:
+    loop = asyncio.get_running_loop()
 
-    assert observer.is_completed
+    if scheduler is None:
+        scheduler = init_asyncio_scheduler(loop=loop)
+
+    future = loop.create_future()
+
+    def set_result():
+        if future.done():
+            return
+
+        if observer.received_exception:
+            future.set_exception(observer.received_exception)
+
+        elif observer.received_items is None:
+            future.set_result([])
+
+        else:
+            future.set_result(list(observer.received_items))
+
+    def on_terminated():
+        # the terminal signal might be sent from another thread
+        loop.call_soon_threadsafe(set_result)
+        return scheduler._create_certificate(weight=1, stack=tuple())
+
+    observer = init_main_observer(
+        on_terminated=on_terminated,
+        scheduler=scheduler,
+        sink=sink,
+        keep_last=keep_last,
+    )
+
+    schedule_task = init_sink_task(
+        source=source,
+        observer=observer,
+        scheduler=scheduler,
+        connections=connections,
+        on_subscribed=observer.on_subscribed,
+    )
+
+    scheduler.schedule(schedule_task, weight=1)
 
-    if observer.received_exception[0]:
-        raise observer.received_exception[0]
+    try:
+        return await future
 
-    return observer.received_items
+    except asyncio.CancelledError:
+        # the subscription keeps running on the event loop otherwise
+        observer._cancel_upstream()
+        raise
 
 
 def to_rx[U](source: FlowableNode[U]) -> RxObservable[U]:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from abc import abstractmethod
+from typing import Callable, override
+
+from dataclassabc import dataclassabc
+
+from continuationmonad.typing import (
+    Cancellation,
+    ContinuationCertificate,
+    Scheduler,
+)
+
+
+class AsyncIOScheduler(Scheduler):
+    """
+    Scheduler that executes tasks on an asyncio event loop.
+
+    Tasks can be scheduled from any thread; they are always executed
+    on the thread running the event loop.
+    """
+
+    @property
+    @abstractmethod
+    def loop(self) -> asyncio.AbstractEventLoop: ...
+
+    def _is_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+
+        except RuntimeError:
+            return False
+
+    def _call_soon(self, callback: Callable[[], None]):
+        if self._is_loop_thread():
+            self.loop.call_soon(callback)
+
+        else:
+            self.loop.call_soon_threadsafe(callback)
+
+    def _call_later(self, delay: float, callback: Callable[[], None]):
+        if self._is_loop_thread():
+            self.loop.call_later(delay, callback)
+
+        else:
+            self.loop.call_soon_threadsafe(self.loop.call_later, delay, callback)
+
+    def _call_at(self, when: float, callback: Callable[[], None]):
+        if self._is_loop_thread():
+            self.loop.call_at(when, callback)
+
+        else:
+            self.loop.call_soon_threadsafe(self.loop.call_at, when, callback)
+
+    def _to_callback(
+        self,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None,
+    ):
+        def callback():
+            self._execute_task(
+                task=task,
+                weight=weight,
+                stack=tuple(),
+                cancellation=cancellation,
+            )
+
+        return callback
+
+    @override
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    @override
+    def schedule(
+        self,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        self._call_soon(self._to_callback(task, weight, cancellation))
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+    @override
+    def schedule_relative(
+        self,
+        duetime: float,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        self._call_later(duetime, self._to_callback(task, weight, cancellation))
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+    @override
+    def schedule_absolute(
+        self,
+        duetime: datetime.datetime,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        # translate the wall-clock due time to the monotonic clock of the loop
+        delay = (duetime - self.now()).total_seconds()
+        self._call_at(
+            self.loop.time() + delay,
+            self._to_callback(task, weight, cancellation),
+        )
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+
+@dataclassabc(frozen=True)
+class AsyncIOSchedulerImpl(AsyncIOScheduler):
+    loop: asyncio.AbstractEventLoop
+
+
+def init_asyncio_scheduler(
+    loop: asyncio.AbstractEventLoop | None = None,
+):
+    """
+    Creates a scheduler on the given event loop, or on the running
+    event loop if no loop is given.
+    """
+
+    if loop is None:
+        loop = asyncio.get_running_loop()
+
+    return AsyncIOSchedulerImpl(loop=loop)
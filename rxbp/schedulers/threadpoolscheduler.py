@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import datetime
+import threading
+from abc import abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, override
+
+from dataclassabc import dataclassabc
+
+from continuationmonad.typing import (
+    Cancellation,
+    ContinuationCertificate,
+    Scheduler,
+)
+
+
+class ThreadPoolScheduler(Scheduler):
+    """
+    Scheduler that executes tasks on the worker threads of an executor.
+
+    Tasks scheduled at the same time may run concurrently. Delayed tasks
+    are submitted to the executor by a timer thread once they are due.
+    """
+
+    @property
+    @abstractmethod
+    def executor(self) -> Executor: ...
+
+    def _to_callback(
+        self,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None,
+    ):
+        def callback():
+            try:
+                self._execute_task(
+                    task=task,
+                    weight=weight,
+                    stack=tuple(),
+                    cancellation=cancellation,
+                )
+
+            except BaseException as exception:
+                # the future returned by the executor is not read, hence
+                # the exception is reported like one raised in a thread
+                threading.excepthook(
+                    threading.ExceptHookArgs((
+                        type(exception),
+                        exception,
+                        exception.__traceback__,
+                        threading.current_thread(),
+                    ))
+                )
+
+        return callback
+
+    def _submit_later(self, delay: float, callback: Callable[[], None]):
+        if delay <= 0:
+            self.executor.submit(callback)
+
+        else:
+            timer = threading.Timer(delay, self.executor.submit, args=(callback,))
+            timer.daemon = True
+            timer.start()
+
+    @override
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    @override
+    def schedule(
+        self,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        self.executor.submit(self._to_callback(task, weight, cancellation))
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+    @override
+    def schedule_relative(
+        self,
+        duetime: float,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        self._submit_later(duetime, self._to_callback(task, weight, cancellation))
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+    @override
+    def schedule_absolute(
+        self,
+        duetime: datetime.datetime,
+        task: Callable[[], ContinuationCertificate],
+        weight: int,
+        cancellation: Cancellation | None = None,
+    ) -> ContinuationCertificate:
+        delay = (duetime - self.now()).total_seconds()
+        self._submit_later(delay, self._to_callback(task, weight, cancellation))
+
+        return self._create_certificate(weight=weight, stack=tuple())
+
+
+@dataclassabc(frozen=True)
+class ThreadPoolSchedulerImpl(ThreadPoolScheduler):
+    executor: Executor
+
+
+def init_thread_pool_scheduler(
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+):
+    """
+    Creates a scheduler on the given executor, or on a new thread pool
+    executor with at most `max_workers` threads.
+    """
+
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='rxbp',
+        )
+
+    return ThreadPoolSchedulerImpl(executor=executor)
@@ -1,8 +1,10 @@
 from abc import abstractmethod
-import traceback
+import linecache
+import sys
 
 from dataclasses import dataclass
 from dataclasses import fields
+from types import CodeType
 
 
 @dataclass(frozen=True)
@@ -13,22 +15,93 @@ class FrameSummary:
     line: str | None
 
 
-def get_frame_summary(index: int = 3):
-    def gen_stack_lines():
-        for obj in traceback.extract_stack()[:-index]:
-            if "<frozen importlib._bootstrap" not in obj.filename:
+class CapturedStack:
+    """
+    Call stack captured when an operator is created. Only the code objects
+    and line numbers are stored, the frame summaries are rendered once the
+    stack is formatted in an exception message.
+    """
+
+    __slots__ = ('_frames',)
+
+    def __init__(self, frames: tuple[tuple[CodeType, int], ...]):
+        self._frames = frames
+
+    def __iter__(self):
+        for code, lineno in self._frames:
+            filename = code.co_filename
+
+            if "<frozen importlib._bootstrap" not in filename:
                 yield FrameSummary(
-                    filename=obj.filename,
-                    lineno=obj.lineno,
-                    name=obj.name,
-                    line=obj.line,
+                    filename=filename,
+                    lineno=lineno,
+                    name=code.co_name,
+                    line=linecache.getline(filename, lineno).strip() or None,
                 )
 
-    return tuple(gen_stack_lines())
+
+# Capturing the call stack is enabled by default. Set `sample_every=n` to
+# only capture the stack of every n-th created operator.
+_is_enabled = True
+_sample_every = 1
+_n_calls = 0
+
+
+def set_call_site_capture(
+    enabled: bool | None = None,
+    sample_every: int | None = None,
+):
+    """
+    Configures capturing the call stack of created operators, which is
+    shown in the operator exception message.
+    """
+
+    global _is_enabled, _sample_every
+
+    if enabled is not None:
+        _is_enabled = enabled
+
+    if sample_every is not None:
+        assert 0 < sample_every, f'Sample rate must be positive, got {sample_every}.'
+        _sample_every = sample_every
+
+
+def get_frame_summary(index: int = 2) -> CapturedStack | None:
+    """
+    Captures the call stack without the `index` innermost frames, or
+    returns None if capturing is disabled or the call is not sampled.
+    """
+
+    global _n_calls
+
+    if not _is_enabled:
+        return None
+
+    if 1 < _sample_every:
+        _n_calls += 1
+
+        if _n_calls % _sample_every:
+            return None
+
+    try:
+        frame = sys._getframe(index)
+
+    except ValueError:
+        return CapturedStack(())
+
+    frames = []
+
+    while frame is not None:
+        frames.append((frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+
+    frames.reverse()
+    return CapturedStack(tuple(frames))
 
 
-def to_operator_traceback(stack: tuple[FrameSummary, ...]):
-    assert stack is not None
+def to_operator_traceback(stack: CapturedStack | None):
+    if stack is None:
+        return "  Call site not captured, see `rxbp.set_call_site_capture`."
 
     traceback_line = (
         *(
@@ -48,7 +121,7 @@ def to_execution_exception_message(traceback: str):
     return f"{message}\n{traceback}"
 
 
-def to_operator_exception_message(stack: tuple[FrameSummary, ...]):
+def to_operator_exception_message(stack: CapturedStack | None):
     message = (
         "RxBP operator exception caught. "
         "See the traceback below for details on the operator call stack:"
@@ -60,7 +133,7 @@ def to_operator_exception_message(stack: tuple[FrameSummary, ...]):
 class FrameSummaryMixin:
     @property
     @abstractmethod
-    def stack(self) -> tuple[FrameSummary, ...]: ...
+    def stack(self) -> CapturedStack | None: ...
 
     # implement custom __repr__ method that returns a representation without the stack
     def __repr__(self):
@@ -0,0 +1,118 @@
+import sys
+import time
+from threading import Lock
+
+
+class ReplayCache[U]:
+    """
+    Items of a flowable recorded by its subscriptions. Once a subscription
+    completes, the recorded sequence is replayed to later subscriptions
+    until it expires.
+
+    Concurrent subscriptions of the same flowable record the same sequence,
+    an item is appended by the first subscription reaching its index.
+    """
+
+    __slots__ = (
+        'max_items',
+        'max_bytes',
+        'ttl',
+        '_lock',
+        '_items',
+        '_n_bytes',
+        '_is_completed',
+        '_is_disabled',
+        '_expires_at',
+    )
+
+    def __init__(
+        self,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+
+        # time in seconds a completed sequence is replayed
+        self.ttl = ttl
+
+        self._lock = Lock()
+        self._items: list[U] = []
+
+        # shallow size of the recorded items
+        self._n_bytes = 0
+
+        self._is_completed = False
+
+        # sequence exceeded a limit and is never recorded again
+        self._is_disabled = False
+
+        self._expires_at: float | None = None
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def is_disabled(self):
+        return self._is_disabled
+
+    def get_items(self) -> tuple[U, ...] | None:
+        """
+        Returns the completed sequence or None if it is not (or no longer)
+        available.
+        """
+
+        with self._lock:
+            if not self._is_completed:
+                return None
+
+            if self._expires_at is not None and self._expires_at <= time.monotonic():
+                self._clear()
+                return None
+
+            return tuple(self._items)
+
+    def record(self, index: int, item: U):
+        with self._lock:
+            if (
+                self._is_disabled
+                or self._is_completed
+                or index != len(self._items)
+            ):
+                return
+
+            self._items.append(item)
+            self._n_bytes += sys.getsizeof(item)
+
+            if (
+                self.max_items is not None and self.max_items < len(self._items)
+            ) or (
+                self.max_bytes is not None and self.max_bytes < self._n_bytes
+            ):
+                self._clear()
+                self._is_disabled = True
+
+    def complete(self, n_items: int):
+        """
+        Marks the sequence as completed if all its items are recorded.
+        """
+
+        with self._lock:
+            if (
+                self._is_disabled
+                or self._is_completed
+                or n_items != len(self._items)
+            ):
+                return
+
+            self._is_completed = True
+
+            if self.ttl is not None:
+                self._expires_at = time.monotonic() + self.ttl
+
+    def _clear(self):
+        self._items = []
+        self._n_bytes = 0
+        self._is_completed = False
+        self._expires_at = None
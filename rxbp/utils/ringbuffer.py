@@ -0,0 +1,70 @@
+class RingBuffer[U]:
+    """
+    First-in-first-out queue of fixed capacity backed by a preallocated
+    list. Items are appended to the tail and removed from either end in
+    constant time.
+    """
+
+    __slots__ = ('_items', '_capacity', '_head', '_size')
+
+    def __init__(self, capacity: int):
+        assert 0 < capacity, f'Capacity must be positive, got {capacity}.'
+
+        self._items: list[U | None] = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return 0 < self._size
+
+    def __getitem__(self, index: int) -> U:
+        if not (0 <= index < self._size):
+            raise IndexError(f'Index {index} out of range.')
+
+        return self._items[(self._head + index) % self._capacity]  # type: ignore
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self._items[(self._head + index) % self._capacity]
+
+    def is_full(self):
+        return self._size == self._capacity
+
+    def append(self, item: U):
+        if self._size == self._capacity:
+            raise IndexError('Append to a full ring buffer.')
+
+        self._items[(self._head + self._size) % self._capacity] = item
+        self._size += 1
+
+    def popleft(self) -> U:
+        if self._size == 0:
+            raise IndexError('Pop from an empty ring buffer.')
+
+        item = self._items[self._head]
+
+        # release the reference
+        self._items[self._head] = None
+
+        self._head = (self._head + 1) % self._capacity
+        self._size -= 1
+        return item  # type: ignore
+
+    def pop(self) -> U:
+        if self._size == 0:
+            raise IndexError('Pop from an empty ring buffer.')
+
+        self._size -= 1
+        index = (self._head + self._size) % self._capacity
+
+        item = self._items[index]
+        self._items[index] = None
+        return item  # type: ignore
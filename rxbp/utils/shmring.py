@@ -0,0 +1,240 @@
+import pickle
+import struct
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from rxbp.exceptions import BufferOverflowException
+
+
+# write and read position, both count the bytes since the creation
+_POSITIONS = struct.Struct('<QQ')
+
+# set once the reader is closed
+_CLOSED = struct.Struct('<Q')
+
+# the records are stored after the positions and the closed flag
+_HEADER_SIZE = _POSITIONS.size + _CLOSED.size
+
+# record size, record kind, number of out-of-band buffers, pickle size
+_RECORD = struct.Struct('<QB3xIQ')
+
+# size of an out-of-band buffer
+_BUFFER = struct.Struct('<Q')
+
+# record kinds
+ITEM = 0
+COMPLETED = 1
+ERROR = 2
+
+# skips the remaining bytes up to the end of the ring
+_WRAP = 3
+
+
+def _align(size: int):
+    return -(-size // 8) * 8
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+    kind: int
+    data: bytes
+    buffers: tuple[memoryview, ...]
+
+    # number of bytes occupied in the ring
+    size: int
+
+
+def encode_record(kind: int, obj: Any) -> Record:
+    """
+    Pickles the object with protocol 5, such that buffers supporting
+    out-of-band pickling, e.g. NumPy arrays, are copied into the ring
+    without an intermediate copy.
+    """
+
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raw = tuple(b.raw() for b in buffers)
+
+    size = _RECORD.size + len(data)
+    for buffer in raw:
+        size = _align(size) + _BUFFER.size + buffer.nbytes
+
+    return Record(kind=kind, data=data, buffers=raw, size=_align(size))
+
+
+class SharedMemoryRing:
+    """
+    Records written by one process and read by another process through a
+    ring buffer in shared memory.
+
+    A record is stored contiguously. If it does not fit in front of the
+    end of the ring, the remaining bytes are skipped. The space of a read
+    record is only released once `release` is called.
+
+    The methods are called while holding the lock shared by the processes.
+    """
+
+    __slots__ = ('_shared_memory', '_capacity', '_read_end')
+
+    def __init__(self, shared_memory: SharedMemory, capacity: int):
+        self._shared_memory = shared_memory
+        self._capacity = capacity
+
+        # position after the record returned by `read`
+        self._read_end: int | None = None
+
+    @staticmethod
+    def create(capacity: int):
+        """Creates an empty ring in a new shared memory block."""
+
+        shared_memory = SharedMemory(create=True, size=_HEADER_SIZE + capacity)
+        _POSITIONS.pack_into(shared_memory.buf, 0, 0, 0)
+        _CLOSED.pack_into(shared_memory.buf, _POSITIONS.size, 0)
+        return SharedMemoryRing(shared_memory, capacity)
+
+    @property
+    def shared_memory(self):
+        return self._shared_memory
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def is_closed(self) -> bool:
+        (closed,) = _CLOSED.unpack_from(self._shared_memory.buf, _POSITIONS.size)
+        return bool(closed)
+
+    def close(self):
+        """Marks the ring as closed, such that no more records are read."""
+
+        _CLOSED.pack_into(self._shared_memory.buf, _POSITIONS.size, 1)
+
+    def _get_positions(self) -> tuple[int, int]:
+        return _POSITIONS.unpack_from(self._shared_memory.buf, 0)
+
+    def _set_positions(self, write_pos: int, read_pos: int):
+        _POSITIONS.pack_into(self._shared_memory.buf, 0, write_pos, read_pos)
+
+    def write(self, record: Record) -> bool:
+        """
+        Writes the record and returns True, or returns False if there is
+        not enough space until the reader releases records.
+        """
+
+        if self._capacity < record.size:
+            raise BufferOverflowException(
+                f"Record of {record.size} bytes exceeds the capacity {self._capacity}."
+            )
+
+        write_pos, read_pos = self._get_positions()
+
+        offset = write_pos % self._capacity
+        tail = self._capacity - offset
+
+        if tail < record.size and write_pos == read_pos:
+            # the ring is empty, both positions move to the start of the ring
+            write_pos = read_pos = write_pos + tail
+            offset = 0
+            tail = self._capacity
+
+        if tail < record.size:
+            skipped = tail
+        else:
+            skipped = 0
+
+        if self._capacity - (write_pos - read_pos) < skipped + record.size:
+            return False
+
+        buf = self._shared_memory.buf
+        base = _HEADER_SIZE
+
+        if skipped:
+            # a wrap record fits, as the tail is a multiple of the alignment
+            if _RECORD.size <= skipped:
+                _RECORD.pack_into(buf, base + offset, skipped, _WRAP, 0, 0)
+
+            offset = 0
+
+        start = base + offset
+        _RECORD.pack_into(
+            buf, start, record.size, record.kind, len(record.buffers), len(record.data)
+        )
+
+        pos = start + _RECORD.size
+        buf[pos:pos + len(record.data)] = record.data
+        pos += len(record.data)
+
+        for buffer in record.buffers:
+            pos = base + _align(pos - base)
+            _BUFFER.pack_into(buf, pos, buffer.nbytes)
+            pos += _BUFFER.size
+            buf[pos:pos + buffer.nbytes] = buffer.cast('B')
+            pos += buffer.nbytes
+
+        self._set_positions(write_pos + skipped + record.size, read_pos)
+        return True
+
+    def read(self, copy: bool = True) -> tuple[int, Any] | None:
+        """
+        Returns the kind and the object of the next record, or None if no
+        record is written. With `copy=False`, the out-of-band buffers of the
+        object refer to the shared memory and are only valid until the
+        record is released.
+        """
+
+        write_pos, read_pos = self._get_positions()
+
+        buf = self._shared_memory.buf
+        base = _HEADER_SIZE
+
+        while read_pos < write_pos:
+            offset = read_pos % self._capacity
+            tail = self._capacity - offset
+
+            if tail < _RECORD.size:
+                read_pos += tail
+                continue
+
+            start = base + offset
+            size, kind, n_buffers, data_size = _RECORD.unpack_from(buf, start)
+
+            if kind == _WRAP:
+                read_pos += size
+                continue
+
+            pos = start + _RECORD.size
+            data = buf[pos:pos + data_size]
+            pos += data_size
+
+            buffers = []
+            for _ in range(n_buffers):
+                pos = base + _align(pos - base)
+                (nbytes,) = _BUFFER.unpack_from(buf, pos)
+                pos += _BUFFER.size
+
+                if copy:
+                    buffers.append(bytearray(buf[pos:pos + nbytes]))
+                else:
+                    buffers.append(buf[pos:pos + nbytes])
+
+                pos += nbytes
+
+            obj = pickle.loads(data, buffers=buffers)
+            data.release()
+
+            self._read_end = read_pos + size
+            return kind, obj
+
+        return None
+
+    def release(self):
+        """Releases the space of the record returned by `read`."""
+
+        if self._read_end is None:
+            return
+
+        write_pos, _ = self._get_positions()
+        self._set_positions(write_pos, self._read_end)
+        self._read_end = None
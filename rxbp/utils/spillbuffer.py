@@ -0,0 +1,163 @@
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import weakref
+from collections import deque
+from typing import Any, BinaryIO, Protocol
+
+
+class Serializer(Protocol):
+    """
+    Converts items to bytes and back, e.g. the `pickle` module.
+    """
+
+    def dumps(self, obj: Any, /) -> bytes: ...
+    def loads(self, data: bytes, /) -> Any: ...
+
+
+# length prefix of a record in a segment file
+_HEADER = struct.Struct('<Q')
+
+
+class SpillBuffer[U]:
+    """
+    First-in-first-out queue that keeps at most `memory_limit` items in
+    memory and moves the remaining items to append-only segment files.
+
+    Items are read back a segment at a time through a memory map, and a
+    segment file is deleted once it is loaded. The directory holding the
+    segment files is removed when the buffer is garbage collected.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        memory_limit: int,
+        serializer: Serializer | None = None,
+        segment_size: int | None = None,
+    ):
+        assert 0 < memory_limit, f'Memory limit must be positive, got {memory_limit}.'
+
+        if serializer is None:
+            serializer = pickle
+
+        if segment_size is None:
+            segment_size = memory_limit
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._path = tempfile.mkdtemp(dir=directory, prefix='rxbp-buffer-')
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self._path, ignore_errors=True
+        )
+
+        self._memory_limit = memory_limit
+        self._segment_size = segment_size
+        self._serializer = serializer
+
+        # items in memory precede the items on disk
+        self._memory: deque[U] = deque()
+
+        # closed segment files, oldest first, with their number of items
+        self._segments: deque[tuple[str, int]] = deque()
+
+        self._writer: BinaryIO | None = None
+        self._writer_path: str | None = None
+        self._writer_count = 0
+        self._segment_index = 0
+        self._disk_count = 0
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def disk_count(self):
+        """Number of items stored in segment files."""
+
+        return self._disk_count
+
+    def __len__(self):
+        return len(self._memory) + self._disk_count
+
+    def __bool__(self):
+        return 0 < len(self)
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._segments.append((self._writer_path, self._writer_count))  # type: ignore
+
+            self._writer = None
+            self._writer_path = None
+            self._writer_count = 0
+
+    def _write(self, item: U):
+        if self._writer is None:
+            self._writer_path = os.path.join(
+                self._path, f'segment-{self._segment_index}'
+            )
+            self._segment_index += 1
+            self._writer = open(self._writer_path, 'wb')
+
+        data = self._serializer.dumps(item)
+        self._writer.write(_HEADER.pack(len(data)))
+        self._writer.write(data)
+
+        self._writer_count += 1
+        self._disk_count += 1
+
+        if self._writer_count == self._segment_size:
+            self._close_writer()
+
+    def _load_segment(self):
+        if not self._segments:
+            # the segment being written is read as well
+            self._close_writer()
+
+        path, count = self._segments.popleft()
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = 0
+
+                for _ in range(count):
+                    (size,) = _HEADER.unpack_from(data, offset)
+                    offset += _HEADER.size
+
+                    self._memory.append(self._serializer.loads(data[offset:offset + size]))
+                    offset += size
+
+        os.remove(path)
+        self._disk_count -= count
+
+    def append(self, item: U):
+        if self._disk_count == 0 and len(self._memory) < self._memory_limit:
+            self._memory.append(item)
+
+        else:
+            # once items are spilled, newer items follow them on disk
+            self._write(item)
+
+    def popleft(self) -> U:
+        if not self._memory:
+            if self._disk_count == 0:
+                raise IndexError('Pop from an empty spill buffer.')
+
+            self._load_segment()
+
+        return self._memory.popleft()
+
+    def close(self):
+        """
+        Deletes all segment files.
+        """
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self._finalizer()
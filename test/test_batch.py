@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import continuationmonad
+
+import rxbp
+
+from rxbp.testing.tobserver import init_test_observer
+from rxbp.testing.trun import test_run
+
+
+class TestBatch(TestCase):
+
+    def test_unroll_batches(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=rxbp.from_iterable(range(5), batch_size=2),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        self.assertEqual(sink.received, [0, 1, 2, 3, 4])
+        self.assertTrue(sink.is_completed)
+
+    def test_map_filter(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(10), batch_size=3)
+            .map(lambda v: 2 * v)
+            .filter(lambda v: v % 3 != 0)
+        )
+
+        self.assertEqual(result, [2, 4, 8, 10, 14, 16])
+
+    def test_batch(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(7), batch_size=3)
+            .batch(2)
+        )
+
+        self.assertEqual(result, [[0, 1], [2, 3], [4, 5], [6]])
+
+    def test_reduce(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(10), batch_size=4)
+            .reduce(lambda acc, v: acc + v)
+        )
+
+        self.assertEqual(result, [45])
@@ -0,0 +1,184 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from donotation import do
+
+import continuationmonad
+from continuationmonad.typing import ContinuationCertificate
+
+import rxbp
+
+from rxbp.exceptions import BufferOverflowException
+from rxbp.flowabletree.operations.buffer.flowable import init_buffer
+from rxbp.testing.tflowable import init_test_flowable
+from rxbp.testing.tobserver import init_test_observer
+from rxbp.testing.trun import test_run
+from rxbp.typing import Observer
+from rxbp.utils.ringbuffer import RingBuffer
+from rxbp.utils.spillbuffer import SpillBuffer
+
+
+class TestBuffer(TestCase):
+
+    def test_keep_order(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(1000)).buffer()
+        )
+
+        self.assertEqual(result, list(range(1000)))
+
+    def test_long_stream(self):
+        # the evaluation of a transition does not depend on the number
+        # of previous transitions
+        result = rxbp.run(
+            rxbp.from_iterable(range(20_000)).buffer(size=100, overflow='block')
+        )
+
+        self.assertEqual(len(result), 20_000)
+
+    def test_ring_buffer(self):
+        buffer = RingBuffer(capacity=3)
+
+        for item in range(3):
+            buffer.append(item)
+
+        self.assertTrue(buffer.is_full())
+        self.assertEqual(buffer.popleft(), 0)
+
+        # wrap around the end of the preallocated list
+        buffer.append(3)
+
+        self.assertEqual(list(buffer), [1, 2, 3])
+        self.assertEqual(buffer.pop(), 3)
+        self.assertEqual(buffer.popleft(), 1)
+        self.assertEqual(buffer[0], 2)
+        self.assertEqual(len(buffer), 1)
+
+        with self.assertRaises(IndexError):
+            buffer.append(4)
+            buffer.append(5)
+            buffer.append(6)
+
+    def _run_delayed(self, overflow, dropped):
+        return rxbp.run(
+            rxbp.from_iterable(range(10))
+            .buffer(size=2, overflow=overflow, on_drop=dropped.append)
+            .concat_map(lambda v: rxbp.sleep(0.01).map(lambda _: v))
+        )
+
+    def test_drop_newest(self):
+        dropped = []
+
+        result = self._run_delayed('drop_newest', dropped)
+
+        self.assertEqual(result, [0, 1, 2])
+        self.assertEqual(dropped, [3, 4, 5, 6, 7, 8, 9])
+
+    def test_gauge(self):
+        gauge = rxbp.init_buffer_gauge()
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(10))
+            .buffer(size=2, gauge=gauge)
+            .concat_map(lambda v: rxbp.sleep(0.01).map(lambda _: v))
+        )
+
+        self.assertEqual(result, [0, 1, 2])
+        self.assertEqual(gauge.n_dropped, 7)
+        self.assertEqual(gauge.n_buffered, 0)
+
+    def test_drop_oldest(self):
+        dropped = []
+
+        result = self._run_delayed('drop_oldest', dropped)
+
+        self.assertEqual(result, [0, 8, 9])
+        self.assertEqual(dropped, [1, 2, 3, 4, 5, 6, 7])
+
+    def test_keep_latest(self):
+        result = self._run_delayed('keep_latest', [])
+
+        self.assertEqual(result, [0, 9])
+
+    def test_block(self):
+        dropped = []
+
+        result = self._run_delayed('block', dropped)
+
+        self.assertEqual(result, list(range(10)))
+        self.assertEqual(dropped, [])
+
+    def test_error(self):
+        with self.assertRaises(BufferOverflowException):
+            self._run_delayed('error', [])
+
+    def test_cancel_blocked_upstream(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        @do()
+        def schedule_source(observer: Observer, _):
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(1)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(2)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(3)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(4)
+            return observer.on_completed()
+
+        source = init_test_flowable(schedule_source)
+
+        sink = init_test_observer(name="sink", scheduler=scheduler)
+        sink.request_delay = 10
+
+        test_run(
+            source=init_buffer(source, buffer_size=1, overflow='block'),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        # item 2 is buffered, upstream is blocked on item 3
+        scheduler.advance_to(3.5)
+        self.assertEqual(sink.received, [1])
+
+        sink.cancel()
+
+        self.assertIsInstance(
+            source.cancellation.is_cancelled(),
+            ContinuationCertificate,
+        )
+
+    def test_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = rxbp.run(
+                rxbp.from_iterable(range(100))
+                .buffer(spill_to=directory, memory_limit=8)
+                .concat_map(lambda v: rxbp.sleep(0.001).map(lambda _: v))
+            )
+
+            self.assertEqual(result, list(range(100)))
+
+    def test_spill_buffer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = SpillBuffer(directory, memory_limit=3, segment_size=2)
+
+            for item in range(10):
+                buffer.append(item)
+
+            self.assertEqual(buffer.disk_count, 7)
+            self.assertEqual([buffer.popleft() for _ in range(4)], [0, 1, 2, 3])
+
+            for item in range(10, 13):
+                buffer.append(item)
+
+            self.assertEqual(
+                [buffer.popleft() for _ in range(len(buffer))],
+                list(range(4, 13)),
+            )
+
+            # consumed segment files are deleted
+            self.assertEqual(os.listdir(buffer.path), [])
+
+            buffer.close()
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import rxbp
+from rxbp.utils.replaycache import ReplayCache
+
+
+class TestCache(TestCase):
+    def test_replay(self):
+        n_subscriptions = []
+
+        def from_source():
+            n_subscriptions.append(None)
+            return rxbp.from_iterable(range(5))
+
+        source = rxbp.from_value(None).flat_map(lambda _: from_source()).cache()
+
+        self.assertEqual(rxbp.run(source), [0, 1, 2, 3, 4])
+        self.assertEqual(rxbp.run(source), [0, 1, 2, 3, 4])
+        self.assertEqual(len(n_subscriptions), 1)
+
+    def test_partial_run_extends_cache(self):
+        cache = ReplayCache()
+
+        cache.record(0, 'a')
+        cache.record(1, 'b')
+        self.assertIsNone(cache.get_items())
+
+        # a second run records only the items not yet recorded
+        cache.record(0, 'a')
+        cache.record(2, 'c')
+        cache.complete(3)
+
+        self.assertEqual(cache.get_items(), ('a', 'b', 'c'))
+
+    def test_max_items(self):
+        cache = ReplayCache(max_items=2)
+
+        for index, item in enumerate('abc'):
+            cache.record(index, item)
+
+        cache.complete(3)
+
+        self.assertTrue(cache.is_disabled)
+        self.assertIsNone(cache.get_items())
+
+    def test_ttl(self):
+        cache = ReplayCache(ttl=0)
+
+        cache.record(0, 'a')
+        cache.complete(1)
+
+        self.assertIsNone(cache.get_items())
+        self.assertEqual(len(cache), 0)
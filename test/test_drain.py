@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import rxbp
+
+
+class TestDrain(TestCase):
+
+    def test_drain(self):
+        result = rxbp.drain(rxbp.from_iterable(range(100), batch_size=7))
+
+        self.assertEqual(result.item_count, 100)
+        self.assertIsNone(result.exception)
+
+    def test_drain_error(self):
+        exception = Exception('test')
+
+        result = rxbp.drain(
+            rxbp.from_iterable(range(3)).concat_map(
+                lambda v: rxbp.error(exception) if v == 2 else rxbp.from_value(v)
+            )
+        )
+
+        self.assertEqual(result.item_count, 2)
+        self.assertIs(result.exception, exception)
+
+    def test_sink(self):
+        received = []
+
+        result = rxbp.run(rxbp.count().take(5), sink=received.append)
+
+        self.assertEqual(result, [])
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+
+    def test_keep_last(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(100), batch_size=8),
+            keep_last=3,
+        )
+
+        self.assertEqual(result, [97, 98, 99])
+
+    def test_failing_sink(self):
+        exception = Exception('test')
+        sent = []
+
+        def sink(value):
+            if value == 2:
+                raise exception
+
+        result = rxbp.drain(
+            rxbp.count().tap(on_next=sent.append).take(100),
+            sink=sink,
+        )
+
+        # upstream is not resumed after the sink raised
+        self.assertEqual(sent, [0, 1, 2])
+        self.assertEqual(result.item_count, 3)
+        self.assertIs(result.exception, exception)
+
+        with self.assertRaises(Exception) as cm:
+            rxbp.run(rxbp.from_iterable(range(5)), sink=sink)
+
+        self.assertIs(cm.exception, exception)
@@ -254,3 +254,64 @@ class TestFlatMap(TestCase):
         self.assertEqual(sink.exception, exception)
 
         scheduler.advance_to(2.5)
+
+    def test_max_concurrency(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        def init_inner_source(value):
+            @do()
+            def schedule_inner_source(observer: Observer, _):
+                yield continuationmonad.sleep(1, scheduler)
+                return observer.on_next_and_complete(value)
+
+            return init_test_flowable(schedule_inner_source)
+
+        @do()
+        def schedule_source(observer: Observer, _):
+            yield observer.on_next(init_inner_source(1))
+            yield observer.on_next(init_inner_source(2))
+            return observer.on_next_and_complete(init_inner_source(3))
+
+        source = init_test_flowable(schedule_source)
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=FlatMapFlowableNode(
+                child=source,
+                func=lambda v: v,
+                stack=tuple(),
+                max_concurrency=2,
+            ),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        scheduler.advance_to(1.5)
+        self.assertEqual(sink.received, [1, 2])
+        self.assertFalse(sink.is_completed)
+
+        scheduler.advance_to(2.5)
+        self.assertEqual(sink.received, [1, 2, 3])
+        self.assertTrue(sink.is_completed)
+
+    def test_prefetch(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(3)).flat_map(
+                lambda v: rxbp.from_iterable([v, v]),
+                prefetch=2,
+            )
+        )
+
+        self.assertEqual(sorted(result), [0, 0, 1, 1, 2, 2])
+
+    def test_seq_prefetch(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(3)).seq().flat_map(
+                lambda v: rxbp.from_iterable([v, v]),
+                max_concurrency=2,
+                prefetch=2,
+            )
+        )
+
+        self.assertEqual(result, [0, 0, 1, 1, 2, 2])
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import rxbp
+from rxbp.utils.framesummary import (
+    get_frame_summary,
+    set_call_site_capture,
+    to_operator_traceback,
+)
+
+
+class TestFrameSummary(TestCase):
+    def tearDown(self):
+        set_call_site_capture(enabled=True, sample_every=1)
+
+    def test_lazy_capture(self):
+        stack = get_frame_summary(index=1)
+
+        *_, frame = stack
+        self.assertEqual(frame.name, 'test_lazy_capture')
+        self.assertEqual(frame.line, 'stack = get_frame_summary(index=1)')
+
+    def test_operator_call_site(self):
+        flowable = rxbp.from_iterable([1]).flat_map(rxbp.from_value)
+
+        *_, frame = flowable.child.stack
+        self.assertEqual(frame.name, 'test_operator_call_site')
+        self.assertEqual(
+            frame.line,
+            'flowable = rxbp.from_iterable([1]).flat_map(rxbp.from_value)',
+        )
+
+    def test_disabled(self):
+        set_call_site_capture(enabled=False)
+
+        stack = get_frame_summary()
+
+        self.assertIsNone(stack)
+        self.assertIn('not captured', to_operator_traceback(stack))
+
+    def test_sampling(self):
+        set_call_site_capture(sample_every=2)
+
+        stacks = [get_frame_summary(index=1) for _ in range(4)]
+
+        self.assertEqual(sum(stack is not None for stack in stacks), 2)
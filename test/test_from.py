@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+import rxbp
+
+
+class TestFrom(TestCase):
+
+    def test_from_iterable(self):
+        result = rxbp.run(rxbp.from_iterable(range(10_000)))
+
+        self.assertEqual(result, list(range(10_000)))
+
+    def test_from_iterable_stack_budget(self):
+        for stack_budget in (1, 2, 100):
+            result = rxbp.run(rxbp.from_iterable(range(250), stack_budget=stack_budget))
+
+            self.assertEqual(result, list(range(250)))
+
+    def test_from_iterable_empty(self):
+        result = rxbp.run(rxbp.from_iterable([]))
+
+        self.assertEqual(result, [])
+
+    def test_count(self):
+        result = rxbp.run(rxbp.count(stack_budget=4).take(10))
+
+        self.assertEqual(result, list(range(10)))
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+import continuationmonad
+
+import rxbp
+
+from rxbp.flowabletree.operations.fused import FusedObserver
+from rxbp.testing.tobserver import init_test_observer
+from rxbp.testing.trun import test_run
+
+
+class TestFused(TestCase):
+
+    def test_collapse_chain(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+        observers = []
+
+        def schedule_source(observer, _):
+            observers.append(observer)
+            return observer.on_next_and_complete(1)
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=rxbp.create(schedule_source)
+            .map(lambda v: v + 1)
+            .filter(lambda v: v > 0)
+            .tap(on_next=lambda _: None)
+            .map(lambda v: 2 * v),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        self.assertIsInstance(observers[0], FusedObserver)
+        self.assertEqual(len(observers[0].stages), 4)
+        self.assertEqual(sink.received, [4])
+        self.assertTrue(sink.is_completed)
+
+    def test_take_while_completes_following_stages(self):
+        received = []
+        completed = []
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(10))
+            .map(lambda v: v + 1)
+            .take_while(lambda v: v < 4)
+            .tap(on_next=received.append, on_completed=lambda: completed.append(True))
+        )
+
+        self.assertEqual(result, [1, 2, 3])
+        self.assertEqual(received, [1, 2, 3])
+        self.assertEqual(completed, [True])
+
+    def test_filter_last_item(self):
+        completed = []
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(5))
+            .filter(lambda v: v % 2 == 1)
+            .tap(on_completed=lambda: completed.append(True))
+        )
+
+        self.assertEqual(result, [1, 3])
+        self.assertEqual(completed, [True])
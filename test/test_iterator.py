@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+import rxbp
+
+
+class TestIterator(TestCase):
+
+    def test_to_iterator(self):
+        result = list(rxbp.to_iterator(
+            rxbp.from_iterable(range(5)).map(lambda v: 2 * v)
+        ))
+
+        self.assertEqual(result, [0, 2, 4, 6, 8])
+
+    def test_backpressure(self):
+        sent = []
+
+        iterator = rxbp.to_iterator(
+            rxbp.from_iterable(range(100)).tap(on_next=sent.append)
+        )
+
+        self.assertEqual(next(iterator), 0)
+        self.assertEqual(next(iterator), 1)
+
+        # the third item is only sent once the second is acknowledged
+        self.assertEqual(sent, [0, 1])
+
+        iterator.close()
+
+        self.assertEqual(list(iterator), [])
+
+    def test_context_manager(self):
+        sent = []
+
+        with rxbp.to_iterator(
+            rxbp.from_iterable(range(100)).tap(on_next=sent.append)
+        ) as iterator:
+            for item in iterator:
+                if item == 2:
+                    break
+
+        self.assertEqual(sent, [0, 1, 2])
+        self.assertEqual(list(iterator), [])
+
+    def test_close_while_waiting(self):
+        iterator = rxbp.to_iterator(rxbp.interval(10))
+
+        # upstream is cancelled while the consumer waits for the first tick
+        threading.Timer(0.05, iterator.close).start()
+
+        self.assertEqual(list(iterator), [])
+
+    def test_error(self):
+        exception = Exception('test')
+
+        iterator = rxbp.to_iterator(rxbp.error(exception))
+
+        with self.assertRaises(Exception) as cm:
+            next(iterator)
+
+        self.assertIs(cm.exception, exception)
+
+    def test_to_async_iterator(self):
+        async def main():
+            result = []
+
+            async for item in rxbp.to_async_iterator(
+                rxbp.from_iterable(range(10), batch_size=3)
+            ):
+                result.append(item)
+
+            return result
+
+        self.assertEqual(asyncio.run(main()), list(range(10)))
+
+    def test_async_backpressure(self):
+        sent = []
+
+        async def main():
+            iterator = rxbp.to_async_iterator(
+                rxbp.interval(0.01).tap(on_next=sent.append)
+            )
+
+            first = await anext(iterator)
+            await asyncio.sleep(0.05)
+            await iterator.aclose()
+
+            return first
+
+        first = asyncio.run(main())
+
+        # no further tick is scheduled before the first is acknowledged
+        self.assertEqual(sent, [first])
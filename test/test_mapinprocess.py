@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import TestCase
+
+import rxbp
+from rxbp.exceptions import RxBpException
+
+
+def double(v):
+    return 2 * v
+
+
+def exit_on_five(v):
+    if v == 5:
+        os._exit(1)
+
+    return v
+
+
+class TestMapInProcess(TestCase):
+    def test_map(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(100)).map_in_process(
+                double, workers=2, chunk_size=8
+            )
+        )
+
+        self.assertEqual(result, [2 * v for v in range(100)])
+
+    def test_chunk_size_divides_count(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(16)).map_in_process(
+                double, workers=2, chunk_size=8
+            )
+        )
+
+        self.assertEqual(result, [2 * v for v in range(16)])
+
+    def test_worker_crash(self):
+        # the crash is either reported through the pending futures or
+        # by the executor when the next chunk is submitted
+        with self.assertRaises(RxBpException):
+            rxbp.run(
+                rxbp.from_iterable(range(20)).map_in_process(
+                    exit_on_five, workers=2, chunk_size=4
+                )
+            )
+
+    def test_broken_executor(self):
+        executor = ProcessPoolExecutor(max_workers=1)
+
+        with self.assertRaises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+
+        try:
+            with self.assertRaises(RxBpException):
+                rxbp.run(
+                    rxbp.from_iterable(range(20)).map_in_process(
+                        double, workers=2, chunk_size=4, executor=executor
+                    )
+                )
+
+        finally:
+            executor.shutdown()
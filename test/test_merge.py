@@ -9,6 +9,8 @@ import rxbp
 from rxbp.testing.tflowable import init_test_flowable
 from rxbp.typing import Observer
 from rxbp.flowabletree.operations.merge.flowable import init_merge_flowable_node
+from rxbp.flowabletree.operations.merge.pendingqueue import init_pending_queue
+from rxbp.flowabletree.operations.merge.states import BackpressuredOnNextCalls
 from rxbp.testing.tobserver import init_test_observer
 from rxbp.testing.trun import test_run
 
@@ -58,3 +60,29 @@ class TestMerge(TestCase):
         scheduler.advance_to(3.5)
         self.assertEqual(sink.received, [1, 2, 3, 4])
         self.assertTrue(sink.is_completed)
+
+    def test_round_robin_pending_queue(self):
+        queue = init_pending_queue('round_robin')
+
+        for id in (2, 0, 3):
+            queue.push(BackpressuredOnNextCalls(id=id, value=id, observer=None))
+
+        self.assertEqual(queue.pop().id, 0)
+
+        # id 1 is sent before the ids of the next cycle
+        queue.push(BackpressuredOnNextCalls(id=1, value=1, observer=None))
+        queue.push(BackpressuredOnNextCalls(id=0, value=0, observer=None))
+
+        self.assertEqual([queue.pop().id for _ in range(4)], [1, 2, 3, 0])
+        self.assertIsNone(queue.pop())
+
+    def test_fifo_pending_queue(self):
+        queue = init_pending_queue('fifo')
+
+        for id in (2, 0, 3):
+            queue.push(BackpressuredOnNextCalls(id=id, value=id, observer=None))
+
+        self.assertIn(0, queue)
+        self.assertEqual([queue.pop().id for _ in range(3)], [2, 0, 3])
+        self.assertNotIn(0, queue)
+        self.assertIsNone(queue.pop())
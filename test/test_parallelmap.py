@@ -0,0 +1,66 @@
+import random
+import threading
+import time
+from unittest import TestCase
+
+import rxbp
+from rxbp.exceptions import RxBpException
+
+
+class TestParallelMap(TestCase):
+    def test_ordered(self):
+        def func(v):
+            time.sleep(random.random() / 100)
+            return 2 * v
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(20)).parallel_map(func, workers=4)
+        )
+
+        self.assertEqual(result, [2 * v for v in range(20)])
+
+    def test_unordered(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(20)).parallel_map(
+                lambda v: 2 * v, workers=4, ordered=False
+            )
+        )
+
+        self.assertEqual(sorted(result), [2 * v for v in range(20)])
+
+    def test_bounded_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def func(v):
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+
+            time.sleep(0.01)
+
+            with lock:
+                in_flight[0] -= 1
+
+            return v
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(20)).parallel_map(func, workers=3)
+        )
+
+        self.assertEqual(result, list(range(20)))
+        self.assertLessEqual(max_in_flight[0], 3)
+        self.assertLess(1, max_in_flight[0])
+
+    def test_error(self):
+        def func(v):
+            if v == 5:
+                raise ValueError("failed")
+
+            return v
+
+        with self.assertRaises(RxBpException):
+            rxbp.run(
+                rxbp.from_iterable(range(20)).parallel_map(func, workers=2)
+            )
@@ -0,0 +1,92 @@
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from unittest import TestCase
+
+import rxbp
+from rxbp.exceptions import BufferOverflowException
+
+
+def consume(channel, queue):
+    queue.put(rxbp.run(rxbp.from_process_channel(channel)))
+
+
+class TestProcessChannel(TestCase):
+    def test_roundtrip(self):
+        channel = rxbp.to_process_channel(
+            rxbp.from_iterable(range(100)),
+            capacity=256,
+        )
+
+        result = rxbp.run(rxbp.from_process_channel(channel))
+
+        self.assertEqual(result, list(range(100)))
+
+    def test_buffers_wrap_around(self):
+        items = [bytearray([i]) * (i * 7 % 50) for i in range(50)]
+
+        channel = rxbp.to_process_channel(
+            rxbp.from_iterable(items),
+            capacity=512,
+        )
+
+        result = rxbp.run(rxbp.from_process_channel(channel))
+
+        self.assertEqual(result, items)
+
+    def test_large_item_after_small_item(self):
+        # the large item does not fit in front of the end of the ring
+        items = [bytes(60), bytes(150)]
+
+        channel = rxbp.to_process_channel(
+            rxbp.from_iterable(items),
+            capacity=256,
+        )
+
+        result = rxbp.run(rxbp.from_process_channel(channel))
+
+        self.assertEqual(result, items)
+
+    def test_error(self):
+        channel = rxbp.to_process_channel(
+            rxbp.error(ValueError("failed")),
+        )
+
+        with self.assertRaises(ValueError):
+            rxbp.run(rxbp.from_process_channel(channel))
+
+    def test_item_exceeds_capacity(self):
+        channel = rxbp.to_process_channel(
+            rxbp.from_value(bytes(1024)),
+            capacity=256,
+        )
+
+        with self.assertRaises(BufferOverflowException):
+            rxbp.run(rxbp.from_process_channel(channel))
+
+    def test_cancel(self):
+        channel = rxbp.to_process_channel(
+            rxbp.from_iterable(range(1000)),
+            capacity=256,
+        )
+
+        with rxbp.to_iterator(rxbp.from_process_channel(channel)) as iterator:
+            self.assertEqual(next(iterator), 0)
+
+        # the writer stops waiting for space once the reader is closed
+        channel.join(timeout=10)
+        self.assertFalse(channel._thread.is_alive())
+
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=channel.name)
+
+    def test_other_process(self):
+        channel = rxbp.init_process_channel(capacity=1024)
+        queue = multiprocessing.Queue()
+
+        process = multiprocessing.Process(target=consume, args=(channel, queue))
+        process.start()
+
+        rxbp.to_process_channel(rxbp.from_iterable(range(1000)), channel=channel)
+
+        self.assertEqual(queue.get(timeout=10), list(range(1000)))
+        process.join()
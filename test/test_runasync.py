@@ -0,0 +1,86 @@
+import asyncio
+from unittest import TestCase
+
+import rxbp
+
+
+class TestRunAsync(TestCase):
+
+    def test_from_iterable(self):
+        result = asyncio.run(rxbp.run_async(
+            rxbp.from_iterable(range(5)).map(lambda v: 2 * v)
+        ))
+
+        self.assertEqual(result, [0, 2, 4, 6, 8])
+
+    def test_interval(self):
+        async def main():
+            ticks = []
+
+            # the event loop is not blocked while the flowable runs
+            async def tick():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.create_task(tick())
+            result = await rxbp.run_async(rxbp.interval(0.02).take(3))
+            task.cancel()
+
+            return result, ticks
+
+        result, ticks = asyncio.run(main())
+
+        self.assertEqual(len(result), 3)
+        self.assertLess(1, len(ticks))
+
+    def test_error(self):
+        exception = Exception('test')
+
+        with self.assertRaises(Exception) as cm:
+            asyncio.run(rxbp.run_async(rxbp.error(exception)))
+
+        self.assertIs(cm.exception, exception)
+
+    def test_cancel(self):
+        async def main():
+            ticks = []
+
+            task = asyncio.create_task(
+                rxbp.run_async(rxbp.interval(0.005), sink=ticks.append)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            n_ticks = len(ticks)
+            await asyncio.sleep(0.05)
+
+            return n_ticks, ticks
+
+        n_ticks, ticks = asyncio.run(main())
+
+        # the interval is cancelled together with the awaiting task
+        self.assertLess(0, n_ticks)
+        self.assertEqual(len(ticks), n_ticks)
+
+    def test_cancel_before_first_item(self):
+        async def main():
+            ticks = []
+
+            task = asyncio.create_task(
+                rxbp.run_async(rxbp.interval(0.005), sink=ticks.append)
+            )
+            await asyncio.sleep(0)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            await asyncio.sleep(0.05)
+
+            return ticks
+
+        self.assertEqual(asyncio.run(main()), [])
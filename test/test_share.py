@@ -5,11 +5,13 @@ from donotation import do
 import continuationmonad
 
 import rxbp
+from rxbp.exceptions import ShareLagException
 from rxbp.testing.tflowable import init_test_flowable
 from rxbp.typing import Observer
 from rxbp.testing.tobserver import init_test_observer
 from rxbp.testing.trun import test_run
 from rxbp.flowabletree.operations.share.flowable import init_share_flowable_node
+from rxbp.flowabletree.operations.share.sharebuffer import ShareBuffer
 
 
 class TestShare(TestCase):
@@ -171,3 +173,158 @@ class TestShare(TestCase):
         scheduler.advance_to(3.5)
 
         self.assertIsNotNone(source.cancellation.is_cancelled())
+
+    def _run_lagging(self, on_lag):
+        """
+        Shares a source emitting 1, ..., 6 every second with a fast
+        subscriber and a slow subscriber acknowledging after 10 seconds.
+        """
+
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        @do()
+        def schedule_source(observer: Observer, _):
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(1)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(2)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(3)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(4)
+            yield continuationmonad.sleep(1, scheduler)
+            yield observer.on_next(5)
+            yield continuationmonad.sleep(1, scheduler)
+            return observer.on_next_and_complete(6)
+
+        source = init_test_flowable(schedule_source)
+        gauge = rxbp.init_share_lag_gauge()
+
+        fast = init_test_observer(name="fast", scheduler=scheduler)
+        slow = init_test_observer(name="slow", scheduler=scheduler)
+        slow.request_delay = 10
+
+        test_run(
+            source=init_share_flowable_node(
+                source, max_lag=2, on_lag=on_lag, gauge=gauge
+            ),
+            sinks=(fast, slow),
+            scheduler=scheduler,
+        )
+
+        return scheduler, source, gauge, fast, slow
+
+    def test_lag_drop_for_slow(self):
+        scheduler, _, gauge, fast, slow = self._run_lagging('drop_for_slow')
+
+        scheduler.advance_to(6.5)
+        self.assertEqual(fast.received, [1, 2, 3, 4, 5, 6])
+        self.assertTrue(fast.is_completed)
+        self.assertEqual(slow.received, [1])
+
+        # items 2, 3 and 4 are skipped for the slow subscriber
+        self.assertEqual(gauge.n_dropped, 3)
+        self.assertEqual(gauge.lags(), {0: 0, 1: 2})
+
+        scheduler.advance_to(21.5)
+        self.assertEqual(slow.received, [1, 5, 6])
+        self.assertTrue(slow.is_completed)
+
+    def test_lag_detach_slow(self):
+        scheduler, _, gauge, fast, slow = self._run_lagging('detach_slow')
+
+        scheduler.advance_to(6.5)
+        self.assertEqual(fast.received, [1, 2, 3, 4, 5, 6])
+        self.assertTrue(fast.is_completed)
+        self.assertEqual(gauge.n_detached, 1)
+        self.assertEqual(gauge.lags(), {0: 0})
+
+        # the exception is sent on the next request
+        scheduler.advance_to(11.5)
+        self.assertEqual(slow.received, [1])
+        self.assertIsInstance(slow.exception, ShareLagException)
+
+    def test_lag_detach_last_subscriber(self):
+        scheduler, source, gauge, fast, slow = self._run_lagging('detach_slow')
+
+        scheduler.advance_to(4.5)
+        self.assertEqual(gauge.n_detached, 1)
+
+        fast.cancel()
+
+        # upstream is cancelled once the detached subscriber is notified
+        scheduler.advance_to(11.5)
+        self.assertEqual(fast.received, [1, 2, 3, 4])
+        self.assertEqual(slow.received, [1])
+        self.assertIsInstance(slow.exception, ShareLagException)
+        self.assertIsNotNone(source.cancellation.is_cancelled())
+
+    def test_lag_error(self):
+        scheduler, _, gauge, fast, slow = self._run_lagging('error')
+
+        scheduler.advance_to(4.5)
+        self.assertEqual(fast.received, [1, 2, 3])
+        self.assertIsInstance(fast.exception, ShareLagException)
+        self.assertEqual(gauge.max_lag, 3)
+        self.assertEqual(gauge.n_dropped, 0)
+
+        scheduler.advance_to(11.5)
+        self.assertEqual(slow.received, [1])
+        self.assertIsInstance(slow.exception, ShareLagException)
+
+    def test_share_buffer_trims_behind_slowest_cursor(self):
+        buffer = ShareBuffer(capacity=2)
+
+        fast = buffer.add_subscriber(weight=1)
+        slow = buffer.add_subscriber(weight=1)
+
+        self.assertEqual(buffer.append(0), (fast, slow))
+        self.assertEqual(len(buffer), 0)
+
+        for item in range(1, 5):
+            buffer.wait(fast)
+            self.assertEqual(buffer.append(item), (fast,))
+
+        self.assertEqual(buffer.lag(slow), 4)
+        self.assertEqual(len(buffer), 4)
+
+        self.assertEqual([buffer.pop(slow) for _ in range(3)], [1, 2, 3])
+        self.assertEqual(len(buffer), 1)
+
+        buffer.remove_subscriber(slow)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.total_weight, 1)
+
+    def test_share_buffer_slowest_subscribers(self):
+        buffer = ShareBuffer(capacity=2)
+
+        fast = buffer.add_subscriber(weight=1)
+        slow = buffer.add_subscriber(weight=1)
+        buffer.append(0)
+
+        for item in range(1, 4):
+            buffer.wait(fast)
+            buffer.append(item)
+
+        self.assertEqual(buffer.max_lag, 3)
+        self.assertEqual(buffer.slowest(), (slow,))
+        self.assertEqual(buffer.lags(), {fast: 0, slow: 3})
+
+        # drop the oldest item not yet sent to the slow subscriber
+        buffer.skip(slow)
+        self.assertEqual(buffer.max_lag, 2)
+        self.assertEqual(buffer.n_dropped, 1)
+        self.assertEqual(buffer.pop(slow), 2)
+
+        buffer.detach(slow)
+        self.assertEqual(buffer.max_lag, 0)
+        self.assertEqual(buffer.n_detached, 1)
+        self.assertEqual(len(buffer), 0)
+
+    def test_repeated_runs(self):
+        source = rxbp.from_iterable(range(3)).share()
+        flowable = rxbp.zip((source, source.map(lambda v: 10 * v)))
+
+        # the second run subscribes with the plan of the first one
+        for _ in range(2):
+            self.assertEqual(rxbp.run(flowable), [(0, 0), (1, 10), (2, 20)])
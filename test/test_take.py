@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from donotation import do
+
+import continuationmonad
+
+import rxbp
+
+from rxbp.typing import Observer
+from rxbp.testing.tobserver import init_test_observer
+from rxbp.testing.trun import test_run
+
+
+class TestTake(TestCase):
+
+    def test_stop_upstream(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+        sent = []
+
+        @do()
+        def schedule_source(observer: Observer, _):
+            sent.append(1)
+            yield observer.on_next(1)
+            yield continuationmonad.sleep(1, scheduler)
+            sent.append(2)
+            yield observer.on_next(2)
+            yield continuationmonad.sleep(1, scheduler)
+            sent.append(3)
+            return observer.on_next_and_complete(3)
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=rxbp.create(schedule_source).take(2),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        scheduler.advance_to(0.5)
+        self.assertEqual(sink.received, [1])
+        self.assertFalse(sink.is_completed)
+
+        scheduler.advance_to(1.5)
+        self.assertEqual(sink.received, [1, 2])
+        self.assertTrue(sink.is_completed)
+
+        scheduler.advance_to(2.5)
+        self.assertEqual(sent, [1, 2])
+
+    def test_take(self):
+        result = rxbp.run(rxbp.from_iterable(range(10)).take(3))
+
+        self.assertEqual(result, [0, 1, 2])
+
+    def test_take_batch(self):
+        result = rxbp.run(rxbp.from_iterable(range(10), batch_size=4).take(6))
+
+        self.assertEqual(result, [0, 1, 2, 3, 4, 5])
+
+    def test_first(self):
+        result = rxbp.run(rxbp.from_iterable(range(10)).first())
+
+        self.assertEqual(result, [0])
+
+    def test_skip(self):
+        result = rxbp.run(rxbp.from_iterable(range(6)).skip(4))
+
+        self.assertEqual(result, [4, 5])
+
+    def test_skip_batch(self):
+        result = rxbp.run(rxbp.from_iterable(range(10), batch_size=3).skip(4))
+
+        self.assertEqual(result, [4, 5, 6, 7, 8, 9])
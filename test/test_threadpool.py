@@ -0,0 +1,55 @@
+import threading
+from unittest import TestCase
+
+import rxbp
+
+
+class TestThreadPool(TestCase):
+    def setUp(self):
+        self.scheduler = rxbp.init_thread_pool_scheduler(max_workers=2)
+
+    def tearDown(self):
+        self.scheduler.executor.shutdown()
+
+    def test_observe_on(self):
+        threads = []
+
+        result = rxbp.run(
+            rxbp.from_iterable(range(10))
+            .observe_on(self.scheduler)
+            .tap(on_next=lambda _: threads.append(threading.current_thread()))
+        )
+
+        self.assertEqual(result, list(range(10)))
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_subscribe_on(self):
+        result = rxbp.run(
+            rxbp.from_iterable(range(10))
+            .map(lambda v: 2 * v)
+            .subscribe_on(self.scheduler)
+        )
+
+        self.assertEqual(result, [2 * v for v in range(10)])
+
+    def test_task_exception_is_reported(self):
+        reported = []
+        done = threading.Event()
+
+        def excepthook(args):
+            reported.append(args.exc_value)
+            done.set()
+
+        def task():
+            raise ValueError("failed")
+
+        original, threading.excepthook = threading.excepthook, excepthook
+
+        try:
+            self.scheduler.schedule(task, weight=1)
+            done.wait(timeout=5)
+
+        finally:
+            threading.excepthook = original
+
+        self.assertIsInstance(reported[0], ValueError)
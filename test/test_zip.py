@@ -96,4 +96,40 @@ class TestZip(TestCase):
             source2.cancellation.is_cancelled(),
             ContinuationCertificate,
         )
-        self.assertTrue(sink.is_completed)
\ No newline at end of file
+        self.assertTrue(sink.is_completed)
+    def test_wide_zip(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        sources = tuple(
+            rxbp.from_iterable(range(id, id + 3)) for id in range(20)
+        )
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=init_zip_flowable_node(children=sources),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        scheduler.advance_to(1)
+        self.assertEqual(
+            sink.received,
+            [tuple(range(idx, idx + 20)) for idx in range(3)],
+        )
+        self.assertTrue(sink.is_completed)
+
+    def test_zip_with_index(self):
+        scheduler = continuationmonad.init_main_virtual_time_scheduler()
+
+        sink = init_test_observer(scheduler=scheduler)
+
+        test_run(
+            source=rxbp.from_iterable(('a', 'b', 'c')).zip_with_index(),
+            sinks=(sink,),
+            scheduler=scheduler,
+        )
+
+        scheduler.advance_to(1)
+        self.assertEqual(sink.received, [('a', 0), ('b', 1), ('c', 2)])
+        self.assertTrue(sink.is_completed)